@@ -5,69 +5,202 @@
 #              8 squares except for pawns. There is also no check or checkmate, no castling, en passant, or pawn promotion
 
 
+import random
+import time
+from array import array
+from functools import lru_cache
+
+# square index used throughout the engine. a1 = 0, b1 = 1 ... h8 = 63. square names like 'e2' are only used
+# by make_move, get_board and the other methods that take or return algebraic notation
+SQUARE_NAMES = [column + str(row) for row in range(1, 9) for column in 'abcdefgh']
+SQUARE_INDEX = {name: index for index, name in enumerate(SQUARE_NAMES)}
+SQUARE_COORDINATES = [(index % 8, index // 8 + 1) for index in range(64)]     # (column 0-7, row 1-8)
+
+# order squares are shown in: row 8 down to row 1, a to h
+BOARD_ORDER = [SQUARE_INDEX[column + str(row)] for row in range(8, 0, -1) for column in 'abcdefgh']
+
+# bitboard slot for each piece. white pieces are 0-5, black pieces are 6-11
+PIECE_TYPES = ['pawn', 'knight', 'bishop', 'rook', 'queen', 'king']
+COLORS = ['white', 'black']
+PIECE_CODES = {(color, piece_type): COLORS.index(color) * 6 + PIECE_TYPES.index(piece_type)
+               for color in COLORS for piece_type in PIECE_TYPES}
+
+
+def offset_targets(index, offsets):
+    """
+    squares reached from index by each (column, row) offset, skipping any that fall off the board
+    :return: list of square indexes
+    """
+    column, row = index % 8, index // 8
+    return [(row + row_offset) * 8 + column + col_offset for col_offset, row_offset in offsets
+            if 0 <= column + col_offset < 8 and 0 <= row + row_offset < 8]
+
+
+def ray(index, col_step, row_step):
+    """
+    squares from index (not included) to the edge of the board in one direction, nearest first
+    :return: list of square indexes
+    """
+    squares = []
+    column, row = index % 8 + col_step, index // 8 + row_step
+    while 0 <= column < 8 and 0 <= row < 8:
+        squares.append(row * 8 + column)
+        column, row = column + col_step, row + row_step
+    return squares
+
+
+# attack tables, built once at import. indexed by square index
+KNIGHT_OFFSETS = [(1, 2), (2, 1), (2, -1), (1, -2), (-1, -2), (-2, -1), (-2, 1), (-1, 2)]
+KING_OFFSETS = [(0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1), (-1, 0), (-1, 1)]
+KNIGHT_TARGETS = [offset_targets(index, KNIGHT_OFFSETS) for index in range(64)]
+KING_TARGETS = [offset_targets(index, KING_OFFSETS) for index in range(64)]
+PAWN_CAPTURES = [[offset_targets(index, [(-1, 1), (1, 1)]) for index in range(64)],       # white
+                 [offset_targets(index, [(-1, -1), (1, -1)]) for index in range(64)]]     # black
+
+# sliding rays. directions 0-3 are rook moves, 4-7 are bishop moves, the queen uses all 8
+DIRECTIONS = [(0, 1), (0, -1), (1, 0), (-1, 0), (1, 1), (-1, 1), (1, -1), (-1, -1)]
+RAYS = [[ray(index, col_step, row_step) for col_step, row_step in DIRECTIONS] for index in range(64)]
+SLIDER_DIRECTIONS = {'rook': range(0, 4), 'bishop': range(4, 8), 'queen': range(0, 8)}
+OPPOSITE_DIRECTIONS = [1, 0, 3, 2, 7, 6, 5, 4]
+# piece codes of the sliders that move along each direction
+DIRECTION_SLIDERS = [{PIECE_CODES[(color, piece_type)] for color in COLORS for piece_type in SLIDER_DIRECTIONS
+                      if direction in SLIDER_DIRECTIONS[piece_type]} for direction in range(8)]
+
+
+def between_table():
+    """
+    squares strictly between every pair of squares on a shared row, column or diagonal
+    :return: list indexed by start * 64 + end. empty when the squares are next to each other or not lined up
+    """
+    table = [()] * (64 * 64)
+    for start in range(64):
+        for direction_ray in RAYS[start]:
+            for distance, end in enumerate(direction_ray):
+                table[start * 64 + end] = tuple(direction_ray[:distance])
+    return table
+
+
+BETWEEN_SQUARES = between_table()
+BETWEEN_MASKS = [sum(1 << square for square in between) for between in BETWEEN_SQUARES]
+
+# explosion area for a capture on each square: the square itself plus its neighbours, clipped at the edges
+BLAST_SQUARES = [[index] + KING_TARGETS[index] for index in range(64)]
+BLAST_MASKS = [sum(1 << square for square in BLAST_SQUARES[index]) for index in range(64)]
+
+
+def center_bonus(index):
+    """
+    :return: 3 for the 4 center squares down to 0 on the edge of the board
+    """
+    return 3 - int(max(abs(index % 8 - 3.5), abs(index // 8 - 3.5)))
+
+
+# evaluation: material plus a bonus for where the piece stands, from white's side of the board
+PIECE_VALUES = {'pawn': 100, 'knight': 300, 'bishop': 300, 'rook': 500, 'queen': 900, 'king': 0}
+PIECE_SQUARE_BONUS = {
+    'pawn': [5 * max(0, index // 8 - 1) for index in range(64)],     # further up the board
+    'knight': [10 * center_bonus(index) - 15 for index in range(64)],
+    'bishop': [5 * center_bonus(index) for index in range(64)],
+    'rook': [10 if index // 8 == 6 else 0 for index in range(64)],
+    'queen': [3 * center_bonus(index) for index in range(64)],
+    'king': [0] * 64,
+}
+# score of each piece code on each square, positive for white. black looks up the square mirrored (index ^ 56)
+PIECE_SQUARE_SCORES = [[(PIECE_VALUES[piece_type] + PIECE_SQUARE_BONUS[piece_type][index ^ (56 * color_index)])
+                        * (1 - 2 * color_index) for index in range(64)]
+                       for color_index in range(2) for piece_type in PIECE_TYPES]
+KING_NEIGHBOR_PENALTY = 15      # own piece next to the king, a capture on it blows the king up
+KING_THREAT_TO_MOVE = 300       # the side to move can capture on or next to the other king
+KING_THREAT_WAITING = 60        # the other side could, but it is our move
+
+
+def encode_move(start, end):
+    """
+    pack a move into 12 bits: start square index in the low 6 bits, end square index in the high 6
+    :return: move code 0-4095
+    """
+    return start | (end << 6)
+
+
+def decode_move(move_code):
+    """
+    :return: (start, end) square index pair for a 12 bit move code
+    """
+    return move_code & 63, move_code >> 6
+
+
+# zobrist keys: one random 64 bit number per piece code and square, plus one for black to move.
+# fixed seed so hashes are the same in every process
+_zobrist_random = random.Random(20240524)
+ZOBRIST_PIECES = [[_zobrist_random.getrandbits(64) for index in range(64)] for code in range(12)]
+ZOBRIST_BLACK_TO_MOVE = _zobrist_random.getrandbits(64)
+
+
 class Board:
     """
     create chess board with all pieces generated
     """
     def __init__(self):
-        self._new_chessboard = {}
+        self._squares = [None] * 64     # piece (or None) for each square index
         self.initialize_chessboard()
 
     def initialize_chessboard(self):    # set board
         """
         populates brand-new chessboard with chess pieces
         """
-        columns = ['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h']  # set whole board up as empty
+        self._squares = [None] * 64     # set whole board up as empty
 
-        for row in range(8, 0, -1):
-            for column in columns:
-                self._new_chessboard[str(column) + str(row)] = None     # set up each spot on board as NONE
-                                                                        # turn rows into a string. creating keys and setting values to None (empty)
         # load white pawns in columns + row 2
-        for column in columns:
-            self._new_chessboard[str(column) + '2'] = Pawn('white', self)       # self - pass current instance of chessboard. Pawn needs to be on chessboard to check state
+        for column in range(8):
+            self._squares[SQUARE_INDEX['a2'] + column] = get_piece('white', 'pawn')
 
         # load rooks in corner of board
-        self._new_chessboard['a1'] = Rook('white')
-        self._new_chessboard['h1'] = Rook('white')
+        self._squares[SQUARE_INDEX['a1']] = get_piece('white', 'rook')
+        self._squares[SQUARE_INDEX['h1']] = get_piece('white', 'rook')
 
         # load knights next to rooks
-        self._new_chessboard['b1'] = Knight('white')
-        self._new_chessboard['g1'] = Knight('white')
+        self._squares[SQUARE_INDEX['b1']] = get_piece('white', 'knight')
+        self._squares[SQUARE_INDEX['g1']] = get_piece('white', 'knight')
 
         # load bishop next to knights
-        self._new_chessboard['c1'] = Bishop('white')
-        self._new_chessboard['f1'] = Bishop('white')
+        self._squares[SQUARE_INDEX['c1']] = get_piece('white', 'bishop')
+        self._squares[SQUARE_INDEX['f1']] = get_piece('white', 'bishop')
 
-        self._new_chessboard['d1'] = Queen('white')
-        self._new_chessboard['e1'] = King('white')
+        self._squares[SQUARE_INDEX['d1']] = get_piece('white', 'queen')
+        self._squares[SQUARE_INDEX['e1']] = get_piece('white', 'king')
 
         # load black pieces. black pawns
-        for column in columns:
-            self._new_chessboard[str(column) + '7'] = Pawn('black', self)  # self - pass current instance of chessboard. Pawn needs to be on chessboard to check state
+        for column in range(8):
+            self._squares[SQUARE_INDEX['a7'] + column] = get_piece('black', 'pawn')
 
         # load rooks in corner of board
-        self._new_chessboard['a8'] = Rook('black')
-        self._new_chessboard['h8'] = Rook('black')
+        self._squares[SQUARE_INDEX['a8']] = get_piece('black', 'rook')
+        self._squares[SQUARE_INDEX['h8']] = get_piece('black', 'rook')
 
         # load knights next to rooks
-        self._new_chessboard['b8'] = Knight('black')
-        self._new_chessboard['g8'] = Knight('black')
+        self._squares[SQUARE_INDEX['b8']] = get_piece('black', 'knight')
+        self._squares[SQUARE_INDEX['g8']] = get_piece('black', 'knight')
 
         # load bishop next to knights
-        self._new_chessboard['c8'] = Bishop('black')
-        self._new_chessboard['f8'] = Bishop('black')
+        self._squares[SQUARE_INDEX['c8']] = get_piece('black', 'bishop')
+        self._squares[SQUARE_INDEX['f8']] = get_piece('black', 'bishop')
 
-        self._new_chessboard['d8'] = Queen('black')
-        self._new_chessboard['e8'] = King('black')
+        self._squares[SQUARE_INDEX['d8']] = get_piece('black', 'queen')
+        self._squares[SQUARE_INDEX['e8']] = get_piece('black', 'king')
 
     # call on print_board?
 
     def get_board(self):
         """
-        :return: chessboard
+        :return: chessboard as a dict of square name -> piece (or None), a read-only snapshot
+        """
+        return {SQUARE_NAMES[index]: self._squares[index] for index in BOARD_ORDER}
+
+    def get_squares(self):
+        """
+        :return: list of 64 pieces (or None), indexed by square index
         """
-        return self._new_chessboard
+        return self._squares
 
     def show_board(self):
         """
@@ -85,8 +218,8 @@ class Board:
         for row in range(8, 0, -1):
             # print row number at the beginning
             print(f'{row} ', end='')
-            for column in columns:
-                piece = self._new_chessboard[str(column) + str(row)]
+            for column in range(8):
+                piece = self._squares[(row - 1) * 8 + column]
                 if piece:
                     print(f'[{piece.get_name()}]', end='')  # print piece name
                 else:
@@ -101,6 +234,117 @@ class Board:
         print('\n')
 
 
+class BitBoard:
+    """
+    chess board stored as twelve 64 bit integers, one per color and piece type. bit n is set when
+    square n (a1 = 0, h8 = 63) holds that piece. indexed by square index like the list from
+    Board.get_squares() so ChessVar can use either one
+    """
+    def __init__(self):
+        self._bitboards = [0] * 12
+        self._occupied = [0, 0]     # white pieces, black pieces
+        self._mailbox = [None] * 64     # piece or None by square index, so a single square is one lookup
+        self.initialize_chessboard()
+
+    def initialize_chessboard(self):
+        """
+        populates the bitboards with the standard starting position
+        """
+        back_row = ['rook', 'knight', 'bishop', 'queen', 'king', 'bishop', 'knight', 'rook']
+        self._bitboards = [0] * 12
+
+        for column in range(8):
+            self._bitboards[PIECE_CODES[('white', 'pawn')]] |= 1 << (8 + column)
+            self._bitboards[PIECE_CODES[('black', 'pawn')]] |= 1 << (48 + column)
+            self._bitboards[PIECE_CODES[('white', back_row[column])]] |= 1 << column
+            self._bitboards[PIECE_CODES[('black', back_row[column])]] |= 1 << (56 + column)
+
+        self._occupied = [0, 0]
+        self._mailbox = [None] * 64
+        for code in range(12):
+            self._occupied[code // 6] |= self._bitboards[code]
+            for index in range(64):
+                if self._bitboards[code] >> index & 1:
+                    self._mailbox[index] = PIECES[code]
+
+    def get_board(self):
+        """
+        :return: chessboard as a dict of square name -> piece (or None), a read-only snapshot
+        """
+        return {SQUARE_NAMES[index]: self[index] for index in BOARD_ORDER}
+
+    def get_bitboards(self):
+        """
+        :return: list of the twelve piece bitboards
+        """
+        return self._bitboards
+
+    def get_occupied(self):
+        """
+        :return: bitboard of every occupied square
+        """
+        return self._occupied[0] | self._occupied[1]
+
+    def __getitem__(self, index):
+        return self._mailbox[index]
+
+    def __setitem__(self, index, piece):
+        bit = 1 << index
+
+        # clear whatever was on the square
+        old_piece = self._mailbox[index]
+        if old_piece is not None:
+            code = old_piece.get_code()
+            self._bitboards[code] &= ~bit
+            self._occupied[code // 6] &= ~bit
+
+        self._mailbox[index] = piece
+        if piece is not None:
+            code = piece.get_code()
+            self._bitboards[code] |= bit
+            self._occupied[code // 6] |= bit
+
+    def between_mask(self, start_index, end_index):
+        """
+        squares strictly between two square indexes on a shared row, column or diagonal
+        :return: bitboard of the squares in between, 0 if the squares are not lined up
+        """
+        return BETWEEN_MASKS[start_index * 64 + end_index]
+
+    def is_path_clear(self, start, end):
+        """
+        :return: True if no piece sits between start and end
+        """
+        return not self.between_mask(start, end) & (self._occupied[0] | self._occupied[1])
+
+    def kings_in_blast(self, square):
+        """
+        :return: number of kings (0, 1 or 2) caught in an explosion on square
+        """
+        blast = BLAST_MASKS[square]
+        white_king = self._bitboards[PIECE_CODES[('white', 'king')]] & blast
+        black_king = self._bitboards[PIECE_CODES[('black', 'king')]] & blast
+        return (white_king != 0) + (black_king != 0)
+
+    def blast_victims(self, square):
+        """
+        the piece on square and every non-pawn piece around it, found with one mask. the board is not changed
+        :return: list of (square index, piece) an explosion on square would remove
+        """
+        pawns = self._bitboards[PIECE_CODES[('white', 'pawn')]] | self._bitboards[PIECE_CODES[('black', 'pawn')]]
+        occupied = self._occupied[0] | self._occupied[1]
+        victims = ((BLAST_MASKS[square] & ~pawns) | (1 << square)) & occupied
+
+        removed = []
+        for code in range(12):
+            hit = self._bitboards[code] & victims
+            while hit:
+                low_bit = hit & -hit
+                removed.append((low_bit.bit_length() - 1, PIECES[code]))
+                hit ^= low_bit
+        return removed
+
+
 class Moves:
     """
     store initial row and column values, used as helper function
@@ -108,25 +352,25 @@ class Moves:
     @staticmethod
     def store_row_column(square):
         """
-        store row and column inputs, create algebraic notation for square
-        :return: algebraic notation of square (ex: a1)
+        look up column and row for a square index
+        :return: (column 0-7, row 1-8) of square (ex: a1 -> (0, 1))
         """
-
-        column = ord(square[0])
-        row = int(square[1])
-
-        return column, row
+        return SQUARE_COORDINATES[square]
 
 
 class ChessPiece:
     """
     Class representing Chess Pieces: Rook, Knight, Bishop, King, Queen and Pawn.
-    Includes name, color and type
+    Includes name, color and type. A piece holds no game state, so every board shares the
+    same 12 piece objects (see PIECES and get_piece)
     """
-    def __init__(self, color):       # only take color parameter, initialize others to None for now
-        self._name = None
+    __slots__ = ('_name', '_color', '_type', '_code')
+
+    def __init__(self, color, piece_type):
         self._color = color
-        self._type = None
+        self._type = piece_type
+        self._name = piece_type + color     # ex "pawnblack", built once
+        self._code = PIECE_CODES[(color, piece_type)]
 
     def get_type(self):
         """
@@ -144,48 +388,60 @@ class ChessPiece:
         """
         return name of piece, which includes color and type
         """
-        self._name = self._type + self._color
         return self._name
 
+    def get_code(self):
+        """
+        return piece code 0-11, the index of the piece's bitboard and zobrist keys
+        """
+        return self._code
+
+    # shared pieces stay shared when a game is copied or pickled
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return get_piece, (self._color, self._type)
+
 
 class Pawn(ChessPiece):
     """
     Pawn chess piece, subclass of Chess Piece. Includes type, color, name
     """
-    def __init__(self, color, chess_var_obj):
+    __slots__ = ()
+
+    def __init__(self, color):
         """
         pawn attributes
         :param color:
         """
-        super().__init__(color)
-        self._type = "pawn"
-        self._name = self._color + " " + self._type     # ex "black pawn"
-        self._board_object = chess_var_obj              # need to access current state of the board
-        self._moves = Moves()
-
-        # need chess var obj to access board and game state. pawn moves depend on this
+        super().__init__(color, 'pawn')
 
-    def allowed_moves(self, start, end):
+    def allowed_moves(self, start, end, board=None):
         """
         allowed pawn moves, including initial moves (can move 1 or 2 forward)
         how to capture, and if at end of board it is stuck.
-        :param start: current location of pawn (ex: a7)
-        :param end: desired location of pawn (ex: a5)
+        :param start: square index of the pawn (ex: a7 is 48)
+        :param end: square index it moves to (ex: a5 is 32)
+        :param board: current board. pawn moves depend on what is on the end square
         :return: false or move piece to end location
         """
 
         # calling on static method
-        starting_square = self._moves.store_row_column(start)
-        end_square = self._moves.store_row_column(end)
+        starting_square = Moves.store_row_column(start)
+        end_square = Moves.store_row_column(end)
 
-        # generate board
-        game_board = self._board_object.get_board()
+        game_board = board
 
         # starting moves for white
         if self._color == 'white':
             if end_square[1] > starting_square[1]:
                 # Check conditions for moving forward
-                if starting_square[1] == 2 and end_square[1] in [3, 4] and game_board[end] is None:
+                if starting_square[1] == 2 and end_square[1] in [3, 4] and end_square[0] == starting_square[0] \
+                        and game_board[end] is None:
                     return True
                 # Check if it's a diagonal capture
                 if (end_square[1] - starting_square[1]) == 1 and abs(end_square[0] - starting_square[0]) == 1 \
@@ -206,14 +462,15 @@ class Pawn(ChessPiece):
         if self._color == 'black':
             if end_square[1] < starting_square[1]:
                 # Check conditions for moving forward
-                if starting_square[1] == 7 and end_square[1] in [5, 6] and game_board[end] is None:
+                if starting_square[1] == 7 and end_square[1] in [5, 6] and end_square[0] == starting_square[0] \
+                        and game_board[end] is None:
                     return True
                 # Check if it's a diagonal capture
                 if (starting_square[1] - end_square[1]) == 1 and abs(end_square[0] - starting_square[0]) == 1 \
                         and game_board[end] is not None and game_board[end].get_color() == "white":
                     return True
                 # Check if it's a regular move forward
-                if starting_square[1] >= 5 and end_square[1] - starting_square[1] == -1 \
+                if starting_square[1] <= 6 and end_square[1] - starting_square[1] == -1 \
                         and end_square[0] - starting_square[0] == 0 and game_board[end] is None:
                     return True
                 # Return False if none of the above conditions are met
@@ -228,18 +485,17 @@ class Rook(ChessPiece):
     """
     Rook chess piece, subclass of Chess Piece. Includes type, color, name
     """
-    def __init__(self, color):      # don't need chessvar obj b/c don't need boardgame
-        super().__init__(color)
-        self._type = "rook"
-        self._color = color
-        self._name = self._color + " " + self._type         # ex "black pawn"
-        self._moves = Moves()
+    __slots__ = ()
+
+    def __init__(self, color):      # don't need chess var obj b/c don't need boardgame
+        super().__init__(color, 'rook')
 
-    def allowed_moves(self, start, end):
+    def allowed_moves(self, start, end, board=None):
         """
         allowed rook moves. can move vertically or horizontally
-        :param start: starting square notation
-        :param end: end square notation
+        :param start: starting square index
+        :param end: end square index
+        :param board: current board, not needed for this piece
         :return: True if the move is legal. False if the move is illegal.
         """
 
@@ -268,23 +524,22 @@ class Knight(ChessPiece):
     """
     knight chess piece, subclass of Chess Piece. Includes type, color, name
     """
-    def __init__(self, color):      # don't need chessvar obj b/c don't need boardgame
-        super().__init__(color)
-        self._type = "knight"
-        self._color = color
-        self._name = self._color + " " + self._type         # ex "black pawn"
-        self._moves = Moves()
+    __slots__ = ()
+
+    def __init__(self, color):      # don't need chess var obj b/c don't need boardgame
+        super().__init__(color, 'knight')
 
-    def allowed_moves(self, start, end):
+    def allowed_moves(self, start, end, board=None):
         """
         allowed moves for a Knight chesspiece
-        :param start: starting square notation
-        :param end: end square notation
+        :param start: starting square index
+        :param end: end square index
+        :param board: current board, not needed for this piece
         :return: True if the move is legal. False if the move is illegal.
         """
 
-        starting_square = self._moves.store_row_column(start)
-        end_square = self._moves.store_row_column(end)
+        starting_square = Moves.store_row_column(start)
+        end_square = Moves.store_row_column(end)
 
         # up/down 2, left right 1 (L)
         if abs(end_square[1] - starting_square[1]) == 2 and abs(end_square[0] - starting_square[0]) == 1:
@@ -300,24 +555,23 @@ class Bishop(ChessPiece):
     """
     bishop chess piece, subclass of Chess Piece. Includes type, color, name
     """
+    __slots__ = ()
+
     def __init__(self, color):              # don't need chess var obj b/c don't need boardgame
-        super().__init__(color)
-        self._type = "bishop"
-        self._color = color
-        self._name = self._color + " " + self._type         # ex "black pawn"
-        self._moves = Moves()
+        super().__init__(color, 'bishop')
 
-    def allowed_moves(self, start, end):
+    def allowed_moves(self, start, end, board=None):
         """
         allowed moves for bishop chess piece. only move diagonally
-        :param start: starting square notation
-        :param end: end square notation
+        :param start: starting square index
+        :param end: end square index
+        :param board: current board, not needed for this piece
         :return: True if the move is legal. False if the move is illegal.
         """
 
         # static method
-        starting_square = self._moves.store_row_column(start)
-        end_square = self._moves.store_row_column(end)
+        starting_square = Moves.store_row_column(start)
+        end_square = Moves.store_row_column(end)
 
         # use abs since tracking how many moves total, since can move any amount of spaces
         if abs(end_square[1] - starting_square[1]) == abs(end_square[0] - starting_square[0]):
@@ -330,23 +584,22 @@ class King(ChessPiece):
     """
     king chess piece, subclass of Chess Piece. Includes type, color, name
     """
+    __slots__ = ()
+
     def __init__(self, color):                  # don't need chess var obj b/c don't need boardgame
-        super().__init__(color)
-        self._type = "king"
-        self._color = color
-        self._name = self._color + " " + self._type         # ex "black pawn"
-        self._moves = Moves()
+        super().__init__(color, 'king')
 
-    def allowed_moves(self, start, end):
+    def allowed_moves(self, start, end, board=None):
         """
         allowed moves for a King chess piece
-        :param start: starting square notation
-        :param end: end square notation
+        :param start: starting square index
+        :param end: end square index
+        :param board: current board, not needed for this piece
         :return: True if the move is legal. False if the move is illegal.
         """
 
-        starting_square = self._moves.store_row_column(start)
-        end_square = self._moves.store_row_column(end)
+        starting_square = Moves.store_row_column(start)
+        end_square = Moves.store_row_column(end)
 
         row_diff = abs(end_square[1] - starting_square[1])
         col_diff = abs(end_square[0] - starting_square[0])
@@ -361,23 +614,22 @@ class Queen(ChessPiece):
     """
     queen chess piece, subclass of Chess Piece. Includes type, color, name
     """
+    __slots__ = ()
+
     def __init__(self, color):                  # don't need chess var obj b/c don't need boardgame
-        super().__init__(color)
-        self._type = "queen"
-        self._color = color
-        self._name = self._color + " " + self._type         # ex "black pawn"
-        self._moves = Moves()
+        super().__init__(color, 'queen')
 
-    def allowed_moves(self, start, end):
+    def allowed_moves(self, start, end, board=None):
         """
         allowed moves for queen. any direction and any amount of squares
-        :param start: starting square notation
-        :param end: end square notation
+        :param start: starting square index
+        :param end: end square index
+        :param board: current board, not needed for this piece
         :return: True if the move is legal. False if the move is illegal.
         """
 
-        starting_square = self._moves.store_row_column(start)
-        end_square = self._moves.store_row_column(end)
+        starting_square = Moves.store_row_column(start)
+        end_square = Moves.store_row_column(end)
 
         # check if same row column or diag move
         row_difference = abs(end_square[1] - starting_square[1])
@@ -390,6 +642,132 @@ class Queen(ChessPiece):
             return False
 
 
+# the 12 shared pieces, indexed by piece code
+PIECES = [piece_class(color) for color in COLORS for piece_class in [Pawn, Knight, Bishop, Rook, Queen, King]]
+
+
+def get_piece(color, piece_type):
+    """
+    :return: the shared piece object for a color and type
+    """
+    return PIECES[PIECE_CODES[(color, piece_type)]]
+
+
+# FEN for the variant: piece placement and side to move only, no castling, en passant or move counters
+STARTING_FEN = 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w'
+FEN_LETTERS = {letter.upper() if color == 'white' else letter: get_piece(color, piece_type)
+               for color in COLORS for letter, piece_type in zip('pnbrqk', PIECE_TYPES)}
+PIECE_LETTERS = {piece: letter for letter, piece in FEN_LETTERS.items()}
+FEN_SIDES = {'w': 'white', 'b': 'black'}
+FEN_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=FEN_CACHE_SIZE)
+def parse_fen(fen):
+    """
+    parse a FEN position. results are cached, so setting up the same position again is a dict lookup.
+    raises ValueError for bad syntax, a pawn on its own first row, or anything but one king per color
+    :param fen: piece placement and side to move, ex: rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w
+    :return: (tuple of 64 pieces or None by square index, current player)
+    """
+    fields = fen.split()
+    if len(fields) != 2 or fields[1] not in FEN_SIDES:
+        raise ValueError(f"FEN needs piece placement and side to move (w or b): {fen!r}")
+
+    rows = fields[0].split('/')
+    if len(rows) != 8:
+        raise ValueError(f"FEN needs 8 rows: {fen!r}")
+
+    squares = [None] * 64
+    for row_number, row in enumerate(rows):     # first row in the FEN is row 8
+        index = (7 - row_number) * 8
+        row_end = index + 8
+        for letter in row:
+            if letter in '12345678':
+                index += int(letter)
+            elif letter in FEN_LETTERS and index < row_end:
+                squares[index] = FEN_LETTERS[letter]
+                index += 1
+            else:
+                raise ValueError(f"bad FEN row {row!r}: {fen!r}")
+        if index != row_end:
+            raise ValueError(f"FEN row {row!r} doesn't have 8 squares: {fen!r}")
+
+    # a pawn can't get behind its own second row. one on its last row is fine, there is no promotion
+    if get_piece('white', 'pawn') in squares[:8] or get_piece('black', 'pawn') in squares[56:]:
+        raise ValueError(f"FEN has a pawn on its own first row: {fen!r}")
+    for color in COLORS:
+        if squares.count(get_piece(color, 'king')) != 1:
+            raise ValueError(f"FEN needs exactly one {color} king: {fen!r}")
+
+    return tuple(squares), FEN_SIDES[fields[1]]
+
+
+# what make_move prints when it turns a move down. other rejections are silent
+REJECTION_MESSAGES = {'bad_notation': "Not a valid move!!", 'no_piece': "No piece chosen",
+                      'same_square': "You didn't move the piece", 'king_capture': "King cannot capture pieces"}
+# validate_moves result codes, 0 means the move is legal
+REJECTION_CODES = {reason: code for code, reason in enumerate(
+    ['legal', 'bad_notation', 'game_over', 'no_piece', 'not_your_piece', 'same_square', 'piece_rule', 'blocked',
+     'own_piece', 'king_capture', 'both_kings'])}
+REJECTION_REASONS = sorted(REJECTION_CODES, key=REJECTION_CODES.get)
+MOVE_PHASES = ['validate', 'turn_rules', 'allowed_moves', 'move_along_board', 'capture_rules', 'move', 'capture',
+               'explode', 'update_game_state']
+
+
+class MoveStats:
+    """
+    make_move counters and phase timers, filled in while profiling is on. see ChessVar.enable_profiling
+    """
+    def __init__(self):
+        self._moves = 0
+        self._accepted = 0
+        self._rejections = {}
+        self._calls = dict.fromkeys(MOVE_PHASES, 0)
+        self._nanoseconds = dict.fromkeys(MOVE_PHASES, 0)
+
+    def add_time(self, phase, started):
+        """
+        charge the time since started to a phase
+        :param started: time.perf_counter_ns() when the phase began
+        :return: time.perf_counter_ns() now, the start of the next phase
+        """
+        now = time.perf_counter_ns()
+        self._calls[phase] += 1
+        self._nanoseconds[phase] += now - started
+        return now
+
+    def accept(self):
+        """
+        count a move that was made
+        :return: True, for make_move to return
+        """
+        self._moves += 1
+        self._accepted += 1
+        return True
+
+    def reject(self, reason):
+        """
+        count a rejected move by reason instead of printing it
+        :return: False, for make_move to return
+        """
+        self._moves += 1
+        self._rejections[reason] = self._rejections.get(reason, 0) + 1
+        return False
+
+    def snapshot(self):
+        """
+        :return: dict with moves, accepted, rejected (reason -> count) and phases (phase -> calls, seconds)
+        """
+        return {'moves': self._moves, 'accepted': self._accepted, 'rejected': dict(self._rejections),
+                'phases': {phase: {'calls': self._calls[phase], 'seconds': self._nanoseconds[phase] / 1e9}
+                           for phase in MOVE_PHASES}}
+
+
+# 'dict' was the name of the list backend before boards were indexed by square index
+BACKEND_ALIASES = {'dict': 'list'}
+
+
 class ChessVar:
     """
     Atomic Chess - all starting positions and rules are the same as regular chess EXCEPT that any captured piece creates an
@@ -397,17 +775,95 @@ class ChessVar:
     There is also no castling, en passant or pawn promotion. The overall goal is still to capture the king.
     """
 
-    def __init__(self):
-        self._board = self.initialize_board()  # Initialize the board
+    def __init__(self, backend='list'):
+        backend = BACKEND_ALIASES.get(backend, backend)
+        if backend not in ('list', 'bitboard'):
+            raise ValueError(f"unknown board backend: {backend}")
+
+        self._bitboards = BitBoard() if backend == 'bitboard' else None     # None when using the list board
+        if self._bitboards is not None:
+            self._board = self._bitboards   # indexed by square index, same as the list
+        else:
+            self._board = self.initialize_board()  # Initialize the board
         self._game_state = "UNFINISHED"
         self._current_player = "white"
         self._used_pieces = []      # if king is in here, game over
+        self._captured_counts = [0] * 12        # used pieces counted by piece code
+        self._kings_alive = [True, True]        # white, black. cleared when a king is used
+        self._undo_stack = []       # one entry per push(), taken back by pop()
+        self._hash = self.compute_hash()    # zobrist hash, kept up to date as pieces move
+        self._attacks = self.compute_attacks()     # white, black capture counts per square index
+        self._king_squares = self.find_kings()      # white, black king square index, None once blown up
+        self._score = self.compute_score()      # material and piece square score, white positive
+        self._stats = None      # MoveStats while profiling is on
 
     def get_board(self):
         """
-        get chessboard
+        get chessboard. this is a new snapshot on every call, writing to it doesn't change the game
+        :return: dict of square name -> piece (or None)
+        """
+        return {SQUARE_NAMES[index]: self._board[index] for index in BOARD_ORDER}
+
+    @classmethod
+    def from_fen(cls, fen, backend='list'):
+        """
+        start a game from a FEN position instead of the standard setup
+        :param fen: piece placement and side to move, see parse_fen
+        :return: ChessVar at that position
         """
-        return self._board
+        game = cls(backend)
+        game.set_position(*parse_fen(fen))
+        return game
+
+    def to_fen(self):
+        """
+        :return: FEN of the position, piece placement and side to move
+        """
+        rows = []
+        for row in range(7, -1, -1):
+            text = ''
+            empty = 0
+            for index in range(row * 8, row * 8 + 8):
+                piece = self._board[index]
+                if piece is None:
+                    empty += 1
+                    continue
+                if empty:
+                    text += str(empty)
+                    empty = 0
+                text += PIECE_LETTERS[piece]
+            rows.append(text + str(empty) if empty else text)
+        return '/'.join(rows) + (' w' if self._current_player == 'white' else ' b')
+
+    def set_position(self, squares, current_player):
+        """
+        replace the board. used pieces, counters and the undo stack start over
+        :param squares: 64 pieces or None by square index, one king per color (parse_fen checks this)
+        :param current_player: white or black
+        """
+        if self._bitboards is None:
+            self._board[:] = squares
+        else:
+            for index in range(64):
+                self._board[index] = squares[index]
+
+        self._current_player = current_player
+        self._used_pieces = []
+        self._captured_counts = [0] * 12
+        self._kings_alive = [get_piece(color, 'king') in squares for color in COLORS]
+        self._undo_stack = []
+        self._hash = self.compute_hash()
+        self._attacks = self.compute_attacks()
+        self._king_squares = self.find_kings()
+        self._score = self.compute_score()
+        self.update_game_state()
+
+    def get_piece_at(self, index):
+        """
+        :param index: square index (a1 = 0, h8 = 63)
+        :return: piece on the square, None if empty
+        """
+        return self._board[index]
 
     def get_used_pieces(self):
         """
@@ -415,12 +871,251 @@ class ChessVar:
         """
         return self._used_pieces
 
+    def get_captured_summary(self):
+        """
+        :return: dict of color -> dict of piece type -> number of that color's pieces captured or destroyed
+        """
+        return {color: {piece_type: self._captured_counts[color_index * 6 + type_index]
+                        for type_index, piece_type in enumerate(PIECE_TYPES)}
+                for color_index, color in enumerate(COLORS)}
+
+    def is_king_alive(self, color):
+        """
+        :param color: white or black
+        :return: True if that king is still on the board
+        """
+        return self._kings_alive[COLORS.index(color)]
+
+    def use_piece(self, piece):
+        """
+        add a captured or destroyed piece to used_pieces and update the counters
+        """
+        self._used_pieces.append(piece)
+        self._captured_counts[piece.get_code()] += 1
+        if piece.get_type() == 'king':
+            self._kings_alive[COLORS.index(piece.get_color())] = False
+
+    def restore_used_pieces(self, used_count):
+        """
+        take used pieces back off the end of used_pieces until only used_count are left. used by pop
+        """
+        for piece in self._used_pieces[used_count:]:
+            self._captured_counts[piece.get_code()] -= 1
+            if piece.get_type() == 'king':
+                self._kings_alive[COLORS.index(piece.get_color())] = True
+        del self._used_pieces[used_count:]
+
     def initialize_board(self):
         """
         Initialize the board.
         """
         board_instance = Board()  # board instance
-        return board_instance.get_board()  # get board
+        return board_instance.get_squares()  # get board
+
+    def get_hash(self):
+        """
+        :return: 64 bit zobrist hash of the position (pieces and side to move)
+        """
+        return self._hash
+
+    def compute_hash(self):
+        """
+        zobrist hash built from scratch. make_move keeps self._hash up to date without calling this
+        :return: 64 bit hash of the position
+        """
+        position_hash = 0
+        for index in range(64):
+            piece = self._board[index]
+            if piece is not None:
+                position_hash ^= ZOBRIST_PIECES[piece.get_code()][index]
+        if self._current_player == 'black':
+            position_hash ^= ZOBRIST_BLACK_TO_MOVE
+        return position_hash
+
+    def place_piece(self, square, piece):
+        """
+        put a piece on an empty square and update the hash and attack counts
+        """
+        self.update_slider_attacks(square, -1)     # the piece blocks sliders passing through
+        self._board[square] = piece
+        self.add_attacks(square, piece, 1)
+        code = piece.get_code()
+        self._hash ^= ZOBRIST_PIECES[code][square]
+        self._score += PIECE_SQUARE_SCORES[code][square]
+        if code % 6 == 5:
+            self._king_squares[code // 6] = square
+
+    def remove_piece(self, square):
+        """
+        take the piece off a square and update the hash and attack counts
+        :return: removed piece
+        """
+        piece = self._board[square]
+        self.add_attacks(square, piece, -1)
+        self._board[square] = None
+        self.update_slider_attacks(square, 1)
+        code = piece.get_code()
+        self._hash ^= ZOBRIST_PIECES[code][square]
+        self._score -= PIECE_SQUARE_SCORES[code][square]
+        if code % 6 == 5:
+            self._king_squares[code // 6] = None
+        return piece
+
+    def find_kings(self):
+        """
+        :return: [white king square, black king square], None for a king that is not on the board
+        """
+        king_squares = [None, None]
+        for index in range(64):
+            piece = self._board[index]
+            if piece is not None and piece.get_code() % 6 == 5:
+                king_squares[piece.get_code() // 6] = index
+        return king_squares
+
+    def compute_score(self):
+        """
+        material and piece square score built from scratch. place_piece and remove_piece keep self._score up to
+        date without this
+        :return: score, positive when white is ahead
+        """
+        score = 0
+        for index in range(64):
+            piece = self._board[index]
+            if piece is not None:
+                score += PIECE_SQUARE_SCORES[piece.get_code()][index]
+        return score
+
+    def king_danger(self, color_index):
+        """
+        atomic terms for one king, read from the king square and the attack counts instead of the whole board
+        :return: (own pieces next to the king, squares in the king's blast the opponent can capture on)
+        """
+        king = self._king_squares[color_index]
+        if king is None:
+            return 0, 0
+
+        board = self._board
+        opponent_attacks = self._attacks[1 - color_index]
+        neighbors = threats = 0
+        for square in BLAST_SQUARES[king]:
+            piece = board[square]
+            if piece is None or piece.get_code() // 6 != color_index:
+                continue
+            if square != king:
+                neighbors += 1
+            if opponent_attacks[square]:
+                threats += 1
+        return neighbors, threats
+
+    def evaluate(self):
+        """
+        static evaluation: material, piece squares, pieces crowding their own king and captures that would blow
+        a king up
+        :return: score from the side to move's point of view
+        """
+        score = self._score
+        to_move = 0 if self._current_player == 'white' else 1
+        for color_index in range(2):
+            neighbors, threats = self.king_danger(color_index)
+            danger = KING_NEIGHBOR_PENALTY * neighbors
+            danger += threats * (KING_THREAT_WAITING if color_index == to_move else KING_THREAT_TO_MOVE)
+            score += danger if color_index == 1 else -danger
+        return score if to_move == 0 else -score
+
+    def attack_targets(self, index, piece):
+        """
+        squares a piece could capture on if an opponent piece were there. kings can't capture, so they attack nothing
+        :return: list of square indexes
+        """
+        code = piece.get_code()
+        piece_type = code % 6
+        if piece_type == 0:
+            return PAWN_CAPTURES[code // 6][index]
+        if piece_type == 1:
+            return KNIGHT_TARGETS[index]
+        if piece_type == 5:
+            return []
+
+        targets = []
+        for direction in SLIDER_DIRECTIONS[PIECE_TYPES[piece_type]]:
+            for target in RAYS[index][direction]:
+                targets.append(target)
+                if self._board[target] is not None:
+                    break
+        return targets
+
+    def add_attacks(self, index, piece, change):
+        """
+        add change (1 or -1) to the attack count of every square the piece on index attacks
+        """
+        counts = self._attacks[piece.get_code() // 6]
+        for target in self.attack_targets(index, piece):
+            counts[target] += change
+
+    def update_slider_attacks(self, index, change):
+        """
+        sliders whose rays run through the empty square index reach past it. add change to the squares past it,
+        -1 just before a piece is placed there, 1 just after a piece is removed
+        """
+        board = self._board
+        rays = RAYS[index]
+        for direction in range(8):
+            for square in rays[OPPOSITE_DIRECTIONS[direction]]:
+                piece = board[square]
+                if piece is None:
+                    continue
+                code = piece.get_code()
+                if code in DIRECTION_SLIDERS[direction]:
+                    counts = self._attacks[code // 6]
+                    for target in rays[direction]:
+                        counts[target] += change
+                        if board[target] is not None:
+                            break
+                break
+
+    def compute_attacks(self):
+        """
+        attack counts built from scratch. place_piece and remove_piece keep self._attacks up to date without this
+        :return: [white counts, black counts], 64 counts each
+        """
+        attacks = [[0] * 64, [0] * 64]
+        for index in range(64):
+            piece = self._board[index]
+            if piece is not None:
+                for target in self.attack_targets(index, piece):
+                    attacks[piece.get_code() // 6][target] += 1
+        return attacks
+
+    def get_attack_counts(self, color):
+        """
+        :param color: white or black
+        :return: list of 64 counts by square index, how many of color's pieces could capture on each square
+        """
+        return self._attacks[COLORS.index(color)]
+
+    def is_attacked(self, square, color):
+        """
+        :param square: square notation (ex: e4)
+        :param color: white or black
+        :return: True if a piece of that color could capture on the square
+        """
+        return self._attacks[COLORS.index(color)][SQUARE_INDEX[square]] > 0
+
+    def capture_would_destroy_king(self, start, end):
+        """
+        :param start: starting square notation
+        :param end: end square notation
+        :return: True if start to end is an allowed capture whose explosion destroys a king (either color)
+        """
+        start_index, end_index = SQUARE_INDEX.get(start), SQUARE_INDEX.get(end)
+        if start_index is None or end_index is None or self._board[end_index] is None \
+                or not self.is_move_allowed(start_index, end_index, quiet=True):
+            return False
+
+        if self._bitboards is not None:
+            return self._bitboards.kings_in_blast(end_index) > 0
+        return any(self._board[square] is not None and self._board[square].get_code() % 6 == 5
+                   for square in BLAST_SQUARES[end_index])
 
     def get_game_state(self):
         """
@@ -433,28 +1128,14 @@ class ChessVar:
         update current game state. if black king is in used pieces, white wins, vice versa
         """
 
-        self._game_state = 'UNFINISHED'
-
-        for piece in self._used_pieces:
-            # if current player is white
-            if self._current_player == 'white':
-                if piece.get_type() == 'king' and piece.get_color() == 'black':
-                    self._game_state = "WHITE_WON"
-                    return
-            # if current player is black
-            if self._current_player == 'black':
-                if piece.get_type() == 'king' and piece.get_color() == 'white':
-                    self._game_state = "BLACK_WON"
-                    return
-
-    def current_player_winner(self):
-        """
-        current player is winner
-        """
-        if self._current_player == 'WHITE':
-            self._game_state = 'WHITE_WON'
+        # a capture can blow up either king, not just the opponent's. the flags save a walk over used_pieces
+        white_alive, black_alive = self._kings_alive
+        if not black_alive:
+            self._game_state = "WHITE_WON"
+        elif not white_alive:
+            self._game_state = "BLACK_WON"
         else:
-            self._game_state = 'BLACK_WON'
+            self._game_state = 'UNFINISHED'
 
     def get_current_player(self):
         """
@@ -470,163 +1151,432 @@ class ChessVar:
             self._current_player = "black"
         else:
             self._current_player = 'white'
+        self._hash ^= ZOBRIST_BLACK_TO_MOVE
 
     def make_move(self, start, end):
         """
         take 2 parameters - strings representing square being moved from and square moved to
         """
-#        print("Calling make_move")
-        # Print the game state:
-#        print(f"Game state: {self._game_state}")
-        # Print the current player:
-#        print(f"Current player: {self._current_player}")
-        # Print the value of each argument (start, end):
-#        print(f"Move: {start} {end}")
-#        print("The current state of the board:")
-#        self.print_board()
-
-        # check if game is over
-        if self._game_state != 'UNFINISHED':
-            print(self.get_game_state())
+        # profiling takes its own path so make_move pays for one check when it is off
+        if self._stats is not None:
+            return self.profile_move(start, end)
+
+        # must be valid entry. one table lookup turns the notation into a square index
+        start_index = SQUARE_INDEX.get(start)
+        end_index = SQUARE_INDEX.get(end)
+        if start_index is None or end_index is None:
+            print(REJECTION_MESSAGES['bad_notation'])
             return False
 
-        # no more than 2 string entries, must be valid entry
-        if len(start) != 2 or len(end) != 2:
+        if not self.is_move_allowed(start_index, end_index):
             return False
 
-        # store alg notation
-        start_col = start[0]
-        start_row = int(start[1])
-        end_col = end[0]
-        end_row = int(end[1])
-
-        if (start_col not in ['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h'] or
-                end_col not in ['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h'] or
-                start_row not in [1, 2, 3, 4, 5, 6, 7, 8] or
-                end_row not in [1, 2, 3, 4, 5, 6, 7, 8]):
-            print("Not a valid move!!")
-            return False
+        self.execute_move(start_index, end_index)
+        return True
 
-        # if current player chose opponent piece, return false
-        if self._current_player != self._board[start].get_color():
-            return False
+    def enable_profiling(self):
+        """
+        start counting and timing each phase of make_move, with fresh counters. rejected moves are counted by
+        reason instead of printed
+        """
+        self._stats = MoveStats()
 
-        # if player didn't choose a piece, return false
-        if not self._board[start]:
-            print("No piece chosen")
-            return False
+    def disable_profiling(self):
+        """
+        stop profiling. make_move goes back to printing why moves are rejected
+        """
+        self._stats = None
 
-        # player start and end are the same, piece did not move. must be different
-        if start == end:
-            print("You didn't move the piece")
-            return False
+    def get_move_stats(self):
+        """
+        :return: MoveStats.snapshot() of make_move calls since profiling was enabled, None if it is off
+        """
+        return self._stats.snapshot() if self._stats is not None else None
+
+    def profile_move(self, start, end):
+        """
+        make_move with every phase timed. same checks in the same order, see move_rejection and execute_move
+        """
+        stats = self._stats
+        started = time.perf_counter_ns()
+        start_index = SQUARE_INDEX.get(start)
+        end_index = SQUARE_INDEX.get(end)
+        started = stats.add_time('validate', started)
+        if start_index is None or end_index is None:
+            return stats.reject('bad_notation')
+
+        reason = self.turn_rejection(start_index, end_index)
+        started = stats.add_time('turn_rules', started)
+        if reason is not None:
+            return stats.reject(reason)
+
+        moving_piece = self._board[start_index]
+        allowed = moving_piece.allowed_moves(start_index, end_index, self._board)
+        started = stats.add_time('allowed_moves', started)
+        if not allowed:
+            return stats.reject('piece_rule')
+
+        if moving_piece.get_type() != 'knight':
+            clear = self.move_along_board(start_index, end_index)
+            started = stats.add_time('move_along_board', started)
+            if not clear:
+                return stats.reject('blocked')
+
+        reason = self.capture_rejection(start_index, end_index)
+        started = stats.add_time('capture_rules', started)
+        if reason is not None:
+            return stats.reject(reason)
+
+        # the same board updates as execute_move, timed one by one
+        if self._board[end_index] is None:
+            self.move_piece(start_index, end_index)
+            stats.add_time('move', started)
+        else:
+            self.remove_capturing_piece(start_index)
+            started = stats.add_time('capture', started)
+            if self.explode_around_square(end_index):
+                started = stats.add_time('explode', started)
+                self.update_game_state()
+                stats.add_time('update_game_state', started)
+        self.change_player()
+        return stats.accept()
+
+    def is_move_allowed(self, start, end, quiet=False):
+        """
+        check a move against the rules without making it
+        :param start: starting square index
+        :param end: end square index
+        :param quiet: don't print why a move is rejected
+        :return: True if make_move would accept the move
+        """
+        reason = self.move_rejection(start, end)
+        if reason is None:
+            return True
+
+        if not quiet:
+            if reason == 'game_over':
+                print(self.get_game_state())
+            elif reason in REJECTION_MESSAGES:
+                print(REJECTION_MESSAGES[reason])
+        return False
+
+    def move_rejection(self, start, end):
+        """
+        :param start: starting square index
+        :param end: end square index
+        :return: why the move is not allowed (game_over, no_piece, not_your_piece, same_square, piece_rule, blocked,
+                 own_piece, king_capture, both_kings), None if it is allowed
+        """
+        reason = self.turn_rejection(start, end)
+        if reason is not None:
+            return reason
+
+        moving_piece = self._board[start]
 
         # check if move is valid based on chess piece and current player
-        if not self._board[start].allowed_moves(start, end):
-            return False
+        if not moving_piece.allowed_moves(start, end, self._board):
+            return 'piece_rule'
 
         # player can't move through another chess piece unless knight
-        if self._board[start].get_type() != 'knight' and not self.move_along_board(start, end):
-            return False
+        if moving_piece.get_type() != 'knight' and not self.move_along_board(start, end):
+            return 'blocked'
 
-        # if end square has same color piece as starting piece
-        if self._board[end] is not None and self._board[end].get_color() == self._board[start].get_color():
-            return False
+        return self.capture_rejection(start, end)
+
+    def turn_rejection(self, start, end):
+        """
+        checks that come before the piece's own movement rules
+        :return: rejection reason or None, see move_rejection
+        """
+        # check if game is over
+        if self._game_state != 'UNFINISHED':
+            return 'game_over'
+
+        moving_piece = self._board[start]
+
+        # if player didn't choose a piece, return false
+        if not moving_piece:
+            return 'no_piece'
+
+        # if current player chose opponent piece, return false
+        if self._current_player != moving_piece.get_color():
+            return 'not_your_piece'
+
+        # player start and end are the same, piece did not move. must be different
+        if start == end:
+            return 'same_square'
+        return None
+
+    def capture_rejection(self, start, end):
+        """
+        checks on what is standing on the end square
+        :return: rejection reason or None, see move_rejection
+        """
+        moving_piece = self._board[start]
+        captured_piece = self._board[end]
+        if captured_piece is None:
+            return None
 
         # cant remove own piece
-        if self._board[end] and self._current_player == self._board[end].get_color():
-            return False
+        if captured_piece.get_color() == moving_piece.get_color():
+            return 'own_piece'
 
         # king cant capture
-        if (self._board[start].get_type() == 'king' and self._board[end] is not None and
-                self._board[end].get_color() != self._board[start].get_color()):
-            print("King cannot capture pieces")
-            return False
+        if moving_piece.get_type() == 'king':
+            return 'king_capture'
 
-        # if there is a piece on the end square and end square color is not the current player
-        if self._board[end] is not None and self._board[end].get_color() != self._current_player:
-            # Capture the enemy piece
-            captured_piece = self._board[end]
-            capturing_piece = self._board[start]
-
-            if captured_piece.get_type() != 'pawn':
-                # trigger explosion around the captured square
-                self.explode_around_square(end)
-            
-                # add both captured and capturing piece to used list
-                self._used_pieces.append(captured_piece)
-                self._used_pieces.append(capturing_piece)
-            
-                # remove both pieces from board
-                self._board[end] = None
-                self._board[start] = None
-            
-                self.update_game_state()
-                return True
+        # a player cannot blow up both kings at the same time
+        if self.explosion_hits_both_kings(end):
+            return 'both_kings'
+        return None
 
-            # if end piece contains a pawn, dont trigger explosion.
-            if captured_piece.get_type() == 'pawn':
-                captured_piece = self._board[end]
-                capturing_piece = self._board[start]
-                self._used_pieces.append(captured_piece)
-                self._used_pieces.append(capturing_piece)
+    def execute_move(self, start, end):
+        """
+        move a piece that already passed is_move_allowed, resolve any capture and change turns
+        :param start: starting square index
+        :param end: end square index
+        :return: list of (square index, piece) destroyed by the capture, empty for a quiet move
+        """
+        destroyed = []
 
-            # if the king is captured directly by a piece other than a king
+        # if there is a piece on the end square it belongs to the opponent. capture it
+        if self._board[end] is not None:
+            self.remove_capturing_piece(start)
 
-            if captured_piece.get_type() == 'king':
-                self.current_player_winner()
+            # trigger explosion around the captured square. removes the captured piece and non-pawn neighbours.
+            # one game state update for the whole blast ends the game if a king is caught
+            destroyed = self.explode_around_square(end)
+            if destroyed:
                 self.update_game_state()
-                return True
-
-            if self._game_state != 'UNFINISHED':
-                return True
 
-        # legal move, make move update board
-        self._board[end] = self._board[start]
-        self._board[start] = None  # Clear the starting square
+        else:
+            # legal move, make move update board
+            self.move_piece(start, end)
 
         self.change_player()
 
+        return destroyed
+
+    def move_piece(self, start, end):
+        """
+        move the piece on start to the empty end square
+        """
+        moving_piece = self._board[start]
+        self.remove_piece(start)  # Clear the starting square
+        self.place_piece(end, moving_piece)
+
+    def remove_capturing_piece(self, start):
+        """
+        every capture is suicidal, the capturing piece is removed too (even a pawn)
+        """
+        self.use_piece(self._board[start])
+        self.remove_piece(start)
+
+    def push(self, move):
+        """
+        make a move and remember how to take it back. used for searching ahead without copying the game
+        :param move: (start, end) square pair
+        :return: True if the move was made, False if it is not allowed
+        """
+        start, end = SQUARE_INDEX.get(move[0]), SQUARE_INDEX.get(move[1])
+        if start is None or end is None or not self.is_move_allowed(start, end):
+            return False
+
+        self.push_move(start, end)
         return True
 
-    def explode_around_square(self, captured_square):
-    """
-    8 squares surrounding captured piece explode and are added to used_pieces.
-    Pawns are only destroyed if they are at the center. If a king explodes, end game.
-    """
-    column = captured_square[0]
-    row = int(captured_square[1])
+    def push_move(self, start, end):
+        """
+        push for a move from generate_moves. skips the rule checks, so the move must be legal
+        :param start: starting square index
+        :param end: end square index
+        """
+        # small undo entry: moved piece, captured piece and what the explosion destroyed
+        moving_piece = self._board[start]
+        captured_piece = self._board[end]
+        game_state = self._game_state
+        used_count = len(self._used_pieces)
+        destroyed = self.execute_move(start, end)
+        self._undo_stack.append((start, end, moving_piece, captured_piece, destroyed, game_state, used_count))
+
+    def pop(self):
+        """
+        take back the last move made with push
+        :return: the (start, end) pair that was taken back
+        """
+        start, end, moving_piece, captured_piece, destroyed, game_state, used_count = self._undo_stack.pop()
 
-    col_index = ord(column)
-    row_index = int(row)
+        if captured_piece is None:
+            self.remove_piece(end)
+        for square, piece in destroyed:     # includes the captured piece on end
+            self.place_piece(square, piece)
+        self.place_piece(start, moving_piece)
 
-    row_offsets = [-1, 0, 1]
-    col_offsets = [-1, 0, 1]
+        self.restore_used_pieces(used_count)
+        self._game_state = game_state
+        self.change_player()
+        return SQUARE_NAMES[start], SQUARE_NAMES[end]
 
-    for row_offset in row_offsets:
-        for col_offset in col_offsets:
-            new_col_index = col_index + col_offset
-            new_row_index = row_index + row_offset
+    def legal_moves(self):
+        """
+        every move the current player can make, without changing the game or printing anything
+        :return: generator of (start, end) square pairs
+        """
+        for start, end in self.generate_moves():
+            yield SQUARE_NAMES[start], SQUARE_NAMES[end]
 
-            # skip if out of bounds
-            if not (ord('a') <= new_col_index <= ord('h') and 1 <= new_row_index <= 8):
+    def validate_moves(self, pairs):
+        """
+        check many moves at once without making them or printing anything. moves from the same square share one
+        piece lookup and one pass over the attack tables
+        :param pairs: list of (start, end) square notation pairs
+        :return: array('B') with one code per pair, 0 if the move is legal, otherwise a REJECTION_CODES value
+                 (REJECTION_REASONS turns it back into a name)
+        """
+        results = array('B', bytes(len(pairs)))
+        legal_targets = {}      # start square index -> set of legal end square indexes
+        for position, (start, end) in enumerate(pairs):
+            start_index = SQUARE_INDEX.get(start)
+            end_index = SQUARE_INDEX.get(end)
+            if start_index is None or end_index is None:
+                results[position] = REJECTION_CODES['bad_notation']
                 continue
 
-            square = chr(new_col_index) + str(new_row_index)
-            piece = self._board.get(square)
+            targets = legal_targets.get(start_index)
+            if targets is None:
+                piece = self._board[start_index]
+                targets = set()
+                if self._game_state == 'UNFINISHED' and piece is not None \
+                        and piece.get_color() == self._current_player:
+                    targets = {target for origin, target in self.generate_piece_moves(start_index, piece)}
+                legal_targets[start_index] = targets
+
+            # only a rejected move goes through the rules one by one, to find out why
+            if end_index not in targets:
+                results[position] = REJECTION_CODES[self.move_rejection(start_index, end_index)]
+        return results
+
+    def legal_moves_from(self, square):
+        """
+        legal moves for the piece on one square
+        :param square: starting square notation (ex: e2)
+        :return: generator of (start, end) square pairs. empty if it is not the current player's piece
+        """
+        index = SQUARE_INDEX.get(square)
+        if self._game_state != 'UNFINISHED' or index is None:
+            return
+
+        piece = self._board[index]
+        if piece is not None and piece.get_color() == self._current_player:
+            for start, end in self.generate_piece_moves(index, piece):
+                yield SQUARE_NAMES[start], SQUARE_NAMES[end]
 
-            if piece:
-                # Only the center pawn survives the explosion
-                if piece.get_type() == 'pawn' and square != captured_square:
+    def generate_moves(self):
+        """
+        legal_moves with square indexes instead of names
+        :return: generator of (start, end) square index pairs
+        """
+        if self._game_state != 'UNFINISHED':
+            return
+
+        for index in range(64):
+            piece = self._board[index]
+            if piece is not None and piece.get_color() == self._current_player:
+                yield from self.generate_piece_moves(index, piece)
+
+    def generate_piece_moves(self, index, piece):
+        """
+        walk the attack tables for one piece. no castling, en passant or promotion, and kings can't capture
+        :return: generator of (start, end) square index pairs
+        """
+        color = piece.get_color()
+        piece_type = piece.get_type()
+
+        if piece_type == 'pawn':
+            step = 8 if color == 'white' else -8
+            home_row = 1 if color == 'white' else 6
+            forward = index + step
+
+            # pawn on the last row is stuck, there is no promotion
+            if 0 <= forward < 64 and self._board[forward] is None:
+                yield index, forward
+                if index // 8 == home_row and self._board[forward + step] is None:
+                    yield index, forward + step
+
+            for target in PAWN_CAPTURES[COLORS.index(color)][index]:
+                if self.is_legal_capture(color, target):
+                    yield index, target
+            return
+
+        if piece_type in ('knight', 'king'):
+            targets = KNIGHT_TARGETS[index] if piece_type == 'knight' else KING_TARGETS[index]
+            for target in targets:
+                target_piece = self._board[target]
+                if target_piece is None:
+                    yield index, target
+                elif piece_type == 'knight' and self.is_legal_capture(color, target):
+                    yield index, target
+            return
+
+        # rook, bishop, queen slide until they hit something
+        for direction in SLIDER_DIRECTIONS[piece_type]:
+            for target in RAYS[index][direction]:
+                if self._board[target] is None:
+                    yield index, target
                     continue
+                if self.is_legal_capture(color, target):
+                    yield index, target
+                break
+
+    def is_legal_capture(self, color, target):
+        """
+        :return: True if the target square holds an opponent piece and capturing it won't blow up both kings
+        """
+        target_piece = self._board[target]
+        return (target_piece is not None and target_piece.get_color() != color
+                and not self.explosion_hits_both_kings(target))
+
+    def explode_around_square(self, captured_square):
+        """
+        8 squares surrounding captured piece explode and are added to used_pieces.
+        Pawns are only destroyed if they are at the center. If a king explodes, update_game_state ends the game.
+        :param captured_square: square index of the captured piece
+        :return: list of (square index, piece) destroyed
+        """
+        # bitboard backend finds the whole blast area with one mask
+        if self._bitboards is not None:
+            destroyed = self._bitboards.blast_victims(captured_square)
+        else:
+            destroyed = []
+            for square in BLAST_SQUARES[captured_square]:
+                piece = self._board[square]
 
-                self._used_pieces.append(piece)
-                self._board[square] = None
+                # pawns survive unless they are the captured piece
+                if piece and (square == captured_square or piece.get_type() != 'pawn'):
+                    destroyed.append((square, piece))
 
-                # If a king is caught in the explosion, update game state
-                if piece.get_type() == 'king':
-                    self.current_player_winner()
-                    self.update_game_state()
+        # pieces come off one at a time so the hash and attack counts follow. execute_move updates the game
+        # state once for the whole blast. both kings can't be caught, make_move blocks that
+        for square, piece in destroyed:
+            self.remove_piece(square)
+            self.use_piece(piece)
+
+        return destroyed
+
+    def explosion_hits_both_kings(self, captured_square):
+        """
+        check if an explosion on captured_square (a square index) would blow up both kings. that move is not allowed
+        """
+        if self._bitboards is not None:
+            return self._bitboards.kings_in_blast(captured_square) == 2
+
+        king_colors = set()
+        for square in BLAST_SQUARES[captured_square]:
+            piece = self._board[square]
+            if piece and piece.get_type() == 'king':
+                king_colors.add(piece.get_color())
+
+        return len(king_colors) == 2
 
 
     def print_board(self):
@@ -640,8 +1590,8 @@ class ChessVar:
         # Print each row and columns
         for row in range(8, 0, -1):
             row_pieces = [
-                f"[{self._board[column + str(row)].get_name() if self._board[column + str(row)] else '  '}]"
-                for column in columns
+                f"[{self._board[(row - 1) * 8 + column].get_name() if self._board[(row - 1) * 8 + column] else '  '}]"
+                for column in range(8)
             ]
             row_line = f"{row} {' '.join(row_pieces)} {row}"
             print(row_line)
@@ -649,91 +1599,14 @@ class ChessVar:
 
     def move_along_board(self, start, end):
         """
-        moving in all directions on board
-        """
-        start_column, start_row = ord(start[0]), int(start[1])
-        end_column, end_row = ord(end[0]), int(end[1])
-
-        # vertical move
-        if start_column == end_column:
-            return self.is_clear_vertical(start, end)
-
-        # horizontal move
-        if start_row == end_row:
-            return self.is_clear_horizontal(start, end)
-
-        # diagonal move
-        if abs(start_row - end_row) == abs(start_column - end_column):
-            return self.is_clear_diagonal(start, end)
-
-        return True     # or return False?
-
-    def is_clear_vertical(self, start, end):
-        """
-        Check vertical moves.
-        """
-        start_column, start_row = ord(start[0]), int(start[1])
-        end_column, end_row = ord(end[0]), int(end[1])
-
-        # vertical moves
-        if (end_column - start_column) == 0:
-            if (end_row - start_row) > 0:       # 1 to 8
-                for row in range(1, end_row - start_row):
-                    if self._board[chr(start_column) + str(start_row + row)]:
-                        return False
-            if (start_row - end_row) > 0:
-                for row in range(1, start_row - end_row):
-                    if self._board[chr(start_column) + str(start_row - row)]:
-                        return False
-            return True
-
-    def is_clear_horizontal(self, start, end):
-        """
-        Check horizontal moves.
+        moving in all directions on board. straight and diagonal moves need the squares in between to be empty
         """
-        start_column, start_row = ord(start[0]), int(start[1])
-        end_column, end_row = ord(end[0]), int(end[1])
+        # bitboard backend tests the squares in between against the occupied mask
+        if self._bitboards is not None:
+            return self._bitboards.is_path_clear(start, end)
 
-        if (end_row - start_row) == 0:
-            if (end_column - start_column) > 0:      # a to h
-                for column in range(1, end_column - start_column):
-                    if self._board[chr(start_column + column) + str(start_row)]:
-                        return False
-            if (start_column - end_column) > 0:
-                for column in range(1, start_column - end_column):
-                    if self._board[chr(start_column - column) + str(start_row)]:
-                        return False
-            return True
-
-    def is_clear_diagonal(self, start, end):
-        """
-        Check diagonal moves.
-        """
-        start_column, start_row = ord(start[0]), int(start[1])
-        end_column, end_row = ord(end[0]), int(end[1])
-
-        # move is diagonal - up right
-        if (end_row - start_row) == (end_column - start_column):
-            if (end_row - start_row) > 0 and (end_column - start_column) > 0:
-                for square in range(1, end_row - start_row):
-                    if self._board[chr(start_column + square) + str(start_row + square)]:
-                        return False
-                return True
-                # up left
-            if (end_row - start_row) > 0 and (start_column - end_column) > 0:
-                for square in range(1, end_row - start_row):
-                    if self._board[chr(start_column + square) + str(start_row + square)]:
-                        return False
-                return True
-                # down right
-            if (start_row - end_row) > 0 and (end_column - start_column) > 0:
-                for square in range(1, start_row - end_row):
-                    if self._board[chr(start_column + square) + str(start_row - square)]:
-                        return False
-                return True
-                # down left
-            if (start_row - end_row) > 0 and (start_column - end_column) > 0:
-                for square in range(1, start_row - end_row):
-                    if self._board[chr(start_column + square) + str(start_row - square)]:
-                        return False
-                return True
+        # squares in between come from a table, empty if the move is not along a line
+        for square in BETWEEN_SQUARES[start * 64 + end]:
+            if self._board[square]:
+                return False
+        return True
@@ -1,7 +1,20 @@
+import contextlib
+import copy
+import io
+import pickle
+import random
 import unittest
 from ChessVar import *
 #
 
+
+def board_names(game):
+    """
+    :return: dict of square -> piece name (or None) for comparing boards
+    """
+    return {square: piece.get_name() if piece else None for square, piece in game.get_board().items()}
+
+
 class TestPawn(unittest.TestCase):
     """
     pawn unit test
@@ -13,5 +26,505 @@ class TestPawn(unittest.TestCase):
         """
 
         game = ChessVar()
+        self.assertTrue(game.make_move('e2', 'e4'))
+        self.assertTrue(game.make_move('d7', 'd6'))
+        self.assertFalse(game.make_move('e4', 'e6'))    # only one square after the first move
+        self.assertFalse(game.make_move('a2', 'b3'))    # can't move sideways without a capture
+        self.assertFalse(game.make_move('e4', 'e3'))    # can't move backward
+
+
+class TestChessVar(unittest.TestCase):
+    """
+    game rules unit test
+    """
+    def test_readme_example(self):
+        """
+        example from the project description
+        """
+        game = ChessVar()
+        self.assertTrue(game.make_move('d2', 'd4'))
+        self.assertTrue(game.make_move('g7', 'g5'))
+        self.assertTrue(game.make_move('c1', 'g5'))
+        self.assertEqual(game.get_game_state(), 'UNFINISHED')
+        self.assertIsNone(game.get_board()['g5'])        # capturing bishop explodes with the pawn
+        self.assertIsNone(game.get_board()['c1'])
+        self.assertEqual(game.get_current_player(), 'black')
+
+    def test_explosion_ends_game(self):
+        """
+        knight captures next to the black king and blows it up. pawns around the blast survive
+        """
+        game = ChessVar()
+        for start, end in [('g1', 'f3'), ('a7', 'a6'), ('f3', 'g5'), ('a6', 'a5'), ('g5', 'f7')]:
+            self.assertTrue(game.make_move(start, end))
+        self.assertEqual(game.get_game_state(), 'WHITE_WON')
+        self.assertIsNone(game.get_board()['e8'])
+        self.assertIsNone(game.get_board()['f8'])
+        self.assertEqual(game.get_board()['e7'].get_name(), 'pawnblack')
+        self.assertFalse(game.make_move('a2', 'a3'))
+
+    def test_square_notation(self):
+        """
+        names are turned into square indexes once, at make_move
+        """
+        game = ChessVar()
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertFalse(game.make_move('e9', 'e4'))
+            self.assertFalse(game.make_move('e2', 'E4'))
+        self.assertEqual(game.get_piece_at(SQUARE_INDEX['e2']).get_name(), 'pawnwhite')
+        self.assertEqual(list(game.get_board())[:2], ['a8', 'b8'])
+        self.assertEqual(decode_move(encode_move(SQUARE_INDEX['g1'], SQUARE_INDEX['f3'])),
+                         (SQUARE_INDEX['g1'], SQUARE_INDEX['f3']))
+
+    def test_captured_summary(self):
+        """
+        counters follow used_pieces, including the capturing piece and the blown up king
+        """
+        game = ChessVar()
+        self.assertEqual(game.get_captured_summary()['white']['pawn'], 0)
+        for start, end in [('g1', 'f3'), ('a7', 'a6'), ('f3', 'g5'), ('a6', 'a5'), ('g5', 'f7')]:
+            game.make_move(start, end)
+        summary = game.get_captured_summary()
+        self.assertEqual(summary['white'], {'pawn': 0, 'knight': 1, 'bishop': 0, 'rook': 0, 'queen': 0, 'king': 0})
+        self.assertEqual(summary['black'], {'pawn': 1, 'knight': 1, 'bishop': 1, 'rook': 0, 'queen': 0, 'king': 1})
+        self.assertEqual(sum(sum(counts.values()) for counts in summary.values()), len(game.get_used_pieces()))
+        self.assertFalse(game.is_king_alive('black'))
+        self.assertTrue(game.is_king_alive('white'))
+
+    def test_blast_table(self):
+        """
+        blast area is clipped at the edges and corners of the board
+        """
+        self.assertEqual(sorted(SQUARE_NAMES[index] for index in BLAST_SQUARES[SQUARE_INDEX['a1']]),
+                         ['a1', 'a2', 'b1', 'b2'])
+        self.assertEqual(len(BLAST_SQUARES[SQUARE_INDEX['h5']]), 6)
+        self.assertEqual(len(BLAST_SQUARES[SQUARE_INDEX['e4']]), 9)
+        self.assertEqual(BLAST_MASKS[SQUARE_INDEX['h8']], sum(1 << SQUARE_INDEX[name] for name in ['g7', 'h7', 'g8', 'h8']))
+
+    def test_between_table(self):
+        """
+        squares strictly between two lined up squares, in either direction
+        """
+        def between(start, end):
+            return [SQUARE_NAMES[index] for index in BETWEEN_SQUARES[SQUARE_INDEX[start] * 64 + SQUARE_INDEX[end]]]
+
+        self.assertEqual(between('a1', 'a5'), ['a2', 'a3', 'a4'])
+        self.assertEqual(between('h8', 'c3'), ['g7', 'f6', 'e5', 'd4'])
+        self.assertEqual(between('b7', 'g2'), ['c6', 'd5', 'e4', 'f3'])
+        self.assertEqual(between('a1', 'b2'), [])
+        self.assertEqual(between('g1', 'f3'), [])       # not lined up
+        self.assertEqual(BETWEEN_MASKS[SQUARE_INDEX['e1'] * 64 + SQUARE_INDEX['e4']],
+                         (1 << SQUARE_INDEX['e2']) | (1 << SQUARE_INDEX['e3']))
+
+
+class TestFen(unittest.TestCase):
+    """
+    FEN import and export unit test
+    """
+    def test_round_trip(self):
+        rng = random.Random(9)
+        self.assertEqual(ChessVar().to_fen(), STARTING_FEN)
+        for backend in ('list', 'bitboard'):
+            game = ChessVar(backend)
+            for ply in range(30):
+                moves = list(game.legal_moves())
+                if not moves:
+                    break
+                game.make_move(*rng.choice(moves))
+                if game.get_game_state() != 'UNFINISHED':
+                    break                               # an exploded king can't be set up from a FEN
+                copied = ChessVar.from_fen(game.to_fen(), backend)
+                self.assertEqual(copied.to_fen(), game.to_fen())
+                self.assertEqual(copied.get_hash(), game.get_hash())
+                self.assertEqual(board_names(copied), board_names(game))
+
+    def test_pawn_on_last_row(self):
+        """
+        without promotion a pawn stays on its last row, and the position still round trips
+        """
+        game = ChessVar.from_fen('4k3/P7/8/8/8/8/8/4K3 w')
+        self.assertTrue(game.make_move('a7', 'a8'))
+        self.assertEqual(game.to_fen(), 'P3k3/8/8/8/8/8/8/4K3 b')
+        self.assertEqual(ChessVar.from_fen(game.to_fen()).to_fen(), game.to_fen())
+        self.assertEqual(ChessVar.from_fen('4k3/8/8/8/8/8/8/p3K3 w').to_fen(), '4k3/8/8/8/8/8/8/p3K3 w')
+
+    def test_position_plays_on(self):
+        """
+        knight next to the black king, set up without replaying moves
+        """
+        game = ChessVar.from_fen('rnbqkbnr/1ppppppp/8/p5N1/8/8/PPPPPPPP/RNBQKB1R w')
+        self.assertEqual(game.get_current_player(), 'white')
+        self.assertTrue(game.make_move('g5', 'f7'))
+        self.assertEqual(game.get_game_state(), 'WHITE_WON')
+
+    def test_bad_fen(self):
+        for fen in ['rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR', 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR x',
+                    'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP w', 'rnbqkbnr/pppppppp/9/8/8/8/PPPPPPPP/RNBQKBNR w',
+                    'rnbqkbnrp/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w', 'rnbqkbnr/ppppxppp/8/8/8/8/PPPPPPPP/RNBQKBNR w',
+                    '4k3/8/8/8/8/8/8/P3K3 w', 'p3k3/8/8/8/8/8/8/4K3 b', '8/8/8/8/8/8/8/8 w', '8/8/8/8/8/8/8/4K3 b',
+                    '3kk3/8/8/8/8/8/8/4K3 w']:
+            with self.assertRaises(ValueError):
+                ChessVar.from_fen(fen)
+
+    def test_cache(self):
+        fen = '4k3/8/8/8/8/8/8/4K2R w'
+        ChessVar.from_fen(fen)
+        hits = parse_fen.cache_info().hits
+        game = ChessVar.from_fen(fen)
+        self.assertEqual(parse_fen.cache_info().hits, hits + 1)
+        game.make_move('h1', 'h8')
+        self.assertEqual(parse_fen(fen)[0][SQUARE_INDEX['h1']].get_name(), 'rookwhite')     # cached copy unchanged
+
+
+class TestBitBoard(unittest.TestCase):
+    """
+    bitboard backend must behave exactly like the list board
+    """
+    def test_start_position(self):
+        self.assertEqual(board_names(ChessVar('bitboard')), board_names(ChessVar()))
+        self.assertEqual(list(ChessVar('bitboard').get_board()), list(ChessVar().get_board()))
+        self.assertEqual(board_names(ChessVar('dict')), board_names(ChessVar()))      # old name of the list board
+        game = ChessVar()
+        game.get_board()['e2'] = None       # a snapshot, the game keeps its pawn
+        self.assertIsNotNone(game.get_board()['e2'])
+
+    def test_random_moves_match(self):
+        """
+        throw the same random (start, end) pairs at both backends
+        """
+        rng = random.Random(7)
+        squares = [column + str(row) for column in 'abcdefgh' for row in range(1, 9)]
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            for game_number in range(5):
+                dict_game = ChessVar()
+                bit_game = ChessVar('bitboard')
+                for attempt in range(20000):
+                    if dict_game.get_game_state() != 'UNFINISHED':
+                        break
+                    start, end = rng.choice(squares), rng.choice(squares)
+                    self.assertEqual(dict_game.make_move(start, end), bit_game.make_move(start, end))
+                self.assertEqual(board_names(dict_game), board_names(bit_game))
+                self.assertEqual(dict_game.get_game_state(), bit_game.get_game_state())
+                self.assertEqual(len(dict_game.get_used_pieces()), len(bit_game.get_used_pieces()))
+
+
+class TestLegalMoves(unittest.TestCase):
+    """
+    legal_moves must list exactly the moves make_move accepts
+    """
+    def brute_force_moves(self, game):
+        """
+        try every (start, end) pair on a copy of the game
+        """
+        moves = set()
+        with contextlib.redirect_stdout(io.StringIO()):
+            board = game.get_board()
+            for start, piece in board.items():
+                if piece is None or piece.get_color() != game.get_current_player():
+                    continue
+                for end in board:
+                    if copy.deepcopy(game).make_move(start, end):
+                        moves.add((start, end))
+        return moves
+
+    def test_start_position(self):
+        moves = list(ChessVar().legal_moves())
+        self.assertEqual(len(moves), 20)
+        self.assertEqual(set(ChessVar().legal_moves_from('b1')), {('b1', 'a3'), ('b1', 'c3')})
+        self.assertEqual(list(ChessVar().legal_moves_from('e7')), [])
+
+    def test_matches_make_move(self):
+        rng = random.Random(3)
+        for backend in ('list', 'bitboard'):
+            game = ChessVar(backend)
+            for ply in range(24):
+                if game.get_game_state() != 'UNFINISHED':
+                    break
+                moves = set(game.legal_moves())
+                if ply % 6 == 5:
+                    self.assertEqual(moves, self.brute_force_moves(game))
+                self.assertTrue(game.make_move(*rng.choice(sorted(moves))))
+
+    def test_no_moves_after_game_over(self):
+        game = ChessVar()
+        for start, end in [('g1', 'f3'), ('a7', 'a6'), ('f3', 'g5'), ('a6', 'a5'), ('g5', 'f7')]:
+            game.make_move(start, end)
+        self.assertEqual(list(game.legal_moves()), [])
+
+
+class TestValidateMoves(unittest.TestCase):
+    """
+    validate_moves must agree with make_move and leave the game alone
+    """
+    def test_matches_make_move(self):
+        rng = random.Random(19)
+        squares = list(SQUARE_NAMES) + ['i9']
+        for backend in ('list', 'bitboard'):
+            game = ChessVar(backend)
+            for ply in range(12):
+                pairs = [(rng.choice(squares), rng.choice(squares)) for attempt in range(300)]
+                pairs += list(game.legal_moves())
+                before = (board_names(game), game.get_hash(), game.get_current_player())
+                output = io.StringIO()
+                with contextlib.redirect_stdout(output):
+                    results = game.validate_moves(pairs)
+                self.assertEqual(output.getvalue(), '')
+                self.assertEqual((board_names(game), game.get_hash(), game.get_current_player()), before)
+
+                with contextlib.redirect_stdout(io.StringIO()):
+                    for (start, end), code in zip(pairs, results):
+                        self.assertEqual(code == 0, copy.deepcopy(game).make_move(start, end))
+                game.make_move(*rng.choice(list(game.legal_moves())))
+
+    def test_reason_codes(self):
+        game = ChessVar()
+        results = game.validate_moves([('e2', 'e4'), ('e2', 'e5'), ('a1', 'a3'), ('e7', 'e5'), ('e2', 'x1'),
+                                       ('e4', 'e5'), ('d1', 'd2'), ('e2', 'e2')])
+        self.assertEqual([REJECTION_REASONS[code] for code in results],
+                         ['legal', 'piece_rule', 'blocked', 'not_your_piece', 'bad_notation', 'no_piece',
+                          'own_piece', 'same_square'])
+
+
+class TestPushPop(unittest.TestCase):
+    """
+    push/pop must put the game back exactly as it was
+    """
+    def snapshot(self, game):
+        return (board_names(game), game.get_game_state(), game.get_current_player(),
+                [piece.get_name() for piece in game.get_used_pieces()], game.get_captured_summary())
+
+    def test_push_pop_random_line(self):
+        rng = random.Random(11)
+        for backend in ('list', 'bitboard'):
+            game = ChessVar(backend)
+            snapshots = []
+            while game.get_game_state() == 'UNFINISHED' and len(snapshots) < 80:
+                snapshots.append(self.snapshot(game))
+                self.assertTrue(game.push(rng.choice(list(game.legal_moves()))))
+            while snapshots:
+                game.pop()
+                self.assertEqual(self.snapshot(game), snapshots.pop())
+
+    def test_push_rejects_illegal_move(self):
+        game = ChessVar()
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertFalse(game.push(('e2', 'e5')))
+            self.assertFalse(game.push(('z9', 'e4')))
+        self.assertEqual(game.get_current_player(), 'white')
+
+    def test_pop_after_king_explodes(self):
+        game = ChessVar()
+        for move in [('g1', 'f3'), ('a7', 'a6'), ('f3', 'g5'), ('a6', 'a5'), ('g5', 'f7')]:
+            game.push(move)
+        self.assertEqual(game.get_game_state(), 'WHITE_WON')
+        self.assertEqual(game.pop(), ('g5', 'f7'))
+        self.assertEqual(game.get_game_state(), 'UNFINISHED')
+        self.assertEqual(game.get_board()['e8'].get_name(), 'kingblack')
+        self.assertEqual(game.get_board()['g5'].get_name(), 'knightwhite')
+
+
+class TestAttackMaps(unittest.TestCase):
+    """
+    attack counts kept up to date by place_piece and remove_piece must match a rebuild from scratch
+    """
+    def test_incremental_attacks(self):
+        rng = random.Random(13)
+        for backend in ('list', 'bitboard'):
+            for game_number in range(3):
+                game = ChessVar(backend)
+                depth = 0
+                while game.get_game_state() == 'UNFINISHED' and depth < 80:
+                    game.push(rng.choice(list(game.legal_moves())))
+                    depth += 1
+                    self.assertEqual([game.get_attack_counts(color) for color in COLORS], game.compute_attacks())
+                while depth:
+                    game.pop()
+                    depth -= 1
+                self.assertEqual([game.get_attack_counts(color) for color in COLORS], game.compute_attacks())
+
+    def test_is_attacked(self):
+        game = ChessVar()
+        self.assertEqual(game.get_attack_counts('white')[SQUARE_INDEX['f3']], 3)     # knight and two pawns
+        self.assertTrue(game.is_attacked('a6', 'black'))
+        self.assertFalse(game.is_attacked('e4', 'white'))
+        self.assertFalse(game.is_attacked('d1', 'white'))      # kings can't capture
+        game.make_move('e2', 'e4')
+        self.assertTrue(game.is_attacked('h5', 'white'))        # queen's diagonal opened
+
+    def test_capture_would_destroy_king(self):
+        game = ChessVar()
+        for start, end in [('g1', 'f3'), ('a7', 'a6'), ('f3', 'g5'), ('a6', 'a5')]:
+            game.make_move(start, end)
+        self.assertTrue(game.capture_would_destroy_king('g5', 'f7'))
+        self.assertFalse(game.capture_would_destroy_king('g5', 'h7'))
+        self.assertFalse(game.capture_would_destroy_king('g5', 'e6'))      # not a capture
+        self.assertFalse(game.capture_would_destroy_king('e8', 'f7'))      # not black's turn
+
+
+def reference_evaluation(game):
+    """
+    evaluate() worked out square by square, without the incremental score or king squares
+    """
+    score = 0
+    kings = {}
+    for index in range(64):
+        piece = game.get_piece_at(index)
+        if piece is not None:
+            score += PIECE_SQUARE_SCORES[piece.get_code()][index]
+            if piece.get_name().startswith('king'):
+                kings[piece.get_color()] = index
+    for color, king in kings.items():
+        opponent = 'black' if color == 'white' else 'white'
+        danger = 0
+        for square in BLAST_SQUARES[king]:
+            piece = game.get_piece_at(square)
+            if piece is None or piece.get_color() != color:
+                continue
+            if square != king:
+                danger += KING_NEIGHBOR_PENALTY
+            if game.get_attack_counts(opponent)[square]:
+                danger += KING_THREAT_WAITING if color == game.get_current_player() else KING_THREAT_TO_MOVE
+        score += -danger if color == 'white' else danger
+    return score if game.get_current_player() == 'white' else -score
+
+
+class TestEvaluation(unittest.TestCase):
+    """
+    score kept by place_piece and remove_piece must match a rebuild, through explosions and undo
+    """
+    def test_incremental_score(self):
+        rng = random.Random(24)
+        for backend in ('list', 'bitboard'):
+            for game_number in range(3):
+                game = ChessVar(backend)
+                self.assertEqual(game.evaluate(), 0)        # the start position is even
+                depth = 0
+                while game.get_game_state() == 'UNFINISHED' and depth < 80:
+                    game.push(rng.choice(list(game.legal_moves())))
+                    depth += 1
+                    self.assertEqual(game.evaluate(), reference_evaluation(game))
+                while depth:
+                    game.pop()
+                    depth -= 1
+                    self.assertEqual(game.evaluate(), reference_evaluation(game))
+                self.assertEqual(game.evaluate(), 0)
+
+    def test_atomic_terms(self):
+        game = ChessVar()
+        for start, end in [('g1', 'f3'), ('a7', 'a6'), ('f3', 'g5'), ('a6', 'a5')]:
+            game.make_move(start, end)
+        # white's knight can capture f7 and blow up the black king
+        self.assertGreaterEqual(game.evaluate(), KING_THREAT_TO_MOVE)
+        game = ChessVar.from_fen('4k3/8/8/8/8/8/8/R3K3 w')
+        self.assertEqual(game.evaluate(), 500)       # just the rook, nothing near either king
+        game = ChessVar.from_fen('4k3/8/8/8/8/8/8/R3K3 b')
+        self.assertEqual(game.evaluate(), -500)
+
+
+class TestProfiling(unittest.TestCase):
+    """
+    profiled make_move must make the same moves and count what it rejects
+    """
+    def test_same_results(self):
+        rng = random.Random(17)
+        squares = list(SQUARE_NAMES) + ['z9']
+        plain = ChessVar()
+        profiled = ChessVar()
+        profiled.enable_profiling()
+        output = io.StringIO()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for attempt in range(3000):
+                start, end = rng.choice(squares), rng.choice(squares)
+                with contextlib.redirect_stdout(output):
+                    made = profiled.make_move(start, end)
+                self.assertEqual(made, plain.make_move(start, end))
+        self.assertEqual(output.getvalue(), '')
+        self.assertEqual(board_names(profiled), board_names(plain))
+
+        stats = profiled.get_move_stats()
+        self.assertEqual(stats['moves'], 3000)
+        self.assertEqual(stats['accepted'] + sum(stats['rejected'].values()), 3000)
+        self.assertGreater(stats['rejected']['no_piece'], 0)
+        self.assertGreater(stats['rejected']['bad_notation'], 0)
+        self.assertEqual(stats['phases']['validate']['calls'], 3000)
+
+    def test_phases(self):
+        game = ChessVar()
+        self.assertIsNone(game.get_move_stats())
+        game.enable_profiling()
+        for start, end in [('g1', 'f3'), ('a7', 'a6'), ('f3', 'g5'), ('a6', 'a5'), ('g5', 'f7'), ('a2', 'a3')]:
+            game.make_move(start, end)
+        stats = game.get_move_stats()
+        self.assertEqual(stats['accepted'], 5)
+        self.assertEqual(stats['rejected'], {'game_over': 1})
+        self.assertEqual(stats['phases']['turn_rules']['calls'], 6)
+        self.assertEqual(stats['phases']['capture_rules']['calls'], 5)
+        self.assertEqual(stats['phases']['move']['calls'], 4)
+        self.assertEqual(stats['phases']['explode']['calls'], 1)
+        self.assertEqual(stats['phases']['update_game_state']['calls'], 1)
+        self.assertEqual(stats['phases']['move_along_board']['calls'], 2)     # pawn moves. knights don't check
+        self.assertEqual(game.get_game_state(), 'WHITE_WON')
+        game.disable_profiling()
+        self.assertIsNone(game.get_move_stats())
+
+    def test_rejection_reasons(self):
+        game = ChessVar()
+        self.assertEqual(game.move_rejection(SQUARE_INDEX['e2'], SQUARE_INDEX['e5']), 'piece_rule')
+        self.assertEqual(game.move_rejection(SQUARE_INDEX['a1'], SQUARE_INDEX['a3']), 'blocked')
+        self.assertEqual(game.move_rejection(SQUARE_INDEX['e7'], SQUARE_INDEX['e5']), 'not_your_piece')
+        self.assertEqual(game.move_rejection(SQUARE_INDEX['e4'], SQUARE_INDEX['e5']), 'no_piece')
+        self.assertIsNone(game.move_rejection(SQUARE_INDEX['e2'], SQUARE_INDEX['e4']))
+
+
+class TestZobristHash(unittest.TestCase):
+    """
+    incremental hash must match a hash built from scratch
+    """
+    def test_incremental_hash(self):
+        rng = random.Random(5)
+        for backend in ('list', 'bitboard'):
+            game = ChessVar(backend)
+            start_hash = game.get_hash()
+            plies = 0
+            while game.get_game_state() == 'UNFINISHED' and plies < 60:
+                game.push(rng.choice(list(game.legal_moves())))
+                plies += 1
+                self.assertEqual(game.get_hash(), game.compute_hash())
+            while plies:
+                game.pop()
+                plies -= 1
+            self.assertEqual(game.get_hash(), start_hash)
+
+    def test_transposition_same_hash(self):
+        first = ChessVar()
+        second = ChessVar()
+        for start, end in [('g1', 'f3'), ('b8', 'c6'), ('b1', 'c3')]:
+            first.make_move(start, end)
+        for start, end in [('b1', 'c3'), ('b8', 'c6'), ('g1', 'f3')]:
+            second.make_move(start, end)
+        self.assertEqual(first.get_hash(), second.get_hash())
+        self.assertNotEqual(first.get_hash(), ChessVar().get_hash())
+
+
+class TestSharedPieces(unittest.TestCase):
+    """
+    every board uses the same 12 piece objects
+    """
+    def test_boards_share_pieces(self):
+        first = ChessVar().get_board()
+        second = ChessVar('bitboard').get_board()
+        self.assertIs(first['a2'], first['h2'])
+        self.assertIs(first['a2'], second['b2'])
+        self.assertIs(first['e8'], get_piece('black', 'king'))
+        self.assertEqual(len({id(piece) for piece in first.values() if piece}), 12)
 
+    def test_piece_accessors(self):
+        piece = get_piece('white', 'queen')
+        self.assertEqual((piece.get_type(), piece.get_color(), piece.get_name()), ('queen', 'white', 'queenwhite'))
+        self.assertFalse(hasattr(piece, '__dict__'))
 
+    def test_copy_and_pickle_keep_shared_pieces(self):
+        game = copy.deepcopy(ChessVar())
+        self.assertIs(game.get_board()['d1'], get_piece('white', 'queen'))
+        self.assertIs(pickle.loads(pickle.dumps(get_piece('black', 'pawn'))), get_piece('black', 'pawn'))
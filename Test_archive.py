@@ -0,0 +1,68 @@
+import os
+import tempfile
+import unittest
+from ChessVar import *
+from archive import *
+from selfplay import play_game
+
+
+class TestArchive(unittest.TestCase):
+    """
+    binary game archive unit test
+    """
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.cva')
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_pack_moves(self):
+        moves = [encode_move(SQUARE_INDEX['e2'], SQUARE_INDEX['e4']), 0, MOVE_MASK]
+        packed = pack_moves(moves)
+        self.assertEqual(len(packed), 5)        # 36 bits
+        self.assertEqual([unpack_move(packed, 0, ply) for ply in range(3)], moves)
+
+    def test_round_trip(self):
+        results = [play_game(seed, {'max_plies': 120}) for seed in range(8)]
+        with ArchiveWriter(self.path) as writer:
+            for result in results:
+                writer.add_game(result['moves'], result['winner'])
+
+        with ArchiveReader(self.path) as reader:
+            self.assertEqual(reader.get_game_count(), len(results))
+            for game_number in reversed(range(len(results))):
+                result = results[game_number]
+                self.assertEqual(reader.get_header(game_number), (result['winner'], result['plies']))
+                self.assertEqual(reader.get_moves(game_number), result['moves'])
+                self.assertEqual(reader.get_move(game_number, result['plies'] - 1), result['moves'][-1])
+                self.assertEqual(reader.replay(game_number).get_game_state(), result['winner'])
+
+            # board after ply 7 of game 3
+            game = ChessVar()
+            for move_code in results[3]['moves'][:7]:
+                start, end = decode_move(move_code)
+                game.make_move(SQUARE_NAMES[start], SQUARE_NAMES[end])
+            self.assertEqual(reader.replay(3, 7).get_hash(), game.get_hash())
+            with self.assertRaises(IndexError):
+                reader.get_header(len(results))
+
+    def test_text_game(self):
+        with ArchiveWriter(self.path) as writer:
+            self.assertEqual(writer.add_text_game('g1f3 a7a6 f3g5 a6a5 g5f7'), 5)
+            self.assertEqual(writer.add_text_game('e2e4 e7e5 e4e5'), 2)
+        with ArchiveReader(self.path) as reader:
+            self.assertEqual(reader.get_header(0), ('WHITE_WON', 5))
+            self.assertEqual(reader.get_header(1), ('UNFINISHED', 2))
+        # 24 byte file header, 3 + 8 and 3 + 3 byte games, 16 byte index
+        self.assertEqual(os.path.getsize(self.path), 24 + 11 + 6 + 16)
+
+    def test_not_an_archive(self):
+        with open(self.path, 'wb') as archive_file:
+            archive_file.write(b'e2e4 e7e5 g1f3 b8c6 f1b5\n')
+        with self.assertRaises(ValueError):
+            ArchiveReader(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
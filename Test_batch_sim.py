@@ -0,0 +1,57 @@
+import contextlib
+import io
+import random
+import unittest
+from ChessVar import *
+from batch_sim import *
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestBatchSimulator(unittest.TestCase):
+    """
+    batch simulator must follow ChessVar.make_move exactly
+    """
+    def test_start_position(self):
+        simulator = BatchSimulator(3)
+        self.assertTrue((simulator.get_boards() == encode_game(ChessVar())).all())
+        self.assertEqual(simulator.get_game_states(), ['UNFINISHED'] * 3)
+
+    def test_king_explosion(self):
+        simulator = BatchSimulator(2)
+        moves = [('g1', 'f3'), ('a7', 'a6'), ('f3', 'g5'), ('a6', 'a5'), ('g5', 'f7')]
+        for start, end in moves:
+            legal = simulator.step([SQUARE_INDEX[start]] * 2, [SQUARE_INDEX[end]] * 2)
+            self.assertTrue(legal.all())
+        self.assertEqual(simulator.get_game_states(), ['WHITE_WON', 'WHITE_WON'])
+        self.assertFalse(simulator.step([8, 8], [16, 16]).any())
+
+    def test_matches_chessvar(self):
+        """
+        random legal moves mixed with random garbage, checked against ChessVar after every step
+        """
+        rng = random.Random(1)
+        game_count = 32
+        games = [ChessVar() for index in range(game_count)]
+        simulator = BatchSimulator(game_count)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            for ply in range(120):
+                starts, ends, expected = [], [], []
+                for game in games:
+                    moves = list(game.legal_moves())
+                    if moves and rng.random() < 0.7:
+                        start, end = rng.choice(moves)
+                    else:
+                        start, end = rng.choice(SQUARE_NAMES), rng.choice(SQUARE_NAMES)
+                    starts.append(SQUARE_INDEX[start])
+                    ends.append(SQUARE_INDEX[end])
+                    expected.append(game.make_move(start, end))
+
+                self.assertEqual(list(simulator.step(starts, ends)), expected)
+                for index, game in enumerate(games):
+                    self.assertTrue((simulator.get_boards()[index] == encode_game(game)).all())
+                self.assertEqual(simulator.get_game_states(), [game.get_game_state() for game in games])
+
+    def test_off_board_squares(self):
+        simulator = BatchSimulator(2)
+        self.assertFalse(simulator.step([-1, 12], [20, 99]).any())
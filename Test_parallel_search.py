@@ -0,0 +1,69 @@
+import unittest
+from ChessVar import *
+from search import *
+from parallel_search import *
+
+
+def play(game, moves):
+    for start, end in moves:
+        game.make_move(start, end)
+    return game
+
+
+class TestParallelSearch(unittest.TestCase):
+    """
+    parallel search unit test
+    """
+    def test_single_worker_matches_searcher(self):
+        """
+        one worker with a fixed seed gives Searcher's result, every time
+        """
+        game = play(ChessVar(), [('e2', 'e4'), ('d7', 'd5')])
+        searcher = Searcher()
+        expected = (searcher.search(game, depth=4, time_ms=None), searcher.get_score(), searcher.get_nodes())
+        for run in range(2):
+            parallel = ParallelSearcher(workers=1, size_mb=16, seed=7)
+            try:
+                move = parallel.search(game, depth=4, time_ms=None)
+                self.assertEqual((move, parallel.get_score(), parallel.get_nodes()), expected)
+                self.assertEqual(parallel.get_completed_depth(), 4)
+            finally:
+                parallel.close()
+
+    def test_helpers(self):
+        game = play(ChessVar(), [('g1', 'f3'), ('a7', 'a6'), ('f3', 'g5'), ('a6', 'a5')])
+        before = (game.get_hash(), game.get_current_player())
+        parallel = ParallelSearcher(workers=3, size_mb=1, seed=7)
+        try:
+            self.assertEqual(parallel.search(game, depth=3, time_ms=None), ('g5', 'f7'))
+            self.assertEqual(parallel.get_score(), WIN_SCORE - 1)
+            self.assertEqual((game.get_hash(), game.get_current_player()), before)
+            self.assertIsNotNone(parallel.search(ChessVar(), depth=None, time_ms=50))     # reuses the pool
+        finally:
+            parallel.close()
+        self.assertNotEqual(parallel.helper_moves(range(20), 1), parallel.helper_moves(range(20), 2))
+        other = ParallelSearcher(workers=1, size_mb=0.01, seed=7)
+        other.close()
+        self.assertEqual(parallel.helper_moves(range(20), 1), other.helper_moves(range(20), 1))
+
+    def test_pawn_on_last_row(self):
+        """
+        helpers get the board itself, so any position a game reaches can be searched
+        """
+        game = play(ChessVar.from_fen('4k3/P7/8/8/8/8/8/4K3 w'), [('a7', 'a8')])
+        parallel = ParallelSearcher(workers=2, size_mb=1, seed=7)
+        try:
+            self.assertIsNotNone(parallel.search(game, depth=2, time_ms=None))
+            self.assertEqual(game.to_fen(), 'P3k3/8/8/8/8/8/8/4K3 b')
+        finally:
+            parallel.close()
+
+    def test_benchmark(self):
+        results = benchmark([STARTING_FEN], depth=2, worker_counts=(1, 2))
+        self.assertEqual([result['workers'] for result in results], [1, 2])
+        self.assertEqual(results[0]['speedup'], 1.0)
+        self.assertTrue(all(result['nodes'] > 0 for result in results))
+
+
+if __name__ == '__main__':
+    unittest.main()
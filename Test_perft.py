@@ -0,0 +1,35 @@
+import unittest
+from perft import *
+
+# node counts for depths 1, 2 and 3
+EXPECTED_NODES = {
+    'start': [20, 400, 8902],
+    'king_blast': [25, 481, 12441],
+    'pawns_survive': [27, 835, 23874],
+    'kings_adjacent': [30, 829, 23066],
+}
+
+
+class TestPerft(unittest.TestCase):
+    """
+    perft unit test. both board backends must give the same counts
+    """
+    def test_node_counts(self):
+        for name, counts in EXPECTED_NODES.items():
+            for depth, nodes in enumerate(counts[:2], start=1):
+                self.assertEqual(perft(setup_position(name), depth), nodes)
+                self.assertEqual(perft(setup_position(name, 'bitboard'), depth), nodes)
+            self.assertEqual(perft(setup_position(name), 3), counts[2])
+
+    def test_divide(self):
+        result = run_perft('kings_adjacent', 2)
+        self.assertEqual(result['nodes'], 829)
+        self.assertEqual(sum(result['divide'].values()), 829)
+        self.assertNotIn(('b4', 'c5'), result['divide'])     # would blow up both kings
+        self.assertGreater(result['nodes_per_second'], 0)
+
+    def test_game_over_has_no_children(self):
+        game = setup_position('king_blast')
+        game.push(('g5', 'f7'))
+        self.assertEqual(perft(game, 0), 1)
+        self.assertEqual(perft(game, 2), 0)
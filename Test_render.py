@@ -0,0 +1,75 @@
+import random
+import unittest
+from ChessVar import *
+from render import *
+
+
+def board_text(game):
+    """
+    board drawn square by square, to check the buffer against
+    """
+    lines = [COLUMN_HEADINGS]
+    for row in range(8, 0, -1):
+        cells = []
+        for column in range(8):
+            piece = game.get_piece_at((row - 1) * 8 + column)
+            cells.append(f"[{PIECE_LETTERS[piece] if piece else ' '}]")
+        lines.append(f"{row} {' '.join(cells)} {row}")
+    lines.append(COLUMN_HEADINGS)
+    return [line.rstrip() for line in lines]
+
+
+class TestBoardRenderer(unittest.TestCase):
+    """
+    renderer unit test
+    """
+    def test_start_position(self):
+        text = BoardRenderer().render(ChessVar())
+        self.assertEqual([line.rstrip() for line in text.splitlines()], board_text(ChessVar()))
+        self.assertEqual(text.splitlines()[1], '8 [r] [n] [b] [q] [k] [b] [n] [r] 8')
+
+    def test_updates_follow_game(self):
+        rng = random.Random(21)
+        game = ChessVar()
+        renderer = BoardRenderer()
+        renderer.render(game)
+        while game.get_game_state() == 'UNFINISHED':
+            start, end = rng.choice(list(game.generate_moves()))
+            destroyed = game.execute_move(start, end)
+            squares = [start, end] + [square for square, piece in destroyed]
+            changes = renderer.update(game, squares)
+            self.assertLessEqual(len(changes), len(squares))
+            self.assertEqual(renderer.update(game), [])     # nothing left over outside the move
+            self.assertEqual([line.rstrip() for line in renderer.render(game).splitlines()], board_text(game))
+
+    def test_explosion_changes(self):
+        game = ChessVar()
+        renderer = BoardRenderer()
+        for start, end in [('g1', 'f3'), ('a7', 'a6'), ('f3', 'g5'), ('a6', 'a5')]:
+            game.make_move(start, end)
+        renderer.render(game)
+        game.make_move('g5', 'f7')
+        changes = renderer.update(game)
+        self.assertEqual(sorted(SQUARE_NAMES[index] for index, letter in changes), ['e8', 'f7', 'f8', 'g5', 'g8'])
+        self.assertEqual({letter for index, letter in changes}, {' '})
+        self.assertEqual(renderer.terminal_update(game), '')
+        game = ChessVar()
+        renderer.update(game)
+        game.make_move('e2', 'e4')
+        self.assertEqual(renderer.terminal_update(game, [SQUARE_INDEX['e2'], SQUARE_INDEX['e4']]),
+                         '\x1b[8;20H \x1b[6;20HP')
+
+    def test_cache(self):
+        game = ChessVar()
+        renderer = BoardRenderer(cache_size=2)
+        first = renderer.render(game)
+        game.push(('e2', 'e4'))
+        renderer.render(game)
+        game.pop()
+        self.assertEqual(renderer.render(game), first)
+        self.assertEqual(renderer.get_cache_stats(), {'hits': 1, 'misses': 2, 'size': 2})
+        self.assertEqual(renderer.update(game), [])     # buffer was restored from the cache
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import contextlib
+import io
+import os
+import random
+import tempfile
+import unittest
+from ChessVar import *
+from replay import *
+
+
+class TestReplay(unittest.TestCase):
+    """
+    replay pipeline unit test
+    """
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.txt')
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def write_games(self, lines):
+        with open(self.path, 'w') as game_file:
+            game_file.write('\n'.join(lines) + '\n')
+
+    def random_games(self, game_count, seed):
+        """
+        random game lines, some with a garbage move on the end
+        """
+        rng = random.Random(seed)
+        lines = []
+        for index in range(game_count):
+            game = ChessVar()
+            tokens = []
+            while game.get_game_state() == 'UNFINISHED' and len(tokens) < 60:
+                start, end = rng.choice(list(game.legal_moves()))
+                game.make_move(start, end)
+                tokens.append(start + end)
+            if rng.random() < 0.3:
+                tokens.append(rng.choice(['e2e5', 'zz99', 'a1a1']))
+            lines.append(' '.join(tokens))
+        return lines
+
+    def test_results(self):
+        self.write_games(['# header', 'g1f3 a7a6 f3g5 a6a5 g5f7', '', 'e2e4 e7e5 e4e5 d7d6', 'd2d4 e7e9'])
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            results = list(replay_file(self.path))
+        self.assertEqual(output.getvalue(), '')
+        self.assertEqual([result['winner'] for result in results], ['WHITE_WON', 'UNFINISHED', 'UNFINISHED'])
+        self.assertEqual([result['plies'] for result in results], [5, 2, 1])
+        self.assertEqual([result['illegal'] for result in results], [None, (2, 'e4e5'), (1, 'e7e9')])
+        self.assertEqual(results[0]['offset'], len('# header\n'))
+
+    def test_bad_bytes(self):
+        with open(self.path, 'wb') as game_file:
+            game_file.write('g1f3 a7a6\ne2e4 \u00e97e5\nd2d4 d7d5\n'.encode('utf-8'))
+        expected = [None, (1, '\ufffd\ufffd7e5'), None]
+        self.assertEqual([result['illegal'] for result in replay_file(self.path)], expected)
+        self.assertEqual([result['illegal'] for result in replay_parallel(self.path, workers=2, chunk_bytes=10)],
+                         expected)
+
+    def test_moves_after_game_over_are_rejected(self):
+        self.assertEqual(replay_game('g1f3 a7a6 f3g5 a6a5 g5f7 a2a3')['illegal'], (5, 'a2a3'))
+
+    def test_mmap_and_parallel_match(self):
+        self.write_games(self.random_games(40, 5))
+        expected = list(replay_file(self.path))
+        self.assertEqual(list(replay_file(self.path, use_mmap=True)), expected)
+        self.assertEqual(list(replay_parallel(self.path, workers=2, chunk_bytes=500)), expected)
+        # more chunks than the 2 per worker kept in flight
+        self.assertEqual(list(replay_parallel(self.path, workers=2, chunk_bytes=50)), expected)
+
+    def test_chunk_bounds(self):
+        self.write_games(self.random_games(10, 6))
+        bounds = chunk_bounds(self.path, 100)
+        self.assertEqual(bounds[0][0], 0)
+        self.assertEqual(bounds[-1][1], os.path.getsize(self.path))
+        with open(self.path, 'rb') as game_file:
+            data = game_file.read()
+        for start, stop in bounds:
+            self.assertTrue(start == 0 or data[start - 1:start] == b'\n')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import time
+import unittest
+from ChessVar import *
+from search import *
+
+
+def play(game, moves):
+    for start, end in moves:
+        game.make_move(start, end)
+    return game
+
+
+class TestSearch(unittest.TestCase):
+    """
+    search unit test
+    """
+    def test_finds_king_explosion(self):
+        """
+        knight on g5 can capture f7 and blow up the black king
+        """
+        game = play(ChessVar(), [('g1', 'f3'), ('a7', 'a6'), ('f3', 'g5'), ('a6', 'a5')])
+        searcher = Searcher()
+        self.assertEqual(searcher.search(game, depth=3, time_ms=None), ('g5', 'f7'))
+        self.assertEqual(searcher.get_score(), WIN_SCORE - 1)
+
+    def test_avoids_losing_king(self):
+        """
+        black has to stop Nxf7, which would blow up the king
+        """
+        game = play(ChessVar(), [('g1', 'f3'), ('a7', 'a6'), ('f3', 'g5')])
+        move = best_move(game, depth=2, time_ms=None)
+        game.make_move(*move)
+        self.assertNotEqual(best_move(game, depth=1, time_ms=None), ('g5', 'f7'))
+        self.assertTrue(game.make_move(*best_move(game, depth=1, time_ms=None)))
+        self.assertEqual(game.get_game_state(), 'UNFINISHED')
+
+    def test_leaves_game_unchanged(self):
+        for backend in ('list', 'bitboard'):
+            game = play(ChessVar(backend), [('e2', 'e4'), ('d7', 'd5')])
+            before = (game.get_hash(), game.get_current_player(), len(game.get_used_pieces()))
+            best_move(game, depth=3, time_ms=None)
+            self.assertEqual((game.get_hash(), game.get_current_player(), len(game.get_used_pieces())), before)
+            self.assertEqual(game.get_hash(), game.compute_hash())
+
+    def test_time_budget(self):
+        start = time.perf_counter()
+        move = best_move(ChessVar(), time_ms=30)
+        self.assertIn(move, list(ChessVar().legal_moves()))
+        self.assertLess(time.perf_counter() - start, 0.5)
+
+    def test_game_over(self):
+        game = play(ChessVar(), [('g1', 'f3'), ('a7', 'a6'), ('f3', 'g5'), ('a6', 'a5'), ('g5', 'f7')])
+        self.assertIsNone(best_move(game, depth=2))
@@ -0,0 +1,31 @@
+import unittest
+from ChessVar import *
+from selfplay import *
+
+
+class TestSelfPlay(unittest.TestCase):
+    """
+    self-play runner unit test
+    """
+    def test_random_game_replays(self):
+        """
+        moves sent back by a worker replay to the same result
+        """
+        result = play_game(4, {})
+        game = ChessVar()
+        for move_code in result['moves']:
+            start, end = decode_move(move_code)
+            self.assertTrue(game.make_move(SQUARE_NAMES[start], SQUARE_NAMES[end]))
+        self.assertEqual(game.get_game_state(), result['winner'])
+        self.assertEqual(result['plies'], len(result['moves']))
+
+    def test_pool_matches_single_process(self):
+        results = list(run_games(6, {'max_plies': 60}, workers=2, base_seed=10))
+        self.assertEqual([result['seed'] for result in results], list(range(10, 16)))
+        for result in results:
+            self.assertEqual(result['moves'], play_game(result['seed'], {'max_plies': 60})['moves'])
+
+    def test_engine_game(self):
+        result = play_game(0, {'white': 'engine', 'depth': 1, 'time_ms': None, 'max_plies': 20})
+        self.assertLessEqual(result['plies'], 20)
+        self.assertIn(result['winner'], ['UNFINISHED', 'WHITE_WON', 'BLACK_WON'])
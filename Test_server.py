@@ -0,0 +1,81 @@
+import asyncio
+import contextlib
+import io
+import unittest
+from ChessVar import *
+from server import *
+from load_test import run_load_test
+
+
+class TestGameServer(unittest.TestCase):
+    """
+    line protocol unit test
+    """
+    def test_session(self):
+        server = GameServer()
+        self.assertEqual(server.handle_line('NEW'), f'OK 1 {STARTING_FEN}')
+        self.assertEqual(server.handle_line('MOVE 1 g1f3'), 'OK UNFINISHED black g1=- f3=N')
+        for move in ['a7a6', 'f3g5', 'a6a5']:
+            self.assertTrue(server.handle_line(f'MOVE 1 {move}').startswith('OK'))
+        # capture: the knight, f7 pawn and the non-pawn neighbours are gone
+        self.assertEqual(server.handle_line('MOVE 1 g5f7'), 'OK WHITE_WON black g5=- f7=- f8=- g8=- e8=-')
+        self.assertEqual(server.handle_line('MOVES 1'), 'OK')
+        self.assertEqual(server.handle_line('FEN 1'), 'OK rnbq3r/1pppp1pp/8/p7/8/8/PPPPPPPP/RNBQKB1R b')
+        self.assertEqual(server.handle_line('NEW 4k3/8/8/8/8/8/8/4K2R w'), 'OK 2 4k3/8/8/8/8/8/8/4K2R w')
+        self.assertEqual(len(server.handle_line('MOVES 2').split()), 1 + 14)
+
+    def test_errors(self):
+        server = GameServer()
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.assertEqual(server.handle_line('NEW'), f'OK 1 {STARTING_FEN}')
+            self.assertEqual(server.handle_line('MOVE 1 e2e5'), 'ERR illegal move')
+            self.assertEqual(server.handle_line('MOVE 1 e2'), 'ERR bad move')
+            self.assertEqual(server.handle_line('MOVE 2 e2e4'), 'ERR no such session')
+            self.assertEqual(server.handle_line('JUMP 1'), 'ERR unknown command JUMP')
+            self.assertEqual(server.handle_line('NEW 8/8 w'), 'ERR bad fen')
+            self.assertEqual(server.handle_line(''), 'ERR empty request')
+        self.assertEqual(output.getvalue(), '')
+        self.assertEqual(server.handle_line('END 1'), 'OK')
+        self.assertEqual(server.get_session_count(), 0)
+
+    def test_bad_input_keeps_connection(self):
+        async def run():
+            server = GameServer()
+            await server.start(port=0)
+            try:
+                reader, writer = await asyncio.open_connection('127.0.0.1', server.get_port())
+                responses = []
+                for request in [b'\xff\n', b'NEW\n', b'x' * 100000 + b'\n', b'FEN 1\n']:
+                    writer.write(request)
+                    await writer.drain()
+                    responses.append((await reader.readline()).decode('ascii'))
+                # wait for the server to see the end of the stream and hang up before shutting it down
+                writer.write_eof()
+                self.assertEqual(await reader.read(), b'')
+                writer.close()
+                await writer.wait_closed()
+                return responses
+            finally:
+                await server.close()
+
+        self.assertEqual(asyncio.run(run()), ['ERR unknown command ?\n', f'OK 1 {STARTING_FEN}\n',
+                                              'ERR line too long\n', f'OK {STARTING_FEN}\n'])
+
+    def test_load_test(self):
+        async def run():
+            server = GameServer()
+            await server.start(port=0)
+            try:
+                return await run_load_test(40, 4, 10, port=server.get_port())
+            finally:
+                await server.close()
+
+        result = asyncio.run(run())
+        self.assertEqual(result['sessions'], 40)
+        self.assertGreater(result['moves'], 0)
+        self.assertLessEqual(result['p50_ms'], result['p99_ms'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,178 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+from ChessVar import *
+from tablebase import *
+
+
+def set_up(squares, black_to_move):
+    """
+    :param squares: dict of square name -> FEN letter
+    """
+    game = ChessVar()
+    board = [None] * 64
+    for name, letter in squares.items():
+        board[SQUARE_INDEX[name]] = FEN_LETTERS[letter]
+    game.set_position(board, 'black' if black_to_move else 'white')
+    return game
+
+
+def one_ply_result(tablebase, game):
+    """
+    best outcome over ChessVar's legal moves, probing the table each move leads into
+    :return: (result, distance) like Tablebase.probe
+    """
+    outcomes = []
+    for start, end in list(game.generate_moves()):
+        mover = game.get_current_player()
+        game.push_move(start, end)
+        if game.get_game_state() != 'UNFINISHED':
+            outcomes.append(('WIN', 1) if game.get_game_state().lower().startswith(mover) else ('LOSS', 1))
+        else:
+            after, distance = tablebase.probe(game)
+            outcomes.append({'WIN': ('LOSS', distance + 1), 'LOSS': ('WIN', distance + 1),
+                             'DRAW': ('DRAW', 0)}[after])
+        game.pop()
+
+    wins = [distance for outcome, distance in outcomes if outcome == 'WIN']
+    if wins:
+        return 'WIN', min(wins)
+    if not outcomes or any(outcome == 'DRAW' for outcome, distance in outcomes):
+        return 'DRAW', 0
+    return 'LOSS', max(distance for outcome, distance in outcomes)
+
+
+def check_against_rules(test, tablebase, letters, count, seed):
+    """
+    every probed result must be the best outcome over ChessVar's legal moves
+    :param letters: FEN letters of the pieces to place at random, pawns stay off rows 1 and 8
+    :return: set of results seen
+    """
+    rng = random.Random(seed)
+    results = set()
+    checked = 0
+    while checked < count:
+        squares = rng.sample(SQUARE_NAMES, len(letters))
+        if any(letter in 'Pp' and square[1] in '18' for square, letter in zip(squares, letters)):
+            continue
+        game = set_up(dict(zip(squares, letters)), rng.random() < 0.5)
+        if game.get_game_state() != 'UNFINISHED':
+            continue
+        result = tablebase.probe(game)
+        results.add(result[0])
+        test.assertEqual(result, one_ply_result(tablebase, game), game.to_fen())
+        checked += 1
+    return results
+
+
+class TestTablebase(unittest.TestCase):
+    """
+    tablebase unit test. results are checked against ChessVar's own move rules
+    """
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        cls.written = generate(['KQvK'], cls.directory)
+        cls.tablebase = Tablebase(cls.directory)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tablebase.close()
+        shutil.rmtree(cls.directory)
+
+    def test_signatures(self):
+        self.assertEqual(self.written, ['KQvK'])
+        self.assertEqual(codes_signature(signature_codes('knvkr')), 'KNvKR')
+        self.assertEqual(codes_signature(signature_codes('KPNvK')), 'KNPvK')
+        for signature in ['KQ', 'QvK', 'KQvKK', 'KXvK', 'KQRBvKN', 'KQRvKN']:
+            with self.assertRaises(ValueError):
+                signature_codes(signature)
+
+    def test_probe(self):
+        self.assertEqual(self.tablebase.probe(set_up({'a1': 'K', 'd4': 'Q', 'h8': 'k'}, False)), ('WIN', 1))
+        # black king next to the white king can't be blown up without the white king
+        self.assertEqual(self.tablebase.probe(set_up({'e1': 'K', 'e2': 'k', 'a8': 'Q'}, True)), ('DRAW', 0))
+        self.assertIsNone(self.tablebase.probe(ChessVar()))
+        self.assertIsNone(self.tablebase.probe(set_up({'a1': 'K', 'd4': 'R', 'h8': 'k'}, False)))     # no table
+
+    def test_matches_rules(self):
+        self.assertEqual(check_against_rules(self, self.tablebase, 'KQk', 400, 23), {'WIN', 'LOSS', 'DRAW'})
+
+    def test_table_file(self):
+        path = os.path.join(self.directory, 'KQvK.cvtb')
+        self.assertEqual(os.path.getsize(path), FILE_HEADER.size + 2 * 64 ** 3)
+        with open(path, 'r+b') as table_file:
+            table_file.write(b'XXXX')
+        try:
+            with self.assertRaises(ValueError):
+                Tablebase(self.directory).probe(set_up({'a1': 'K', 'd4': 'Q', 'h8': 'k'}, False))
+        finally:
+            with open(path, 'r+b') as table_file:
+                table_file.write(MAGIC)
+
+
+class TestPawnTablebase(unittest.TestCase):
+    """
+    pawn tables: pawns only move forward, survive blasts and never promote
+    """
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        cls.written = generate(['KPvK', 'KvKP'], cls.directory)
+        cls.tablebase = Tablebase(cls.directory)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tablebase.close()
+        shutil.rmtree(cls.directory)
+
+    def test_probe(self):
+        self.assertEqual(self.written, ['KPvK', 'KvKP'])
+        # pawn takes the king
+        self.assertEqual(self.tablebase.probe(set_up({'a1': 'K', 'e6': 'P', 'd7': 'k'}, False)), ('WIN', 1))
+        self.assertEqual(self.tablebase.probe(set_up({'e3': 'K', 'd4': 'p', 'h8': 'k'}, True)), ('WIN', 1))
+        # a king can't capture, so the side to move just walks out of the pawn's reach
+        self.assertEqual(self.tablebase.probe(set_up({'a1': 'K', 'e6': 'P', 'd7': 'k'}, True)), ('DRAW', 0))
+        self.assertEqual(self.tablebase.probe(set_up({'e3': 'K', 'd4': 'p', 'h8': 'k'}, False)), ('DRAW', 0))
+
+    def test_matches_rules(self):
+        # a lone king can almost always step away from one pawn, so losses are too rare to sample
+        for letters, seed in [('KPk', 5), ('Kkp', 6)]:
+            self.assertLessEqual({'WIN', 'DRAW'}, check_against_rules(self, self.tablebase, letters, 300, seed))
+
+
+@unittest.skipUnless(os.environ.get('CHESSVAR_SLOW_TESTS'), "set CHESSVAR_SLOW_TESTS=1 to build a 4 piece table")
+class TestFourPieceTablebase(unittest.TestCase):
+    """
+    a 4 piece table whose captures lead into KvK. takes a few minutes to build
+    """
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        cls.written = generate(['KNvKP'], cls.directory)
+        cls.tablebase = Tablebase(cls.directory)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tablebase.close()
+        shutil.rmtree(cls.directory)
+
+    def test_probe(self):
+        self.assertEqual(self.written, ['KNvKP', 'KvK'])
+        # knight takes the king
+        self.assertEqual(self.tablebase.probe(set_up({'a1': 'K', 'f6': 'N', 'e8': 'k', 'a7': 'p'}, False)),
+                         ('WIN', 1))
+        # pawn takes the king
+        self.assertEqual(self.tablebase.probe(set_up({'d4': 'K', 'a1': 'N', 'h8': 'k', 'e5': 'p'}, True)),
+                         ('WIN', 1))
+        # bare kings can never end the game
+        self.assertEqual(self.tablebase.probe(set_up({'a1': 'K', 'h8': 'k'}, False)), ('DRAW', 0))
+
+    def test_matches_rules(self):
+        self.assertLessEqual({'WIN', 'DRAW'}, check_against_rules(self, self.tablebase, 'KNkp', 300, 7))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import random
+import unittest
+from array import array
+from multiprocessing import shared_memory
+from ChessVar import *
+from tensors import *
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def expected_planes(game):
+    """
+    planes built square by square from get_board, to check the export against
+    """
+    planes = [0] * POSITION_SIZE
+    for name, piece in game.get_board().items():
+        if piece is not None:
+            planes[piece.get_code() * 64 + SQUARE_INDEX[name]] = 1
+    if game.get_current_player() == 'white':
+        planes[SIDE_PLANE * 64:] = [1] * 64
+    return planes
+
+
+def random_games(count, seed):
+    rng = random.Random(seed)
+    games = []
+    for index in range(count):
+        game = ChessVar()
+        for ply in range(rng.randrange(30)):
+            moves = list(game.legal_moves())
+            if not moves:
+                break
+            game.make_move(*rng.choice(moves))
+        games.append(game)
+    return games
+
+
+class TestTensorExport(unittest.TestCase):
+    """
+    tensor export unit test
+    """
+    def test_bytearray_and_array(self):
+        games = random_games(6, 1)
+        buffer = bytearray(b'\xff' * POSITION_SIZE * len(games))       # old values get cleared
+        self.assertEqual(export_batch(games, buffer), len(games))
+        floats = array('f', [7.0] * POSITION_SIZE)
+        for slot, game in enumerate(games):
+            self.assertEqual(list(buffer[slot * POSITION_SIZE:(slot + 1) * POSITION_SIZE]), expected_planes(game))
+            export_position(game, memoryview(floats))
+            self.assertEqual(list(floats), expected_planes(game))
+
+    def test_shared_memory(self):
+        memory = shared_memory.SharedMemory(create=True, size=POSITION_SIZE)
+        try:
+            export_position(ChessVar(), memory.buf)
+            self.assertEqual(list(memory.buf[:POSITION_SIZE]), expected_planes(ChessVar()))
+        finally:
+            memory.close()
+            memory.unlink()
+
+    def test_errors(self):
+        with self.assertRaises(IndexError):
+            export_position(ChessVar(), bytearray(POSITION_SIZE), slot=1)
+        with self.assertRaises(ValueError):
+            export_position(ChessVar(), bytes(POSITION_SIZE))
+        with self.assertRaises(ValueError):
+            export_position(ChessVar(), array('q', [0] * POSITION_SIZE))
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_numpy_batch(self):
+        games = random_games(8, 2)
+        for dtype in (np.float32, np.uint8, np.bool_):
+            planes = np.zeros((len(games) + 2, PLANE_COUNT, 8, 8), dtype=dtype)
+            export_batch(games, planes, first_slot=2)
+            self.assertFalse(planes[:2].any())
+            for slot, game in enumerate(games):
+                self.assertEqual(planes[slot + 2].reshape(-1).astype(int).tolist(), expected_planes(game))
+
+        # e2 pawn of the starting position: plane 0, row 2, column e
+        start = np.zeros((PLANE_COUNT, 8, 8), dtype=np.float32)
+        export_position(ChessVar(), start)
+        self.assertEqual(start[0, 1, 4], 1.0)
+        self.assertEqual(start[SIDE_PLANE].sum(), 64)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+from transposition import *
+
+
+class TestTranspositionTable(unittest.TestCase):
+    """
+    transposition table unit test
+    """
+    def test_store_and_probe(self):
+        table = TranspositionTable(size_mb=0.01)
+        self.assertIsNone(table.probe(12345))
+        table.store(12345, 3, -40, EXACT, 777)
+        self.assertEqual(table.probe(12345), (3, -40, EXACT, 777))
+        self.assertEqual(table.get_stats(), {'probes': 2, 'hits': 1})
+
+    def test_replacement(self):
+        """
+        deep entry stays in its bucket, shallow entries share the always-replace slot
+        """
+        table = TranspositionTable(size_mb=0.01)
+        buckets = table.get_capacity() // 2
+        deep, shallow, newer = 5, 5 + buckets, 5 + 2 * buckets     # all land in the same bucket
+        table.store(deep, 6, 10, EXACT, 1)
+        table.store(shallow, 1, 20, LOWER_BOUND, 2)
+        table.store(newer, 2, 30, UPPER_BOUND, 3)
+        self.assertEqual(table.probe(deep), (6, 10, EXACT, 1))
+        self.assertIsNone(table.probe(shallow))
+        self.assertEqual(table.probe(newer), (2, 30, UPPER_BOUND, 3))
+
+    def test_fixed_size(self):
+        table = TranspositionTable(size_mb=1)
+        self.assertEqual(table.get_capacity(), 1024 * 1024 // ENTRY_BYTES)
+        table.clear()
+        self.assertIsNone(table.probe(0))
+
+
+class TestSharedTranspositionTable(unittest.TestCase):
+    """
+    shared memory table must behave like TranspositionTable and be seen from every attached copy
+    """
+    def setUp(self):
+        self.table = SharedTranspositionTable(size_mb=0.01)
+
+    def tearDown(self):
+        self.table.close()
+
+    def test_store_and_probe(self):
+        self.assertIsNone(self.table.probe(12345))
+        self.table.store(12345, 3, -40, EXACT, 777)
+        self.table.store(2 ** 64 - 1, 200, 100000, LOWER_BOUND, 4095)
+        self.assertEqual(self.table.probe(12345), (3, -40, EXACT, 777))
+        self.assertEqual(self.table.probe(2 ** 64 - 1), (127, 100000, LOWER_BOUND, 4095))
+        self.assertEqual(self.table.get_stats(), {'probes': 3, 'hits': 2})
+
+    def test_replacement(self):
+        buckets = self.table.get_capacity() // 2
+        deep, shallow, newer = 5, 5 + buckets, 5 + 2 * buckets
+        self.table.store(deep, 6, 10, EXACT, 1)
+        self.table.store(shallow, 1, 20, LOWER_BOUND, 2)
+        self.table.store(newer, 2, 30, UPPER_BOUND, 3)
+        self.assertEqual(self.table.probe(deep), (6, 10, EXACT, 1))
+        self.assertIsNone(self.table.probe(shallow))
+        self.assertEqual(self.table.probe(newer), (2, 30, UPPER_BOUND, 3))
+
+    def test_attach(self):
+        other = SharedTranspositionTable(name=self.table.get_name())
+        try:
+            self.assertEqual(other.get_capacity(), self.table.get_capacity())
+            other.store(99, 4, 15, EXACT, 12)
+            self.assertEqual(self.table.probe(99), (4, 15, EXACT, 12))
+        finally:
+            other.close()
+        self.assertEqual(self.table.probe(99), (4, 15, EXACT, 12))       # still there after the other detaches
+
+    def test_torn_entry(self):
+        """
+        words left by two different stores must read as a miss
+        """
+        self.table.store(7, 2, 50, EXACT, 3)
+        words = self.table._words
+        words[(7 % (self.table.get_capacity() // 2)) * 4 + 1] = pack_entry(9, -50, LOWER_BOUND, 4)
+        self.assertIsNone(self.table.probe(7))
+        self.table.clear()
+        self.assertIsNone(self.table.probe(0))
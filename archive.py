@@ -0,0 +1,220 @@
+# Author: angela peralta
+# GitHub username: angelaperalta1
+# Date: 10/18/26
+# Description: Packed binary archive of ChessVar games. Each move takes 12 bits (the encode_move code), each game
+#              has a 3 byte header with its result and ply count, and an offset index at the end of the file lets
+#              a reader jump straight to game K. The reader memory maps the archive, so only the games that are
+#              looked at get read.
+#              Run: python archive.py pack games.txt games.cva
+#                   python archive.py show games.cva 12 --ply 30
+
+import argparse
+import mmap
+import struct
+import sys
+from array import array
+
+from ChessVar import ChessVar, decode_move, encode_move
+from replay import parse_move
+
+MAGIC = b'CVGA'
+VERSION = 1
+FILE_HEADER = struct.Struct('<4sHHQQ')      # magic, version, reserved, game count, index offset
+GAME_HEADER = struct.Struct('<BH')          # result, plies
+GAME_RESULTS = ['UNFINISHED', 'WHITE_WON', 'BLACK_WON']
+MAX_PLIES = 0xffff
+MOVE_MASK = 0xfff
+
+
+def pack_moves(moves):
+    """
+    :param moves: list of 12 bit move codes
+    :return: bytes holding the codes back to back, 2 moves per 3 bytes
+    """
+    packed = 0
+    for ply, move_code in enumerate(moves):
+        packed |= move_code << (12 * ply)
+    return packed.to_bytes((12 * len(moves) + 7) // 8, 'little')
+
+
+def unpack_move(data, start, ply):
+    """
+    :param data: archive bytes or mmap
+    :param start: offset of the game's first move byte
+    :param ply: which move to read
+    :return: 12 bit move code
+    """
+    bit = 12 * ply
+    position = start + bit // 8
+    return (int.from_bytes(data[position:position + 2], 'little') >> (bit % 8)) & MOVE_MASK
+
+
+class ArchiveWriter:
+    """
+    write games to a new archive. the index and game count go in when the writer is closed
+    """
+    def __init__(self, path):
+        self._file = open(path, 'wb')
+        self._offsets = array('Q')      # file offset of each game
+        self._file.write(FILE_HEADER.pack(MAGIC, VERSION, 0, 0, 0))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def get_game_count(self):
+        """
+        :return: games written so far
+        """
+        return len(self._offsets)
+
+    def add_game(self, moves, game_state):
+        """
+        :param moves: list of 12 bit move codes, like selfplay results
+        :param game_state: get_game_state of the finished game
+        """
+        if len(moves) > MAX_PLIES:
+            raise ValueError(f"game has {len(moves)} plies, an archive game holds at most {MAX_PLIES}")
+
+        self._offsets.append(self._file.tell())
+        self._file.write(GAME_HEADER.pack(GAME_RESULTS.index(game_state), len(moves)))
+        self._file.write(pack_moves(moves))
+
+    def add_text_game(self, text, backend='list'):
+        """
+        replay a game written as moves like "e2e4 e7e5" through ChessVar and add it. the game stops at the first
+        move ChessVar rejects, like replay.replay_game
+        :return: number of moves added
+        """
+        game = ChessVar(backend)
+        moves = []
+        for token in text.split():
+            move = parse_move(token)
+            if move is None or not game.is_move_allowed(*move, quiet=True):
+                break
+            game.execute_move(*move)
+            moves.append(encode_move(*move))
+
+        self.add_game(moves, game.get_game_state())
+        return len(moves)
+
+    def close(self):
+        """
+        write the offset index and fill in the file header
+        """
+        if self._file.closed:
+            return
+        index_offset = self._file.tell()
+        if sys.byteorder == 'big':     # index is stored little endian like the headers
+            self._offsets.byteswap()
+        self._file.write(self._offsets.tobytes())
+        self._file.seek(0)
+        self._file.write(FILE_HEADER.pack(MAGIC, VERSION, 0, len(self._offsets), index_offset))
+        self._file.close()
+
+
+class ArchiveReader:
+    """
+    random access to the games in an archive through a memory map
+    """
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, reserved, self._game_count, self._index_offset = FILE_HEADER.unpack_from(self._data, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} game archive")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self._data.close()
+        self._file.close()
+
+    def get_game_count(self):
+        """
+        :return: number of games in the archive
+        """
+        return self._game_count
+
+    def game_offset(self, game_number):
+        """
+        :return: file offset of a game's header, read from the index
+        """
+        if not 0 <= game_number < self._game_count:
+            raise IndexError(f"game {game_number} is not in the archive")
+        return struct.unpack_from('<Q', self._data, self._index_offset + 8 * game_number)[0]
+
+    def get_header(self, game_number):
+        """
+        :return: (game state, plies) for a game
+        """
+        result, plies = GAME_HEADER.unpack_from(self._data, self.game_offset(game_number))
+        return GAME_RESULTS[result], plies
+
+    def get_move(self, game_number, ply):
+        """
+        read a single move without unpacking the rest of the game
+        :return: 12 bit move code
+        """
+        offset = self.game_offset(game_number)
+        result, plies = GAME_HEADER.unpack_from(self._data, offset)
+        if not 0 <= ply < plies:
+            raise IndexError(f"game {game_number} has no ply {ply}")
+        return unpack_move(self._data, offset + GAME_HEADER.size, ply)
+
+    def get_moves(self, game_number):
+        """
+        :return: list of 12 bit move codes for a game
+        """
+        offset = self.game_offset(game_number) + GAME_HEADER.size
+        plies = self.get_header(game_number)[1]
+        packed = int.from_bytes(self._data[offset:offset + (12 * plies + 7) // 8], 'little')
+        return [(packed >> (12 * ply)) & MOVE_MASK for ply in range(plies)]
+
+    def replay(self, game_number, ply=None, backend='list'):
+        """
+        :param ply: number of moves to play, None for the whole game
+        :return: ChessVar after that many moves of the game
+        """
+        moves = self.get_moves(game_number)
+        game = ChessVar(backend)
+        for move_code in moves[:ply]:
+            game.execute_move(*decode_move(move_code))
+        return game
+
+
+def main():
+    parser = argparse.ArgumentParser(description='pack ChessVar games into a binary archive or read one back')
+    commands = parser.add_subparsers(dest='command', required=True)
+    pack = commands.add_parser('pack', help='convert a text move list file (see replay.py) to an archive')
+    pack.add_argument('text_path')
+    pack.add_argument('archive_path')
+    show = commands.add_parser('show', help='print one game from an archive')
+    show.add_argument('archive_path')
+    show.add_argument('game', type=int)
+    show.add_argument('--ply', type=int, default=None, help='print the board after this many moves')
+    args = parser.parse_args()
+
+    if args.command == 'pack':
+        with open(args.text_path) as text_file, ArchiveWriter(args.archive_path) as writer:
+            for line in text_file:
+                if line.strip() and not line.startswith('#'):
+                    writer.add_text_game(line)
+            print(f"{writer.get_game_count()} games written to {args.archive_path}")
+        return
+
+    with ArchiveReader(args.archive_path) as reader:
+        game_state, plies = reader.get_header(args.game)
+        print(f"game {args.game}: {game_state}, {plies} plies")
+        reader.replay(args.game, args.ply).print_board()
+
+
+if __name__ == '__main__':
+    main()
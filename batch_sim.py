@@ -0,0 +1,194 @@
+# Author: angela peralta
+# GitHub username: angelaperalta1
+# Date: 10/18/26
+# Description: Step many ChessVar games at once with NumPy. N boards live in one (N, 64) int8 array and each
+#              step takes arrays of start and end square indexes. Same rules as ChessVar.make_move.
+
+try:
+    import numpy as np
+except ImportError:     # numpy is only needed for batch simulation
+    np = None
+
+from ChessVar import PIECE_TYPES, BLAST_SQUARES, BETWEEN_SQUARES
+
+# square values: 0 empty, 1-6 white pawn, knight, bishop, rook, queen, king, negative for black
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = 1, 2, 3, 4, 5, 6
+EMPTY_SQUARE = 64       # extra always-empty column, used to pad the lookup tables
+GAME_STATES = {0: 'UNFINISHED', 1: 'WHITE_WON', -1: 'BLACK_WON'}
+
+
+def build_tables():
+    """
+    lookup tables padded with EMPTY_SQUARE so every row has the same length
+    :return: (between, blast). between[start * 64 + end] holds the squares strictly between two lined up
+             squares, blast[square] holds the square itself first and then its neighbours
+    """
+    between = np.full((64 * 64, 6), EMPTY_SQUARE, dtype=np.int64)
+    for pair, squares in enumerate(BETWEEN_SQUARES):
+        between[pair, :len(squares)] = squares
+
+    blast = np.full((64, 9), EMPTY_SQUARE, dtype=np.int64)
+    for square in range(64):
+        blast[square, :len(BLAST_SQUARES[square])] = BLAST_SQUARES[square]
+    return between, blast
+
+
+def encode_game(game):
+    """
+    :param game: ChessVar
+    :return: (64,) int8 array of square values for the game's board
+    """
+    values = np.zeros(64, dtype=np.int8)
+    for square in range(64):
+        piece = game.get_piece_at(square)
+        if piece is not None:
+            value = PIECE_TYPES.index(piece.get_type()) + 1
+            values[square] = value if piece.get_color() == 'white' else -value
+    return values
+
+
+class BatchSimulator:
+    """
+    N games advanced in lockstep. boards, side to move and winner are arrays, one row per game
+    """
+    def __init__(self, game_count):
+        if np is None:
+            raise ImportError("BatchSimulator needs numpy")
+
+        self._between, self._blast = build_tables()
+        self._boards = np.zeros((game_count, 65), dtype=np.int8)     # column 64 is EMPTY_SQUARE
+        self._turns = np.ones(game_count, dtype=np.int8)            # 1 white to move, -1 black
+        self._winners = np.zeros(game_count, dtype=np.int8)         # 0 unfinished, 1 white won, -1 black won
+        self._plies = np.zeros(game_count, dtype=np.int32)
+        self.reset()
+
+    def reset(self):
+        """
+        put every game back at the starting position
+        """
+        back_row = [ROOK, KNIGHT, BISHOP, QUEEN, KING, BISHOP, KNIGHT, ROOK]
+        self._boards[:] = 0
+        self._boards[:, 0:8] = back_row
+        self._boards[:, 8:16] = PAWN
+        self._boards[:, 48:56] = -PAWN
+        self._boards[:, 56:64] = [-value for value in back_row]
+        self._turns[:] = 1
+        self._winners[:] = 0
+        self._plies[:] = 0
+
+    def load_game(self, index, game):
+        """
+        copy a ChessVar position into one slot of the batch
+        """
+        self._boards[index, :64] = encode_game(game)
+        self._turns[index] = 1 if game.get_current_player() == 'white' else -1
+        self._winners[index] = {state: value for value, state in GAME_STATES.items()}[game.get_game_state()]
+        self._plies[index] = 0
+
+    def get_boards(self):
+        """
+        :return: (N, 64) int8 view of the boards
+        """
+        return self._boards[:, :64]
+
+    def get_turns(self):
+        """
+        :return: (N,) int8 array, 1 if white is to move, -1 if black
+        """
+        return self._turns
+
+    def get_winners(self):
+        """
+        :return: (N,) int8 array, 0 unfinished, 1 white won, -1 black won
+        """
+        return self._winners
+
+    def get_plies(self):
+        """
+        :return: (N,) number of moves made in each game
+        """
+        return self._plies
+
+    def get_game_states(self):
+        """
+        :return: list of 'UNFINISHED', 'WHITE_WON', 'BLACK_WON' like ChessVar.get_game_state
+        """
+        return [GAME_STATES[int(winner)] for winner in self._winners]
+
+    def step(self, starts, ends):
+        """
+        make one move in every game. illegal moves and finished games are left unchanged, like make_move
+        returning False
+        :param starts: (N,) start square indexes (a1 = 0, h8 = 63)
+        :param ends: (N,) end square indexes
+        :return: (N,) bool array, True where the move was made
+        """
+        starts = np.asarray(starts, dtype=np.int64)
+        ends = np.asarray(ends, dtype=np.int64)
+        rows = np.arange(len(self._turns))
+        boards = self._boards
+
+        # off-board squares point at the empty column, so they fail the "own piece" check below
+        on_board = (starts >= 0) & (starts < 64) & (ends >= 0) & (ends < 64)
+        start = np.where(on_board, starts, EMPTY_SQUARE)
+        end = np.where(on_board, ends, EMPTY_SQUARE)
+        table_start = np.minimum(start, 63)
+        table_end = np.minimum(end, 63)
+
+        piece = boards[rows, start]
+        target = boards[rows, end]
+        kind = np.abs(piece)
+        row_diff = end // 8 - start // 8
+        col_diff = end % 8 - start % 8
+        abs_row = np.abs(row_diff)
+        abs_col = np.abs(col_diff)
+        forward = row_diff * self._turns
+
+        # piece movement, same as each piece's allowed_moves
+        home_row = np.where(self._turns == 1, 1, 6)
+        pawn_ok = (((col_diff == 0) & (target == 0) & ((forward == 1) | ((forward == 2) & (start // 8 == home_row))))
+                   | ((abs_col == 1) & (forward == 1) & (target != 0)))
+        straight = (abs_row == 0) | (abs_col == 0)
+        diagonal = abs_row == abs_col
+        shape_ok = np.select(
+            [kind == PAWN, kind == KNIGHT, kind == BISHOP, kind == ROOK, kind == QUEEN, kind == KING],
+            [pawn_ok, ((abs_row == 1) & (abs_col == 2)) | ((abs_row == 2) & (abs_col == 1)), diagonal, straight,
+             straight | diagonal, np.maximum(abs_row, abs_col) == 1],
+            False)
+
+        # everything but a knight needs the squares in between to be empty
+        path_clear = ~(boards[rows[:, None], self._between[table_start * 64 + table_end]] != 0).any(axis=1)
+
+        legal = (on_board & (self._winners == 0) & (np.sign(piece) == self._turns) & (start != end) & shape_ok
+                 & ((kind == KNIGHT) | path_clear) & (np.sign(target) != self._turns)
+                 & ~((kind == KING) & (target != 0)))
+
+        # a player cannot blow up both kings at the same time
+        blast_values = boards[rows[:, None], self._blast[table_end]]
+        both_kings = (blast_values == KING).any(axis=1) & (blast_values == -KING).any(axis=1)
+        legal &= ~((target != 0) & both_kings)
+        capture = legal & (target != 0)
+        quiet = legal & (target == 0)
+
+        # quiet moves
+        moved = rows[quiet]
+        boards[moved, end[quiet]] = piece[quiet]
+        boards[moved, start[quiet]] = 0
+
+        # captures: the capturing piece goes, then the captured piece and every non-pawn in the blast
+        captured = rows[capture]
+        boards[captured, start[capture]] = 0
+        squares = self._blast[end[capture]]
+        values = boards[captured[:, None], squares]
+        center = np.zeros(9, dtype=bool)
+        center[0] = True
+        destroyed = (values != 0) & ((np.abs(values) != PAWN) | center)
+        boards[np.broadcast_to(captured[:, None], squares.shape)[destroyed], squares[destroyed]] = 0
+
+        white_king_lost = ((values == KING) & destroyed).any(axis=1)
+        black_king_lost = ((values == -KING) & destroyed).any(axis=1)
+        self._winners[captured] = np.where(black_king_lost, 1, np.where(white_king_lost, -1, 0))
+
+        self._turns[legal] *= -1
+        self._plies[legal] += 1
+        return legal
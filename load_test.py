@@ -0,0 +1,136 @@
+# Author: angela peralta
+# GitHub username: angelaperalta1
+# Date: 10/18/26
+# Description: Load test for server.py. Opens many sessions spread over a pool of connections, plays random legal
+#              moves in all of them at once and reports MOVE latency percentiles and throughput.
+#              Run: python load_test.py --sessions 10000 --connections 200 --moves 20 --serve
+
+import argparse
+import asyncio
+import random
+import time
+
+from server import GameServer
+
+
+class Connection:
+    """
+    one socket shared by many sessions. a lock keeps each request and its response together
+    """
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+        self._lock = asyncio.Lock()
+
+    async def request(self, line):
+        """
+        :return: (response line, seconds from sending the request to reading the response)
+        """
+        async with self._lock:
+            start_time = time.perf_counter()
+            self._writer.write(line.encode('ascii') + b'\n')
+            await self._writer.drain()
+            response = await self._reader.readline()
+            return response.decode('ascii').rstrip('\n'), time.perf_counter() - start_time
+
+    async def close(self):
+        self._writer.close()
+        await self._writer.wait_closed()
+
+
+async def play_session(connection, move_count, rng, latencies):
+    """
+    start a session and play up to move_count random legal moves in it
+    """
+    response, seconds = await connection.request('NEW')
+    session = response.split()[1]
+    for ply in range(move_count):
+        response, seconds = await connection.request(f'MOVES {session}')
+        moves = response.split()[1:]
+        if not moves:
+            break
+        response, seconds = await connection.request(f'MOVE {session} {rng.choice(moves)}')
+        if not response.startswith('OK'):
+            raise RuntimeError(f"server rejected a legal move: {response}")
+        latencies.append(seconds)
+        if response.split()[1] != 'UNFINISHED':
+            break
+    await connection.request(f'END {session}')
+
+
+def percentile(sorted_values, fraction):
+    """
+    :return: value at fraction (0 to 1) of a sorted list
+    """
+    return sorted_values[round(fraction * (len(sorted_values) - 1))]
+
+
+async def run_load_test(session_count, connection_count, move_count, host='127.0.0.1', port=8765, unix_path=None,
+                        seed=0):
+    """
+    :return: dict with sessions, moves, seconds, moves_per_second and p50/p99/max MOVE latency in milliseconds
+    """
+    connections = []
+    for index in range(connection_count):
+        if unix_path is not None:
+            reader, writer = await asyncio.open_unix_connection(unix_path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        connections.append(Connection(reader, writer))
+
+    rng = random.Random(seed)
+    latencies = []
+    start_time = time.perf_counter()
+    await asyncio.gather(*(play_session(connections[index % connection_count], move_count,
+                                        random.Random(rng.getrandbits(32)), latencies)
+                           for index in range(session_count)))
+    seconds = time.perf_counter() - start_time
+    for connection in connections:
+        await connection.close()
+
+    latencies.sort()
+    milliseconds = [latency * 1000 for latency in latencies] or [0.0]
+    return {'sessions': session_count, 'moves': len(latencies), 'seconds': seconds,
+            'moves_per_second': len(latencies) / seconds if seconds > 0 else 0.0,
+            'p50_ms': percentile(milliseconds, 0.5), 'p99_ms': percentile(milliseconds, 0.99),
+            'max_ms': milliseconds[-1]}
+
+
+async def run(args):
+    server = None
+    port = args.port
+    if args.serve:
+        server = GameServer(args.backend)
+        await server.start(args.host, 0 if args.unix is None else None, args.unix)
+        port = server.get_port() if args.unix is None else None
+
+    try:
+        return await run_load_test(args.sessions, args.connections, args.moves, args.host, port, args.unix,
+                                   args.seed)
+    finally:
+        if server is not None:
+            await server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='measure ChessVar server move latency under load')
+    parser.add_argument('--sessions', type=int, default=10000)
+    parser.add_argument('--connections', type=int, default=200)
+    parser.add_argument('--moves', type=int, default=20, help='moves to play in each session')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', default=None, help='connect to a unix socket instead of TCP')
+    parser.add_argument('--serve', action='store_true', help='run the server in this process instead of connecting '
+                                                             'to one')
+    parser.add_argument('--backend', choices=['list', 'bitboard'], default='list')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+    print(f"{result['sessions']} sessions, {result['moves']} moves in {result['seconds']:.2f}s "
+          f"({result['moves_per_second']:.0f} moves/sec)")
+    print(f"move latency p50 {result['p50_ms']:.2f} ms, p99 {result['p99_ms']:.2f} ms, max {result['max_ms']:.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
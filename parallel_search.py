@@ -0,0 +1,258 @@
+# Author: angela peralta
+# GitHub username: angelaperalta1
+# Date: 10/18/26
+# Description: Lazy SMP search for ChessVar. Worker processes search the same position at the same time and share
+#              one SharedTranspositionTable, so each one picks up what the others already found. Helpers try the
+#              root moves in a shuffled order from the seed and every other helper goes one ply deeper, so they
+#              spread out over the tree instead of repeating the main worker. The main worker runs in the calling
+#              process, so one worker searches exactly like search.Searcher and gives the same result every run.
+
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from ChessVar import ChessVar, PIECES, STARTING_FEN
+from search import Searcher, CHECK_TIME_EVERY
+from transposition import SharedTranspositionTable
+
+DEFAULT_DEPTH = 4       # Searcher's depth when there is no depth and no time limit
+BENCHMARK_FENS = [
+    STARTING_FEN,
+    'r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w',
+    'r2qk2r/ppp2ppp/2npbn2/2b1p3/4P3/2NP1N2/PPPBBPPP/R2QK2R b',
+]
+
+_attached = {}      # in each worker process: shared memory name -> attached table or stop flag
+
+
+class WorkerSearcher(Searcher):
+    """
+    Searcher that also stops when the main worker sets the shared stop flag
+    """
+    def __init__(self, table, stop_flag):
+        """
+        :param table: SharedTranspositionTable
+        :param stop_flag: one byte buffer, nonzero when the search should stop
+        """
+        super().__init__(table)
+        self._stop_flag = stop_flag
+
+    def out_of_time(self):
+        """
+        check the clock and the stop flag every CHECK_TIME_EVERY nodes
+        """
+        if super().out_of_time():
+            return True
+        if self._nodes % CHECK_TIME_EVERY == 0 and self._stop_flag[0]:
+            self._stopped = True
+        return self._stopped
+
+
+def attach(table_name, flag_name):
+    """
+    attach to the shared table and stop flag once per worker process
+    :return: (SharedTranspositionTable, stop flag buffer)
+    """
+    if table_name not in _attached:
+        _attached[table_name] = SharedTranspositionTable(name=table_name)
+    if flag_name not in _attached:
+        _attached[flag_name] = shared_memory.SharedMemory(name=flag_name)
+    return _attached[table_name], _attached[flag_name].buf
+
+
+def search_worker(table_name, flag_name, codes, current_player, backend, depth, time_ms, root_moves):
+    """
+    helper search, run in a worker process
+    :param codes: piece code or None for each of the 64 squares, the position exactly as the main worker has it
+    :param root_moves: (start, end) square index pairs in the order to search them
+    :return: (completed depth, score, move names, nodes)
+    """
+    table, stop_flag = attach(table_name, flag_name)
+    searcher = WorkerSearcher(table, stop_flag)
+    game = ChessVar(backend)
+    game.set_position([PIECES[code] if code is not None else None for code in codes], current_player)
+    move = searcher.search(game, depth, time_ms, root_moves)
+    return searcher.get_completed_depth(), searcher.get_score(), move, searcher.get_nodes()
+
+
+class ParallelSearcher:
+    """
+    lazy SMP search over a pool of worker processes. keeps its shared table and processes between searches,
+    call close() when done
+    """
+    def __init__(self, workers=None, size_mb=64, seed=0, backend='list'):
+        """
+        :param workers: number of searching processes including this one, defaults to the number of cores
+        :param size_mb: shared transposition table size in megabytes
+        :param seed: seed for the helpers' root move orders
+        :param backend: board backend the helpers search with
+        """
+        self._workers = workers or os.cpu_count() or 1
+        self._seed = seed
+        self._backend = backend
+        self._table = SharedTranspositionTable(size_mb)
+        self._stop = shared_memory.SharedMemory(create=True, size=1)
+        self._stop.buf[0] = 0
+        self._searcher = WorkerSearcher(self._table, self._stop.buf)
+        self._executor = ProcessPoolExecutor(max_workers=self._workers - 1) if self._workers > 1 else None
+        self._nodes = 0
+        self._completed_depth = 0
+        self._score = 0
+
+    def get_workers(self):
+        """
+        :return: number of searching processes
+        """
+        return self._workers
+
+    def get_table(self):
+        """
+        :return: the SharedTranspositionTable
+        """
+        return self._table
+
+    def get_nodes(self):
+        """
+        :return: nodes visited by all workers in the last search
+        """
+        return self._nodes
+
+    def get_completed_depth(self):
+        """
+        :return: deepest iteration a worker finished in the last search
+        """
+        return self._completed_depth
+
+    def get_score(self):
+        """
+        :return: score of the move returned by the last search, from the side to move's point of view
+        """
+        return self._score
+
+    def helper_moves(self, root_moves, worker):
+        """
+        :return: root moves shuffled for one helper, the same order every time for the same seed
+        """
+        moves = list(root_moves)
+        random.Random(f'{self._seed}-{worker}').shuffle(moves)
+        return moves
+
+    def search(self, game, depth=None, time_ms=100):
+        """
+        search with every worker and keep the deepest finished result, the main worker's on a tie
+        :param game: ChessVar to search. it is left exactly as it was
+        :param depth: deepest iteration, None to keep going until time runs out
+        :param time_ms: time budget in milliseconds, None for no limit
+        :return: best (start, end) move, or None if the side to move has no legal moves
+        """
+        root_moves = list(game.generate_moves())
+        if not root_moves:
+            return None
+        if depth is None and time_ms is None:
+            depth = DEFAULT_DEPTH
+
+        self._stop.buf[0] = 0
+        futures = []
+        if self._executor is not None:
+            codes = tuple(piece.get_code() if piece is not None else None
+                          for piece in map(game.get_piece_at, range(64)))
+            for worker in range(1, self._workers):
+                helper_depth = depth + worker % 2 if depth is not None else None
+                futures.append(self._executor.submit(search_worker, self._table.get_name(), self._stop.name, codes,
+                                                     game.get_current_player(), self._backend, helper_depth,
+                                                     time_ms, self.helper_moves(root_moves, worker)))
+
+        move = self._searcher.search(game, depth, time_ms, root_moves)
+        self._stop.buf[0] = 1       # main worker is done, helpers stop at their next check
+
+        best = (self._searcher.get_completed_depth(), self._searcher.get_score(), move)
+        self._nodes = self._searcher.get_nodes()
+        for future in futures:
+            completed_depth, score, helper_move, nodes = future.result()
+            self._nodes += nodes
+            if completed_depth > best[0]:
+                best = (completed_depth, score, helper_move)
+        self._completed_depth, self._score, move = best
+        return move
+
+    def close(self):
+        """
+        shut down the worker processes and free the shared memory
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        self._searcher = None
+        self._table.close()
+        self._stop.close()
+        self._stop.unlink()
+
+
+def benchmark(fens=None, depth=4, worker_counts=(1, 2, 4), seed=0, backend='list'):
+    """
+    time to finish a fixed depth search on each position, for each worker count. the table is cleared before
+    every search so no run starts with a head start
+    :param fens: positions to search, BENCHMARK_FENS if None
+    :return: list of dicts with workers, seconds, nodes and speedup over the first worker count
+    """
+    fens = fens or BENCHMARK_FENS
+    results = []
+    for workers in worker_counts:
+        searcher = ParallelSearcher(workers, seed=seed, backend=backend)
+        seconds = 0
+        nodes = 0
+        try:
+            for fen in fens:
+                searcher.get_table().clear()
+                game = ChessVar.from_fen(fen, backend)
+                start_time = time.perf_counter()
+                searcher.search(game, depth, None)
+                seconds += time.perf_counter() - start_time
+                nodes += searcher.get_nodes()
+        finally:
+            searcher.close()
+        results.append({'workers': workers, 'seconds': seconds, 'nodes': nodes,
+                        'speedup': results[0]['seconds'] / seconds if results and seconds > 0 else 1.0})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='parallel ChessVar search, or a speedup benchmark')
+    parser.add_argument('fen', nargs='?', default=STARTING_FEN, help='position to search')
+    parser.add_argument('--workers', type=int, default=None, help='searching processes, defaults to the cores')
+    parser.add_argument('--depth', type=int, default=None)
+    parser.add_argument('--time-ms', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--backend', choices=['list', 'bitboard'], default='list')
+    parser.add_argument('--benchmark', metavar='COUNTS', default=None,
+                        help='comma separated worker counts to time at --depth (default 4), ex: 1,2,4,8')
+    args = parser.parse_args()
+
+    if args.benchmark is not None:
+        worker_counts = [int(count) for count in args.benchmark.split(',')]
+        print(f"{len(BENCHMARK_FENS)} positions to depth {args.depth or DEFAULT_DEPTH}, {os.cpu_count()} cores")
+        for result in benchmark(None, args.depth or DEFAULT_DEPTH, worker_counts, args.seed, args.backend):
+            print(f"{result['workers']:3} workers: {result['seconds']:.2f}s, {result['nodes']} nodes, "
+                  f"speedup {result['speedup']:.2f}x")
+        return
+
+    searcher = ParallelSearcher(args.workers, seed=args.seed, backend=args.backend)
+    try:
+        game = ChessVar.from_fen(args.fen, args.backend)
+        start_time = time.perf_counter()
+        move = searcher.search(game, args.depth, args.time_ms if args.depth is None else None)
+        seconds = time.perf_counter() - start_time
+    finally:
+        searcher.close()
+    if move is None:
+        print("no legal move")
+        return
+    print(f"{move[0]}{move[1]} score {searcher.get_score()} depth {searcher.get_completed_depth()}, "
+          f"{searcher.get_nodes()} nodes on {searcher.get_workers()} workers in {seconds:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+# Author: angela peralta
+# GitHub username: angelaperalta1
+# Date: 10/18/26
+# Description: Perft for ChessVar. Counts leaf nodes of the legal move tree to a fixed depth, with per-move
+#              divide counts and nodes per second. Used to check move generation and to benchmark it.
+#              Run: python perft.py 3 --position kings_adjacent --backend bitboard --divide
+
+import argparse
+import time
+
+from ChessVar import ChessVar, SQUARE_NAMES
+
+# test positions, reached by replaying moves from the starting position
+POSITIONS = {
+    'start': [],
+
+    # white knight on g5 can capture f7 and blow up the black king
+    'king_blast': [('g1', 'f3'), ('a7', 'a6'), ('f3', 'g5'), ('a6', 'a5')],
+
+    # Nxe5 explodes next to the e4, d7, f7 pawns, which survive
+    'pawns_survive': [('e2', 'e4'), ('e7', 'e5'), ('g1', 'f3'), ('b8', 'c6')],
+
+    # kings walked up the board next to each other. bxc5 would blow up both kings and is not allowed
+    'kings_adjacent': [('b2', 'b4'), ('f7', 'f5'), ('e2', 'e3'), ('e8', 'f7'), ('e1', 'e2'), ('g7', 'g5'),
+                       ('e2', 'd3'), ('f7', 'e6'), ('d3', 'c3'), ('c7', 'c5'), ('c3', 'd4'), ('d8', 'b6'),
+                       ('d4', 'd3'), ('e6', 'd5'), ('h2', 'h3'), ('d5', 'c6'), ('d3', 'c4'), ('b6', 'b5')],
+}
+
+
+def setup_position(name, backend='list'):
+    """
+    :param name: key in POSITIONS
+    :param backend: ChessVar board backend
+    :return: ChessVar at that position
+    """
+    game = ChessVar(backend)
+    for start, end in POSITIONS[name]:
+        if not game.make_move(start, end):
+            raise ValueError(f"position {name} has an illegal move {start}{end}")
+    return game
+
+
+def perft(game, depth):
+    """
+    count leaf nodes depth plies down. a finished game has no moves, so it only counts at depth 0
+    :return: number of leaf nodes
+    """
+    if depth == 0:
+        return 1
+
+    # last ply: no need to make the moves, just count them
+    if depth == 1:
+        return sum(1 for move in game.generate_moves())
+
+    nodes = 0
+    for start, end in list(game.generate_moves()):
+        game.push_move(start, end)
+        nodes += perft(game, depth - 1)
+        game.pop()
+    return nodes
+
+
+def divide(game, depth):
+    """
+    perft split by root move, for tracking down which move a count is wrong under
+    :return: dict of (start, end) -> leaf nodes
+    """
+    counts = {}
+    for start, end in list(game.generate_moves()):
+        game.push_move(start, end)
+        counts[SQUARE_NAMES[start], SQUARE_NAMES[end]] = perft(game, depth - 1)
+        game.pop()
+    return counts
+
+
+def run_perft(name, depth, backend='list'):
+    """
+    time a divide run on one of the test positions
+    :return: dict with position, depth, nodes, seconds, nodes_per_second and divide counts
+    """
+    game = setup_position(name, backend)
+    start_time = time.perf_counter()
+    counts = divide(game, depth) if depth > 0 else {}
+    seconds = time.perf_counter() - start_time
+    nodes = sum(counts.values()) if depth > 0 else 1
+
+    return {'position': name, 'depth': depth, 'backend': backend, 'nodes': nodes, 'seconds': seconds,
+            'nodes_per_second': nodes / seconds if seconds > 0 else 0.0, 'divide': counts}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='count ChessVar move tree leaf nodes')
+    parser.add_argument('depth', type=int)
+    parser.add_argument('--position', choices=sorted(POSITIONS), action='append',
+                        help='position to run (default: all of them)')
+    parser.add_argument('--backend', choices=['list', 'bitboard'], default='list')
+    parser.add_argument('--divide', action='store_true', help='print node counts for each root move')
+    args = parser.parse_args()
+
+    for name in args.position or list(POSITIONS):
+        result = run_perft(name, args.depth, args.backend)
+        if args.divide:
+            for (start, end), nodes in sorted(result['divide'].items()):
+                print(f'{start}{end}: {nodes}')
+        print(f"{name} depth {result['depth']} ({result['backend']}): {result['nodes']} nodes "
+              f"in {result['seconds']:.3f}s, {result['nodes_per_second']:.0f} nodes/sec")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+# Author: angela peralta
+# GitHub username: angelaperalta1
+# Date: 10/18/26
+# Description: Board rendering for spectators. The board text lives in one bytearray with a fixed spot for every
+#              square, so after a move only the changed squares (moved piece, explosion clears) are rewritten.
+#              Full renders are cached by position hash, and changes can go out as terminal cursor updates
+#              instead of a whole new board.
+
+from collections import OrderedDict
+
+from ChessVar import SQUARE_COORDINATES, PIECE_LETTERS
+
+COLUMN_HEADINGS = '   ' + '   '.join('abcdefgh')
+EMPTY = ord(' ')
+LINE_LENGTH = len('8 ' + ' '.join(['[ ]'] * 8) + ' 8') + 1      # with the newline
+
+
+def blank_board():
+    """
+    :return: bytearray of an empty board: headings, 8 rows from row 8 down to row 1, headings
+    """
+    lines = [COLUMN_HEADINGS.ljust(LINE_LENGTH - 1)]
+    for row in range(8, 0, -1):
+        lines.append(f"{row} " + ' '.join(['[ ]'] * 8) + f" {row}")
+    lines.append(COLUMN_HEADINGS.ljust(LINE_LENGTH - 1))
+    return bytearray(('\n'.join(lines) + '\n').encode('ascii'))
+
+
+def square_position(index):
+    """
+    :return: (line, column) of a square's letter in the board text, both counted from 0
+    """
+    column, row = SQUARE_COORDINATES[index]
+    return 9 - row, 3 + 4 * column
+
+
+# byte offset of each square's letter in the buffer
+SQUARE_OFFSETS = [line * LINE_LENGTH + column for line, column in map(square_position, range(64))]
+
+
+class BoardRenderer:
+    """
+    keeps the last rendered board in a buffer. render() gives the whole board, update() only what changed
+    """
+    def __init__(self, cache_size=4096):
+        """
+        :param cache_size: most full renders to keep, least recently used are dropped first
+        """
+        self._buffer = blank_board()
+        self._cache = OrderedDict()     # position hash -> board text
+        self._cache_size = cache_size
+        self._hits = 0
+        self._misses = 0
+
+    def get_cache_stats(self):
+        """
+        :return: dict with hits, misses and size of the render cache
+        """
+        return {'hits': self._hits, 'misses': self._misses, 'size': len(self._cache)}
+
+    def update(self, game, squares=None):
+        """
+        bring the buffer up to date with the game
+        :param squares: square indexes that may have changed, like a move's start, end and destroyed squares.
+                        None to check all 64
+        :return: list of (square index, letter) that changed, a space for a square that was cleared
+        """
+        buffer = self._buffer
+        changes = []
+        for index in range(64) if squares is None else squares:
+            piece = game.get_piece_at(index)
+            letter = ord(PIECE_LETTERS[piece]) if piece is not None else EMPTY
+            offset = SQUARE_OFFSETS[index]
+            if buffer[offset] != letter:
+                buffer[offset] = letter
+                changes.append((index, chr(letter)))
+        return changes
+
+    def render(self, game):
+        """
+        :return: the whole board as text, from the cache if this position was rendered before
+        """
+        key = game.get_hash()
+        text = self._cache.get(key)
+        if text is not None:
+            self._hits += 1
+            self._cache.move_to_end(key)
+            self._buffer[:] = text.encode('ascii')
+            return text
+
+        self._misses += 1
+        self.update(game)
+        text = self._buffer.decode('ascii')
+        self._cache[key] = text
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+        return text
+
+    def terminal_update(self, game, squares=None, top=1, left=1):
+        """
+        changed squares as ANSI cursor moves, for a terminal already showing the last render
+        :param top: terminal row the board text starts on, counted from 1
+        :param left: terminal column the board text starts on, counted from 1
+        :return: escape sequence string, empty if nothing changed
+        """
+        updates = []
+        for index, letter in self.update(game, squares):
+            line, column = square_position(index)
+            updates.append(f"\x1b[{top + line};{left + column}H{letter}")
+        return ''.join(updates)
@@ -0,0 +1,187 @@
+# Author: angela peralta
+# GitHub username: angelaperalta1
+# Date: 10/18/26
+# Description: Replay archived ChessVar games from a text file, one game per line as moves like "e2e4 e7e5 g1f3".
+#              Games are read one at a time through generators, so memory stays flat however big the file is.
+#              The file can be memory mapped and split into chunks that worker processes replay in parallel.
+#              Blank lines and lines starting with # are skipped.
+#              Run: python replay.py games.txt --mmap --workers 8
+
+import argparse
+import mmap
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from ChessVar import ChessVar, SQUARE_INDEX
+
+CHUNK_BYTES = 1 << 20       # size of the pieces a file is split into for parallel replay
+CHUNKS_PER_WORKER = 2       # chunks queued per worker process, bounds how many results wait in memory
+
+
+def parse_move(token):
+    """
+    :param token: move text like e2e4
+    :return: (start, end) square indexes, None if the text is not a move
+    """
+    if len(token) != 4:
+        return None
+    start, end = SQUARE_INDEX.get(token[:2]), SQUARE_INDEX.get(token[2:])
+    if start is None or end is None:
+        return None
+    return start, end
+
+
+def replay_game(text, backend='list'):
+    """
+    play one game's moves until the game ends or a move is rejected. nothing is printed
+    :param text: moves separated by spaces
+    :param backend: ChessVar board backend
+    :return: dict with winner (get_game_state), plies made and illegal, (ply, move text) for the first move
+             that was rejected or None
+    """
+    game = ChessVar(backend)
+    plies = 0
+    illegal = None
+    for token in text.split():
+        move = parse_move(token)
+        # same checks as make_move, without the messages it prints for rejected moves
+        if move is None or not game.is_move_allowed(*move, quiet=True):
+            illegal = (plies, token)
+            break
+        game.execute_move(*move)
+        plies += 1
+
+    return {'winner': game.get_game_state(), 'plies': plies, 'illegal': illegal}
+
+
+def iter_lines(source, start=0, stop=None):
+    """
+    :param source: open binary file or mmap
+    :param start: byte offset of the first line, must be at the start of a line
+    :param stop: lines starting at or after this offset are left for the next chunk, None for the end of the file
+    :return: generator of (offset, text) for each game line
+    """
+    source.seek(start)
+    offset = start
+    while stop is None or offset < stop:
+        line = source.readline()
+        if not line:
+            break
+        text = line.decode('ascii', 'replace').strip()      # a bad byte shows up as an illegal move
+        if text and not text.startswith('#'):
+            yield offset, text
+        offset += len(line)
+
+
+def replay_lines(lines, backend='list'):
+    """
+    :param lines: iterable of (offset, text), see iter_lines
+    :return: generator of replay_game results, each with the offset of its line added
+    """
+    for offset, text in lines:
+        result = replay_game(text, backend)
+        result['offset'] = offset
+        yield result
+
+
+def replay_file(path, backend='list', use_mmap=False):
+    """
+    replay every game in a file in this process
+    :param use_mmap: read through a memory map instead of buffered file reads
+    :return: generator of replay_game results with offsets, in file order
+    """
+    with open(path, 'rb') as game_file:
+        if use_mmap and os.path.getsize(path) > 0:
+            with mmap.mmap(game_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                yield from replay_lines(iter_lines(mapped), backend)
+        else:
+            yield from replay_lines(iter_lines(game_file), backend)
+
+
+def chunk_bounds(path, chunk_bytes=CHUNK_BYTES):
+    """
+    split a file into byte ranges that start at the beginning of a line
+    :return: list of (start, stop) offsets covering the whole file
+    """
+    size = os.path.getsize(path)
+    starts = [0]
+    with open(path, 'rb') as game_file:
+        while starts[-1] + chunk_bytes < size:
+            game_file.seek(starts[-1] + chunk_bytes)
+            game_file.readline()        # move to the start of the next line
+            if game_file.tell() >= size:
+                break
+            starts.append(game_file.tell())
+    return list(zip(starts, starts[1:] + [size]))
+
+
+def replay_chunk(path, bounds, backend='list'):
+    """
+    replay the games in one byte range of a file. runs inside a worker process
+    :return: list of replay_game results with offsets
+    """
+    start, stop = bounds
+    with open(path, 'rb') as game_file:
+        with mmap.mmap(game_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return list(replay_lines(iter_lines(mapped, start, stop), backend))
+
+
+def replay_parallel(path, workers=None, backend='list', chunk_bytes=CHUNK_BYTES):
+    """
+    replay a memory mapped file on a process pool, one chunk of about chunk_bytes per task. at most
+    CHUNKS_PER_WORKER chunks per worker are in flight, so memory stays bounded however big the file is
+    :param workers: number of processes, defaults to the number of cores
+    :return: generator of replay_game results with offsets, in file order
+    """
+    if os.path.getsize(path) == 0:
+        return
+    workers = workers or os.cpu_count() or 1
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for bounds in chunk_bounds(path, chunk_bytes):
+            if len(pending) >= workers * CHUNKS_PER_WORKER:
+                yield from pending.popleft().result()
+            pending.append(executor.submit(replay_chunk, path, bounds, backend))
+        while pending:
+            yield from pending.popleft().result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='replay ChessVar games from a move list file')
+    parser.add_argument('path')
+    parser.add_argument('--backend', choices=['list', 'bitboard'], default='list')
+    parser.add_argument('--mmap', action='store_true', help='read the file through a memory map')
+    parser.add_argument('--workers', type=int, default=None, help='replay chunks on this many processes')
+    parser.add_argument('--show-illegal', action='store_true', help='print games with a rejected move')
+    args = parser.parse_args()
+
+    if args.workers is not None:
+        results = replay_parallel(args.path, args.workers, args.backend)
+    else:
+        results = replay_file(args.path, args.backend, args.mmap)
+
+    counts = {'WHITE_WON': 0, 'BLACK_WON': 0, 'UNFINISHED': 0}
+    games = total_plies = illegal_games = 0
+    start_time = time.perf_counter()
+    for result in results:
+        games += 1
+        total_plies += result['plies']
+        counts[result['winner']] += 1
+        if result['illegal'] is not None:
+            illegal_games += 1
+            if args.show_illegal:
+                ply, token = result['illegal']
+                print(f"game at byte {result['offset']}: move {ply + 1} ({token}) rejected")
+    seconds = time.perf_counter() - start_time
+
+    print(f"{games} games, {total_plies} plies in {seconds:.2f}s ({games / seconds if seconds > 0 else 0:.1f} "
+          f"games/sec)")
+    print(f"white won {counts['WHITE_WON']}, black won {counts['BLACK_WON']}, unfinished {counts['UNFINISHED']}, "
+          f"{illegal_games} with a rejected move")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,311 @@
+# Author: angela peralta
+# GitHub username: angelaperalta1
+# Date: 10/18/26
+# Description: Move search for ChessVar. Negamax alpha-beta with iterative deepening, a transposition table,
+#              move ordering and a quiescence search over captures, since captures are where explosions happen.
+
+import time
+
+from ChessVar import SQUARE_NAMES, BLAST_SQUARES, PIECE_VALUES, encode_move
+from transposition import TranspositionTable, EXACT, LOWER_BOUND, UPPER_BOUND
+
+WIN_SCORE = 100000      # king captured or blown up. winning sooner scores higher
+MAX_DEPTH = 64
+INFINITE = 1000000
+CHECK_TIME_EVERY = 256      # nodes between clock checks
+
+
+def evaluate(game):
+    """
+    ChessVar's incremental evaluation: material, piece squares and king danger from the explosions
+    :return: score from the side to move's point of view
+    """
+    return game.evaluate()
+
+
+def capture_gain(game, move):
+    """
+    rough value of a capture: opponent material in the blast minus our own, including the capturing piece.
+    a king in the blast counts as a win (or a loss if it is ours)
+    :return: material gained by the side to move
+    """
+    start, center = move
+    color = game.get_current_player()
+    gain = -PIECE_VALUES[game.get_piece_at(start).get_type()]
+
+    for index in BLAST_SQUARES[center]:
+        piece = game.get_piece_at(index)
+        if piece is None or index == start or (index != center and piece.get_type() == 'pawn'):
+            continue
+        value = WIN_SCORE if piece.get_type() == 'king' else PIECE_VALUES[piece.get_type()]
+        gain += value if piece.get_color() != color else -value
+    return gain
+
+
+def terminal_score(game, ply):
+    """
+    score of a finished game for the side to move. a capture can blow up the mover's own king, so the
+    side to move may be the winner
+    """
+    winner = 'white' if game.get_game_state() == 'WHITE_WON' else 'black'
+    if winner == game.get_current_player():
+        return WIN_SCORE - ply
+    return -(WIN_SCORE - ply)
+
+
+class Searcher:
+    """
+    alpha-beta search over ChessVar.push_move/pop. moves are square index pairs inside the search.
+    keeps its transposition table between searches
+    """
+    def __init__(self, table=None):
+        """
+        :param table: TranspositionTable to use. a new 16 MB table if None
+        """
+        self._table = table if table is not None else TranspositionTable()
+        self._nodes = 0
+        self._deadline = None
+        self._stopped = False
+        self._killers = [[0, 0] for ply in range(MAX_DEPTH + 1)]
+        self._completed_depth = 0
+        self._score = 0
+
+    def get_nodes(self):
+        """
+        :return: nodes visited by the last search
+        """
+        return self._nodes
+
+    def get_completed_depth(self):
+        """
+        :return: deepest iteration the last search finished
+        """
+        return self._completed_depth
+
+    def get_score(self):
+        """
+        :return: score of the last finished iteration, from the side to move's point of view
+        """
+        return self._score
+
+    def search(self, game, depth=None, time_ms=100, root_moves=None):
+        """
+        iterative deepening search. stops at depth or when the time budget runs out, whichever comes first
+        :param game: ChessVar to search. it is left exactly as it was
+        :param depth: deepest iteration, None to keep going until time runs out
+        :param time_ms: time budget in milliseconds, None for no limit
+        :param root_moves: (start, end) square index pairs to search first to last on the first iteration.
+                           all legal moves in generated order if None
+        :return: best (start, end) move, or None if the side to move has no legal moves
+        """
+        root_moves = list(game.generate_moves() if root_moves is None else root_moves)
+        if not root_moves:
+            return None
+        if depth is None and time_ms is None:
+            depth = 4
+
+        self._nodes = 0
+        self._stopped = False
+        self._completed_depth = 0
+        self._killers = [[0, 0] for ply in range(MAX_DEPTH + 1)]
+        self._deadline = time.perf_counter() + time_ms / 1000 if time_ms is not None else None
+        max_depth = min(depth, MAX_DEPTH) if depth is not None else MAX_DEPTH
+
+        best = root_moves[0]
+        for current_depth in range(1, max_depth + 1):
+            score, move = self.search_root(game, root_moves, current_depth)
+            if self._stopped:
+                break
+            best = move
+            self._score = score
+            self._completed_depth = current_depth
+
+            # search the best move first next iteration
+            root_moves.remove(move)
+            root_moves.insert(0, move)
+
+            # a forced win or loss won't change with more depth
+            if abs(score) >= WIN_SCORE - MAX_DEPTH:
+                break
+        return SQUARE_NAMES[best[0]], SQUARE_NAMES[best[1]]
+
+    def search_root(self, game, root_moves, depth):
+        """
+        :return: (score, move) for the best root move at this depth
+        """
+        alpha, beta = -INFINITE, INFINITE
+        best_move = root_moves[0]
+
+        for move in root_moves:
+            game.push_move(*move)
+            score = -self.negamax(game, depth - 1, -beta, -alpha, 1)
+            game.pop()
+            if self._stopped:
+                break
+            if score > alpha:
+                alpha = score
+                best_move = move
+
+        if not self._stopped:
+            self._table.store(game.get_hash(), depth, alpha, EXACT, encode_move(*best_move))
+        return alpha, best_move
+
+    def out_of_time(self):
+        """
+        check the clock every CHECK_TIME_EVERY nodes
+        """
+        self._nodes += 1
+        if self._deadline is not None and self._nodes % CHECK_TIME_EVERY == 0 \
+                and time.perf_counter() > self._deadline:
+            self._stopped = True
+        return self._stopped
+
+    def negamax(self, game, depth, alpha, beta, ply):
+        """
+        alpha-beta search
+        :return: score from the side to move's point of view
+        """
+        if self.out_of_time():
+            return 0
+        if game.get_game_state() != 'UNFINISHED':
+            return terminal_score(game, ply)
+        if depth <= 0 or ply >= MAX_DEPTH:
+            return self.quiescence(game, alpha, beta, ply)
+
+        key = game.get_hash()
+        tt_move = 0
+        entry = self._table.probe(key)
+        if entry is not None:
+            entry_depth, entry_score, bound, tt_move = entry
+            entry_score = self.score_from_table(entry_score, ply)
+            if entry_depth >= depth:
+                if bound == EXACT:
+                    return entry_score
+                if bound == LOWER_BOUND and entry_score >= beta:
+                    return entry_score
+                if bound == UPPER_BOUND and entry_score <= alpha:
+                    return entry_score
+
+        moves = self.order_moves(game, list(game.generate_moves()), tt_move, ply)
+        if not moves:
+            return 0        # nothing can move. no checkmate in this variant, so call it even
+
+        original_alpha = alpha
+        best_score = -INFINITE
+        best_move = 0
+        for move in moves:
+            game.push_move(*move)
+            score = -self.negamax(game, depth - 1, -beta, -alpha, ply + 1)
+            game.pop()
+            if self._stopped:
+                return 0
+
+            if score > best_score:
+                best_score = score
+                best_move = encode_move(*move)
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                # remember quiet moves that cut off, they are likely good in sibling positions too
+                if game.get_piece_at(move[1]) is None and self._killers[ply][0] != best_move:
+                    self._killers[ply][1] = self._killers[ply][0]
+                    self._killers[ply][0] = best_move
+                break
+
+        if best_score <= original_alpha:
+            bound = UPPER_BOUND
+        elif best_score >= beta:
+            bound = LOWER_BOUND
+        else:
+            bound = EXACT
+        self._table.store(key, depth, self.score_to_table(best_score, ply), bound, best_move)
+        return best_score
+
+    def quiescence(self, game, alpha, beta, ply):
+        """
+        keep searching captures until the position is quiet, so explosions aren't cut off halfway
+        :return: score from the side to move's point of view
+        """
+        if self.out_of_time():
+            return 0
+        if game.get_game_state() != 'UNFINISHED':
+            return terminal_score(game, ply)
+
+        stand_pat = evaluate(game)
+        if stand_pat >= beta or ply >= MAX_DEPTH:
+            return stand_pat
+        if stand_pat > alpha:
+            alpha = stand_pat
+
+        captures = []
+        for move in game.generate_moves():
+            if game.get_piece_at(move[1]) is not None:
+                gain = capture_gain(game, move)
+                if gain >= 0:       # skip captures that lose material in the blast
+                    captures.append((gain, move))
+        captures.sort(key=lambda capture: capture[0], reverse=True)
+
+        for gain, move in captures:
+            game.push_move(*move)
+            score = -self.quiescence(game, -beta, -alpha, ply + 1)
+            game.pop()
+            if self._stopped:
+                return 0
+            if score >= beta:
+                return score
+            if score > alpha:
+                alpha = score
+        return alpha
+
+    def order_moves(self, game, moves, tt_move, ply):
+        """
+        transposition table move first, then captures by blast value, then killer moves, then the rest
+        :return: sorted list of moves
+        """
+        killers = self._killers[ply]
+
+        def move_order(move):
+            move_code = encode_move(*move)
+            if move_code == tt_move:
+                return 10 * WIN_SCORE
+            if game.get_piece_at(move[1]) is not None:
+                return 2 * WIN_SCORE + capture_gain(game, move)
+            if move_code == killers[0] or move_code == killers[1]:
+                return WIN_SCORE
+            return 0
+
+        return sorted(moves, key=move_order, reverse=True)
+
+    @staticmethod
+    def score_to_table(score, ply):
+        """
+        win scores count plies from the root. store them counting from this position instead
+        """
+        if score >= WIN_SCORE - MAX_DEPTH:
+            return score + ply
+        if score <= -(WIN_SCORE - MAX_DEPTH):
+            return score - ply
+        return score
+
+    @staticmethod
+    def score_from_table(score, ply):
+        """
+        undo score_to_table for the current ply
+        """
+        if score >= WIN_SCORE - MAX_DEPTH:
+            return score - ply
+        if score <= -(WIN_SCORE - MAX_DEPTH):
+            return score + ply
+        return score
+
+
+def best_move(game, depth=None, time_ms=100, table=None):
+    """
+    pick a move for the side to move
+    :param game: ChessVar, left unchanged
+    :param depth: deepest iteration, None to search until time runs out
+    :param time_ms: time budget in milliseconds, None for no limit
+    :param table: TranspositionTable to reuse between moves, optional
+    :return: (start, end) move, or None if there is no legal move or the game is over
+    """
+    return Searcher(table).search(game, depth, time_ms)
@@ -0,0 +1,111 @@
+# Author: angela peralta
+# GitHub username: angelaperalta1
+# Date: 10/18/26
+# Description: Play many ChessVar games across all cores with a process pool. Each worker only gets a seed and
+#              a config and sends back a compact result: move codes, winner, ply count and time taken.
+#              Run: python selfplay.py 100 --white engine --black random --workers 8
+
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+from ChessVar import ChessVar, SQUARE_INDEX, encode_move
+from search import Searcher
+from transposition import TranspositionTable
+
+DEFAULT_CONFIG = {
+    'white': 'random',      # 'random' or 'engine'
+    'black': 'random',
+    'depth': None,          # engine search depth, None to use only the time budget
+    'time_ms': 20,          # engine time per move
+    'table_mb': 4,          # engine transposition table size
+    'max_plies': 300,       # stop a game that goes on this long
+    'backend': 'list',
+}
+
+
+def play_game(seed, config):
+    """
+    play one game. runs inside a worker process, so everything it needs comes from seed and config
+    :param seed: random seed for the game
+    :param config: dict of settings, see DEFAULT_CONFIG
+    :return: dict with seed, moves (12 bit move codes), winner (get_game_state), plies and seconds
+    """
+    settings = dict(DEFAULT_CONFIG, **config)
+    rng = random.Random(seed)
+    game = ChessVar(settings['backend'])
+    searchers = {}
+    for color in ('white', 'black'):
+        if settings[color] == 'engine':
+            searchers[color] = Searcher(TranspositionTable(settings['table_mb']))
+
+    moves = []
+    start_time = time.perf_counter()
+    while game.get_game_state() == 'UNFINISHED' and len(moves) < settings['max_plies']:
+        player = game.get_current_player()
+        if player in searchers:
+            move = searchers[player].search(game, settings['depth'], settings['time_ms'])
+            move = (SQUARE_INDEX[move[0]], SQUARE_INDEX[move[1]]) if move is not None else None
+        else:
+            legal = list(game.generate_moves())
+            move = rng.choice(legal) if legal else None
+        if move is None:
+            break       # side to move is stuck
+        game.execute_move(*move)
+        moves.append(encode_move(*move))
+
+    return {'seed': seed, 'moves': moves, 'winner': game.get_game_state(), 'plies': len(moves),
+            'seconds': time.perf_counter() - start_time}
+
+
+def run_games(game_count, config=None, workers=None, base_seed=0):
+    """
+    play game_count games on a process pool
+    :param config: dict of settings passed to every game, see DEFAULT_CONFIG
+    :param workers: number of processes, defaults to the number of cores
+    :param base_seed: game i uses seed base_seed + i
+    :return: generator of play_game results, in seed order
+    """
+    config = config or {}
+    workers = workers or os.cpu_count() or 1
+    seeds = range(base_seed, base_seed + game_count)
+    chunk_size = max(1, game_count // (workers * 8))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(play_game, seeds, repeat(config), chunksize=chunk_size)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='play ChessVar games on every core')
+    parser.add_argument('games', type=int)
+    parser.add_argument('--white', choices=['random', 'engine'], default='random')
+    parser.add_argument('--black', choices=['random', 'engine'], default='random')
+    parser.add_argument('--depth', type=int, default=None)
+    parser.add_argument('--time-ms', type=int, default=DEFAULT_CONFIG['time_ms'])
+    parser.add_argument('--backend', choices=['list', 'bitboard'], default='list')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    config = {'white': args.white, 'black': args.black, 'depth': args.depth, 'time_ms': args.time_ms,
+              'backend': args.backend}
+    results = {'WHITE_WON': 0, 'BLACK_WON': 0, 'UNFINISHED': 0}
+    total_plies = 0
+
+    start_time = time.perf_counter()
+    for result in run_games(args.games, config, args.workers, args.seed):
+        results[result['winner']] += 1
+        total_plies += result['plies']
+    seconds = time.perf_counter() - start_time
+
+    print(f"{args.games} games in {seconds:.2f}s ({args.games / seconds:.1f} games/sec), "
+          f"average {total_plies / max(1, args.games):.1f} plies")
+    print(f"white won {results['WHITE_WON']}, black won {results['BLACK_WON']}, "
+          f"unfinished {results['UNFINISHED']}")
+
+
+if __name__ == '__main__':
+    main()
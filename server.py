@@ -0,0 +1,181 @@
+# Author: angela peralta
+# GitHub username: angelaperalta1
+# Date: 10/18/26
+# Description: asyncio server holding many ChessVar sessions. Clients talk a line protocol over TCP or a unix
+#              socket, any connection can drive any session, and a move is answered with the squares it changed
+#              instead of a printed board.
+#              Run: python server.py --port 8765      or      python server.py --unix /tmp/chessvar.sock
+#
+# Protocol, one request per line, one response line each:
+#   NEW [fen]           OK <session> <fen>                      start a session, standard setup without a fen
+#   MOVE <session> e2e4 OK <game state> <player> <square>=<piece> ...
+#                                                           changed squares, piece as a FEN letter or - if empty
+#   MOVES <session>     OK e2e4 e2e3 ...                        legal moves for the side to move
+#   FEN <session>       OK <fen>
+#   END <session>       OK                                      drop the session
+# Anything that fails gets ERR <reason>.
+
+import argparse
+import asyncio
+
+from ChessVar import ChessVar, SQUARE_NAMES, PIECE_LETTERS
+from replay import parse_move
+
+
+def square_diff(game, squares):
+    """
+    :param squares: square indexes that changed
+    :return: protocol text for the squares, like e2=- e4=P
+    """
+    return ' '.join(f"{SQUARE_NAMES[square]}={PIECE_LETTERS.get(game.get_piece_at(square), '-')}"
+                    for square in squares)
+
+
+async def read_request(reader):
+    """
+    read one request line. a line longer than the stream limit is dropped up to its newline instead of
+    raising, so the connection keeps working
+    :return: (line, too_long), line is empty at end of stream
+    """
+    too_long = False
+    while True:
+        try:
+            return await reader.readuntil(b'\n'), too_long
+        except asyncio.IncompleteReadError as error:
+            return error.partial, too_long
+        except asyncio.LimitOverrunError as error:
+            # the buffer holds at least error.consumed bytes of this line, none of them past its newline
+            await reader.readexactly(error.consumed)
+            too_long = True
+
+
+class GameServer:
+    """
+    sessions by id and the protocol handler. handle_line does all the work, so it can be tested without a socket
+    """
+    def __init__(self, backend='list'):
+        self._backend = backend
+        self._sessions = {}
+        self._next_session = 1
+        self._server = None
+
+    def get_session_count(self):
+        """
+        :return: number of open sessions
+        """
+        return len(self._sessions)
+
+    def handle_line(self, line):
+        """
+        :param line: one request, see the protocol at the top of the file
+        :return: response line without the newline
+        """
+        fields = line.split()
+        if not fields:
+            return 'ERR empty request'
+        command = fields[0].upper()
+
+        if command == 'NEW':
+            try:
+                game = ChessVar.from_fen(' '.join(fields[1:]), self._backend) if len(fields) > 1 \
+                    else ChessVar(self._backend)
+            except ValueError:
+                return 'ERR bad fen'
+            session = self._next_session
+            self._next_session += 1
+            self._sessions[session] = game
+            return f"OK {session} {game.to_fen()}"
+
+        if command not in ('MOVE', 'MOVES', 'FEN', 'END'):
+            return f"ERR unknown command {fields[0]}"
+        game = self._sessions.get(int(fields[1])) if len(fields) > 1 and fields[1].isdigit() else None
+        if game is None:
+            return 'ERR no such session'
+
+        if command == 'MOVE':
+            move = parse_move(fields[2]) if len(fields) == 3 else None
+            if move is None:
+                return 'ERR bad move'
+            # a move takes about 15us, a run_in_executor round trip about 100us, so it runs right on the
+            # event loop. nothing is printed
+            if not game.is_move_allowed(*move, quiet=True):
+                return 'ERR illegal move'
+            start, end = move
+            destroyed = game.execute_move(start, end)
+            changed = [start] + ([square for square, piece in destroyed] if destroyed else [end])
+            return f"OK {game.get_game_state()} {game.get_current_player()} {square_diff(game, changed)}"
+
+        if command == 'MOVES':
+            return ' '.join(['OK'] + [SQUARE_NAMES[start] + SQUARE_NAMES[end] for start, end in game.generate_moves()])
+
+        if command == 'FEN':
+            return f"OK {game.to_fen()}"
+
+        del self._sessions[int(fields[1])]
+        return 'OK'
+
+    async def handle_client(self, reader, writer):
+        """
+        answer requests from one connection until it closes
+        """
+        try:
+            while True:
+                line, too_long = await read_request(reader)
+                if not line:
+                    break
+                response = 'ERR line too long' if too_long else self.handle_line(line.decode('ascii', 'replace'))
+                writer.write(response.encode('ascii', 'replace') + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host='127.0.0.1', port=8765, unix_path=None):
+        """
+        start listening. returns once the socket is open, serve_forever keeps it running
+        :param port: TCP port, 0 to pick a free one (see get_port)
+        :param unix_path: listen on this unix socket instead of TCP
+        """
+        if unix_path is not None:
+            self._server = await asyncio.start_unix_server(self.handle_client, unix_path)
+        else:
+            self._server = await asyncio.start_server(self.handle_client, host, port, backlog=1024)
+
+    def get_port(self):
+        """
+        :return: TCP port the server is listening on
+        """
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        await self._server.serve_forever()
+
+    async def close(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+
+async def run_server(host, port, unix_path, backend):
+    server = GameServer(backend)
+    await server.start(host, port, unix_path)
+    print(f"listening on {unix_path or f'{host}:{server.get_port()}'}")
+    await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='serve ChessVar games over a line protocol')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', default=None, help='listen on a unix socket instead of TCP')
+    parser.add_argument('--backend', choices=['list', 'bitboard'], default='list')
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(run_server(args.host, args.port, args.unix, args.backend))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,415 @@
+# Author: angela peralta
+# GitHub username: angelaperalta1
+# Date: 10/18/26
+# Description: Endgame tablebases for ChessVar. Every position with a given set of pieces (ex: KQvK) is solved by
+#              retrograde analysis under this project's rules: every capture explodes, pawns survive unless
+#              captured, no promotion, kings can't capture and losing a king ends the game. Results are written
+#              as one byte per position (win/loss with distance in plies, or draw) and read back through a memory
+#              map, so a probe needs no load step and worker processes share the pages.
+#              3 piece tables take seconds, 4 piece tables a few minutes and about 70 MB of memory while building.
+#              5 piece tables would have 64 times as many positions, hours of pure Python, so 4 is the limit.
+#              Run: python tablebase.py KQvK KRvK KNvK --dir tables
+
+import argparse
+import mmap
+import os
+import struct
+
+from ChessVar import (PIECE_TYPES, KNIGHT_TARGETS, KING_TARGETS, PAWN_CAPTURES, RAYS, SLIDER_DIRECTIONS,
+                      OPPOSITE_DIRECTIONS)
+
+MAGIC = b'CVTB'
+VERSION = 1
+FILE_HEADER = struct.Struct('<4sBB10s')     # magic, version, piece count, signature
+MAX_PIECES = 4
+MAX_DISTANCE = 127
+
+# one byte per position: 0 draw, 1-127 win in that many plies, 128-254 loss in (value - 127) plies
+DRAW = 0
+LOSS_BASE = 127
+UNKNOWN = 255       # only while building
+
+PAWN, KNIGHT, KING = 0, 1, 5        # piece code % 6
+SIGNATURE_LETTERS = 'PNBRQK'        # by piece type index
+SIGNATURE_ORDER = 'KQRBNP'          # order pieces are listed in a signature
+
+
+def signature_codes(signature):
+    """
+    :param signature: pieces for white, then v, then black, ex: KRvKN
+    :return: list of piece codes in signature order
+    """
+    sides = signature.upper().split('V')
+    if len(sides) != 2 or any(side.count('K') != 1 or side[0] != 'K' for side in sides) \
+            or any(letter not in SIGNATURE_LETTERS for side in sides for letter in side):
+        raise ValueError(f"bad tablebase signature {signature!r}, expected something like KQvK")
+
+    codes = []
+    for color_index, side in enumerate(sides):
+        for letter in sorted(side, key=SIGNATURE_ORDER.index):
+            codes.append(color_index * 6 + SIGNATURE_LETTERS.index(letter))
+    if len(codes) > MAX_PIECES:
+        raise ValueError(f"{signature} has {len(codes)} pieces, at most {MAX_PIECES} are supported")
+    return codes
+
+
+def piece_order(code):
+    """
+    sort key putting pieces in signature order: white before black, kings first, pawns last
+    """
+    return code // 6, SIGNATURE_ORDER.index(SIGNATURE_LETTERS[code % 6])
+
+
+def codes_signature(codes):
+    """
+    :param codes: piece codes in signature order
+    :return: signature string, ex: KQvK
+    """
+    sides = ['', '']
+    for code in codes:
+        sides[code // 6] += SIGNATURE_LETTERS[code % 6]
+    return 'v'.join(sides)
+
+
+def position_index(squares, black_to_move):
+    """
+    :param squares: square index of each piece, in signature order
+    :return: index of the position in its table
+    """
+    index = 0
+    for slot, square in enumerate(squares):
+        index |= square << (6 * slot)
+    return index | (black_to_move << (6 * len(squares)))
+
+
+def flip_value(value):
+    """
+    turn the result for the side to move after a move into the result for the side that made it
+    """
+    if value == DRAW:
+        return DRAW
+    if value > LOSS_BASE:
+        distance = value - LOSS_BASE + 1
+        if distance > MAX_DISTANCE:
+            raise ValueError("win is longer than a tablebase byte can hold")
+        return distance
+    if value + 1 > MAX_DISTANCE:
+        raise ValueError("loss is longer than a tablebase byte can hold")
+    return LOSS_BASE + value + 1
+
+
+class TableBuilder:
+    """
+    builds tables in memory, solving smaller tables first whenever a capture leads into one
+    """
+    def __init__(self):
+        self._tables = {}       # signature -> bytearray of values
+
+    def get_table(self, signature):
+        """
+        :return: bytearray of values for the signature, built if needed
+        """
+        if signature not in self._tables:
+            self._tables[signature] = self.build(signature_codes(signature))
+        return self._tables[signature]
+
+    def get_tables(self):
+        """
+        :return: dict of signature -> bytearray for every table built so far
+        """
+        return self._tables
+
+    def moves(self, codes, squares, color):
+        """
+        :return: generator of (slot, target square) for every move of color's pieces, quiet moves and captures
+        """
+        occupied = set(squares)
+        for slot, code in enumerate(codes):
+            if code // 6 != color:
+                continue
+            square = squares[slot]
+            piece_type = code % 6
+            if piece_type == PAWN:
+                step = 8 if color == 0 else -8
+                forward = square + step
+                if 0 <= forward < 64 and forward not in occupied:
+                    yield slot, forward
+                    if square // 8 == (1 if color == 0 else 6) and forward + step not in occupied:
+                        yield slot, forward + step
+                for target in PAWN_CAPTURES[color][square]:
+                    if target in occupied:
+                        yield slot, target
+            elif piece_type == KNIGHT or piece_type == KING:
+                for target in KNIGHT_TARGETS[square] if piece_type == KNIGHT else KING_TARGETS[square]:
+                    if piece_type == KNIGHT or target not in occupied:
+                        yield slot, target
+            else:
+                for direction in SLIDER_DIRECTIONS[PIECE_TYPES[piece_type]]:
+                    for target in RAYS[square][direction]:
+                        yield slot, target
+                        if target in occupied:
+                            break
+
+    def capture_value(self, codes, squares, color, slot, target):
+        """
+        result of a capture for the side making it, or None if the capture is not allowed
+        :return: table value from the capturing side's point of view
+        """
+        captured = squares.index(target)
+        if codes[captured] // 6 == color or codes[slot] % 6 == KING:
+            return None         # own piece, or a king trying to capture
+
+        # the capturing piece, the captured piece and every non-pawn next to the blast go
+        blast = KING_TARGETS[target]
+        survivors = [other for other in range(len(codes)) if other != slot and other != captured
+                     and not (squares[other] in blast and codes[other] % 6 != PAWN)]
+        own_king = any(codes[other] == color * 6 + KING for other in survivors)
+        opponent_king = any(codes[other] == (1 - color) * 6 + KING for other in survivors)
+        if not own_king and not opponent_king:
+            return None         # both kings at once is not allowed
+        if not opponent_king:
+            return 1
+        if not own_king:
+            return LOSS_BASE + 1
+
+        survivors.sort(key=lambda other: piece_order(codes[other]))
+        table = self.get_table(codes_signature([codes[other] for other in survivors]))
+        return flip_value(table[position_index([squares[other] for other in survivors], 1 - color)])
+
+    def capture_summary(self, codes, squares, color):
+        """
+        :return: (quiet move count, best capture win, whether a capture draws, longest capture loss). win and loss
+                 are distances, 0 if there is none
+        """
+        quiet = 0
+        win = loss = 0
+        draw = False
+        occupied = set(squares)
+        for slot, target in self.moves(codes, squares, color):
+            if target not in occupied:
+                quiet += 1
+                continue
+            value = self.capture_value(codes, squares, color, slot, target)
+            if value is None:
+                continue
+            if value == DRAW:
+                draw = True
+            elif value > LOSS_BASE:
+                loss = max(loss, value - LOSS_BASE)
+            elif win == 0 or value < win:
+                win = value
+        return quiet, win, draw, loss
+
+    def predecessors(self, codes, squares, color):
+        """
+        positions one quiet move earlier. the move was made by the side not to move now
+        :param color: side to move in the current position
+        :return: generator of position indexes with the other side to move
+        """
+        mover = 1 - color
+        occupied = set(squares)
+        current = position_index(squares, mover)
+        for slot, code in enumerate(codes):
+            if code // 6 != mover:
+                continue
+            target = squares[slot]
+            piece_type = code % 6
+            origins = []
+            if piece_type == PAWN:
+                step = 8 if mover == 0 else -8
+                origin = target - step
+                if 0 <= origin < 64 and origin not in occupied:
+                    origins.append(origin)
+                    double = origin - step
+                    if 0 <= double < 64 and double // 8 == (1 if mover == 0 else 6) and double not in occupied:
+                        origins.append(double)
+            elif piece_type == KNIGHT or piece_type == KING:
+                origins = [origin for origin in (KNIGHT_TARGETS[target] if piece_type == KNIGHT
+                                                 else KING_TARGETS[target]) if origin not in occupied]
+            else:
+                for direction in SLIDER_DIRECTIONS[PIECE_TYPES[piece_type]]:
+                    for origin in RAYS[target][OPPOSITE_DIRECTIONS[direction]]:
+                        if origin in occupied:
+                            break
+                        origins.append(origin)
+
+            # only this piece's 6 bits of the index change
+            shift = 6 * slot
+            base = current & ~(63 << shift)
+            for origin in origins:
+                yield base | (origin << shift)
+
+    def build(self, codes):
+        """
+        retrograde analysis of every position with these pieces
+        :param codes: piece codes in signature order
+        :return: bytearray of values indexed by position_index
+        """
+        piece_count = len(codes)
+        size = 2 << (6 * piece_count)
+        values = bytearray([UNKNOWN]) * size
+        remaining = bytearray(size)     # quiet moves not yet known to lose
+        buckets = {}                    # distance -> list of (position index, value)
+
+        def decode(index):
+            return [(index >> (6 * slot)) & 63 for slot in range(piece_count)], index >> (6 * piece_count)
+
+        # first pass: count quiet moves and settle what captures decide on their own
+        for index in range(size):
+            squares, color = decode(index)
+            if len(set(squares)) != piece_count:
+                values[index] = DRAW        # not a real position, never probed
+                continue
+            quiet, win, draw, loss = self.capture_summary(codes, squares, color)
+            remaining[index] = quiet
+            if win:
+                buckets.setdefault(win, []).append((index, win))
+            elif quiet == 0:
+                if loss and not draw:
+                    buckets.setdefault(loss, []).append((index, LOSS_BASE + loss))
+                else:
+                    values[index] = DRAW        # nothing to move, or a drawing capture is the best there is
+
+        # settle positions in order of distance, passing each result back to the positions one move earlier
+        distance = 1
+        while distance <= max(buckets, default=0):
+            for index, value in buckets.pop(distance, []):
+                if values[index] != UNKNOWN:
+                    continue
+                values[index] = value
+                squares, color = decode(index)
+                for earlier in self.predecessors(codes, squares, color):
+                    if values[earlier] != UNKNOWN:
+                        continue
+                    if value > LOSS_BASE:
+                        # moving here wins for the side that moved
+                        buckets.setdefault(distance + 1, []).append((earlier, distance + 1))
+                        continue
+                    remaining[earlier] -= 1
+                    if remaining[earlier]:
+                        continue
+                    # every quiet move loses. a capture may still do better
+                    earlier_squares, earlier_color = decode(earlier)
+                    quiet, win, draw, loss = self.capture_summary(codes, earlier_squares, earlier_color)
+                    if win:
+                        continue        # already waiting in its bucket
+                    if draw:
+                        values[earlier] = DRAW
+                    else:
+                        loss = max(distance + 1, loss)
+                        buckets.setdefault(loss, []).append((earlier, LOSS_BASE + loss))
+            distance += 1
+            if distance > MAX_DISTANCE + 1 and buckets:
+                raise ValueError("distance is longer than a tablebase byte can hold")
+
+        # anything never settled can be kept going forever
+        return values.replace(bytes([UNKNOWN]), bytes([DRAW]))
+
+
+def table_path(directory, signature):
+    return os.path.join(directory, f"{signature}.cvtb")
+
+
+def write_table(directory, signature, values):
+    """
+    write one table file: header, then one byte per position
+    """
+    with open(table_path(directory, signature), 'wb') as table_file:
+        table_file.write(FILE_HEADER.pack(MAGIC, VERSION, len(signature_codes(signature)), signature.encode('ascii')))
+        table_file.write(values)
+
+
+def generate(signatures, directory):
+    """
+    build tables and every smaller table a capture can lead into, and write them all to directory
+    :param signatures: list of signatures, ex: ['KQvK', 'KRvKN']
+    :return: list of signatures written
+    """
+    os.makedirs(directory, exist_ok=True)
+    builder = TableBuilder()
+    for signature in signatures:
+        builder.get_table(codes_signature(signature_codes(signature)))
+    for signature, values in builder.get_tables().items():
+        write_table(directory, signature, values)
+    return sorted(builder.get_tables())
+
+
+class Tablebase:
+    """
+    probe tables written by generate. each table file is memory mapped the first time its material comes up
+    """
+    def __init__(self, directory):
+        self._directory = directory
+        self._tables = {}       # signature -> mmap, None if there is no file
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        for table in self._tables.values():
+            if table is not None:
+                table.close()
+        self._tables = {}
+
+    def open_table(self, signature):
+        """
+        :return: mmap of a table, None if it was not generated
+        """
+        if signature not in self._tables:
+            table = None
+            path = table_path(self._directory, signature)
+            if os.path.exists(path):
+                with open(path, 'rb') as table_file:
+                    table = mmap.mmap(table_file.fileno(), 0, access=mmap.ACCESS_READ)
+                magic, version, piece_count, stored = FILE_HEADER.unpack_from(table, 0)
+                if magic != MAGIC or version != VERSION or stored.rstrip(b'\0').decode('ascii') != signature:
+                    table.close()
+                    raise ValueError(f"{path} is not a version {VERSION} {signature} tablebase")
+            self._tables[signature] = table
+        return self._tables[signature]
+
+    def probe(self, game):
+        """
+        :param game: ChessVar
+        :return: (result, distance) for the side to move, result WIN, LOSS or DRAW and distance in plies to the
+                 end of the game (0 for a draw). None if there is no table for the material on the board
+        """
+        if game.get_game_state() != 'UNFINISHED':
+            return None
+
+        pieces = []
+        for square in range(64):
+            piece = game.get_piece_at(square)
+            if piece is not None:
+                pieces.append((piece_order(piece.get_code()), piece.get_code(), square))
+                if len(pieces) > MAX_PIECES:
+                    return None
+        pieces.sort()
+
+        table = self.open_table(codes_signature([code for order, code, square in pieces]))
+        if table is None:
+            return None
+        index = position_index([square for order, code, square in pieces], game.get_current_player() == 'black')
+        value = table[FILE_HEADER.size + index]
+        if value == DRAW:
+            return 'DRAW', 0
+        if value > LOSS_BASE:
+            return 'LOSS', value - LOSS_BASE
+        return 'WIN', value
+
+
+def main():
+    parser = argparse.ArgumentParser(description='build ChessVar endgame tablebases')
+    parser.add_argument('signatures', nargs='+', help='material to solve, ex: KQvK KRvKN')
+    parser.add_argument('--dir', default='tables', help='directory to write the tables to')
+    args = parser.parse_args()
+
+    for signature in generate(args.signatures, args.dir):
+        print(f"wrote {table_path(args.dir, signature)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+# Author: angela peralta
+# GitHub username: angelaperalta1
+# Date: 10/18/26
+# Description: Write ChessVar positions as training planes straight into a caller's buffer: a NumPy array, a
+#              bytearray, an array.array or a memoryview (ex: multiprocessing.shared_memory.SharedMemory.buf).
+#              Each position takes 13 planes of 64 squares: one plane per piece code (white pawn, knight, bishop,
+#              rook, queen, king, then the same for black) and a side to move plane, all ones when white is to
+#              move. Squares go a1 = 0 ... h8 = 63, so a (13, 8, 8) view has row 1 first.
+
+import struct
+
+PLANE_COUNT = 13
+SIDE_PLANE = 12
+POSITION_SIZE = PLANE_COUNT * 64
+ONES = {'B': 1, 'b': 1, '?': True, 'f': 1.0, 'd': 1.0}      # value to write for each supported element format
+
+# blocks copied in with one slice assignment: a whole position of zeros and a plane of ones, per format
+ZERO_POSITIONS = {element_format: memoryview(bytes(POSITION_SIZE * struct.calcsize(element_format))).cast(
+    element_format) for element_format in ONES}
+ONE_PLANES = {element_format: memoryview(struct.pack(f'64{element_format}', *[one] * 64)).cast(element_format)
+              for element_format, one in ONES.items()}
+
+
+def flat_view(buffer):
+    """
+    :param buffer: any writable, contiguous object with the buffer protocol
+    :return: 1-d memoryview over the buffer's elements, no copy
+    """
+    view = memoryview(buffer)
+    if view.readonly:
+        raise ValueError("buffer is read only")
+    element_format = view.format.lstrip('@=<')
+    if element_format not in ONES:
+        raise ValueError(f"unsupported buffer element format {view.format!r}, use uint8, int8, bool, float32 "
+                         f"or float64")
+    return view.cast('B').cast(element_format)
+
+
+def write_position(game, view, slot=0):
+    """
+    write one position into a flat view
+    :param view: flat_view of the buffer
+    :param slot: position number in the buffer, the planes start at slot * POSITION_SIZE
+    """
+    base = slot * POSITION_SIZE
+    if base + POSITION_SIZE > len(view):
+        raise IndexError(f"buffer has no room for position {slot}")
+
+    one = ONES[view.format]
+    view[base:base + POSITION_SIZE] = ZERO_POSITIONS[view.format]
+    for square in range(64):
+        piece = game.get_piece_at(square)
+        if piece is not None:
+            view[base + piece.get_code() * 64 + square] = one
+
+    if game.get_current_player() == 'white':
+        side = base + SIDE_PLANE * 64
+        view[side:side + 64] = ONE_PLANES[view.format]
+
+
+def export_position(game, buffer, slot=0):
+    """
+    :param buffer: writable buffer with room for at least slot + 1 positions of POSITION_SIZE elements
+    """
+    with flat_view(buffer) as view:
+        write_position(game, view, slot)
+
+
+def export_batch(games, buffer, first_slot=0):
+    """
+    write many positions into one preallocated buffer, ex: numpy.zeros((len(games), 13, 8, 8), numpy.float32)
+    :param games: iterable of ChessVar
+    :param first_slot: slot of the first game, for filling a big buffer a batch at a time
+    :return: number of positions written
+    """
+    count = 0
+    with flat_view(buffer) as view:
+        for count, game in enumerate(games, 1):
+            write_position(game, view, first_slot + count - 1)
+    return count
@@ -0,0 +1,208 @@
+# Author: angela peralta
+# GitHub username: angelaperalta1
+# Date: 10/18/26
+# Description: Fixed size transposition table for ChessVar positions, keyed by the zobrist hash from
+#              ChessVar.get_hash(). Each bucket has a depth-preferred slot and an always-replace slot.
+#              SharedTranspositionTable keeps the same layout in multiprocessing.shared_memory so several
+#              search processes can use one table without locks.
+
+from array import array
+from multiprocessing import shared_memory
+
+# bound stored with each score
+EXACT = 0
+LOWER_BOUND = 1     # search failed high, real score is at least this
+UPPER_BOUND = 2     # search failed low, real score is at most this
+
+# key 8 + score 4 + move 2 + depth 1 + bound 1
+ENTRY_BYTES = 16
+SCORE_OFFSET = 1 << 31      # shared entries store the score as unsigned
+
+
+class TranspositionTable:
+    """
+    hash table of search results with a fixed memory budget. entries live in flat arrays, so memory
+    use doesn't grow after the table is created
+    """
+    def __init__(self, size_mb=16):
+        """
+        :param size_mb: memory budget in megabytes
+        """
+        self._bucket_count = max(1, int(size_mb * 1024 * 1024) // (2 * ENTRY_BYTES))
+        entry_count = self._bucket_count * 2    # slot 0 depth-preferred, slot 1 always-replace
+        self._keys = array('Q', bytes(8 * entry_count))
+        self._scores = array('i', bytes(4 * entry_count))
+        self._moves = array('H', bytes(2 * entry_count))
+        self._depths = array('b', [-1]) * entry_count      # -1 marks an empty slot
+        self._bounds = array('B', bytes(entry_count))
+        self._probes = 0
+        self._hits = 0
+
+    def get_capacity(self):
+        """
+        :return: number of entries the table can hold
+        """
+        return self._bucket_count * 2
+
+    def get_stats(self):
+        """
+        :return: dict with probe and hit counts
+        """
+        return {'probes': self._probes, 'hits': self._hits}
+
+    def clear(self):
+        """
+        empty every slot
+        """
+        for slot in range(len(self._depths)):
+            self._depths[slot] = -1
+            self._keys[slot] = 0
+        self._probes = 0
+        self._hits = 0
+
+    def probe(self, key):
+        """
+        look up a position
+        :param key: zobrist hash
+        :return: (depth, score, bound, move) or None if the position isn't stored
+        """
+        self._probes += 1
+        slot = (key % self._bucket_count) * 2
+        for entry in (slot, slot + 1):
+            if self._keys[entry] == key and self._depths[entry] >= 0:
+                self._hits += 1
+                return self._depths[entry], self._scores[entry], self._bounds[entry], self._moves[entry]
+        return None
+
+    def store(self, key, depth, score, bound, move):
+        """
+        save a search result. deeper results keep the first slot, everything else goes in the second
+        :param key: zobrist hash
+        :param depth: remaining search depth the score was found with
+        :param score: score from the side to move's point of view
+        :param bound: EXACT, LOWER_BOUND or UPPER_BOUND
+        :param move: 12 bit move code of the best move, 0 if none
+        """
+        slot = (key % self._bucket_count) * 2
+        if self._keys[slot] == key or depth >= self._depths[slot]:
+            entry = slot
+        else:
+            entry = slot + 1
+
+        self._keys[entry] = key
+        self._depths[entry] = min(depth, 127)
+        self._scores[entry] = score
+        self._bounds[entry] = bound
+        self._moves[entry] = move
+
+
+def pack_entry(depth, score, bound, move):
+    """
+    :return: one 64 bit word: score, move, depth + 1 (0 marks an empty slot) and bound
+    """
+    return (score + SCORE_OFFSET) | move << 32 | (min(depth, 127) + 1) << 48 | bound << 56
+
+
+def unpack_entry(data):
+    """
+    :return: (depth, score, bound, move) from pack_entry's word
+    """
+    return (data >> 48 & 0xFF) - 1, (data & 0xFFFFFFFF) - SCORE_OFFSET, data >> 56, data >> 32 & 0xFFFF
+
+
+class SharedTranspositionTable:
+    """
+    transposition table in shared memory, for search processes working on the same position. same buckets
+    and replacement as TranspositionTable. each slot is two 64 bit words, the key xor the data and the data,
+    with no lock: if two processes write a slot at once and the words come from different stores, the key
+    check fails and the probe is a miss instead of a wrong score
+    """
+    def __init__(self, size_mb=16, name=None):
+        """
+        :param size_mb: memory budget in megabytes, ignored when attaching
+        :param name: shared memory name of an existing table to attach to, None to create a new table
+        """
+        if name is None:
+            bucket_count = max(1, int(size_mb * 1024 * 1024) // (2 * ENTRY_BYTES))
+            self._memory = shared_memory.SharedMemory(create=True, size=bucket_count * 2 * ENTRY_BYTES)
+            self._owner = True
+        else:
+            self._memory = shared_memory.SharedMemory(name=name)
+            self._owner = False
+        # the block can be rounded up to a whole page, only use the part the buckets fill
+        self._bucket_count = len(self._memory.buf) // (2 * ENTRY_BYTES)
+        self._words = self._memory.buf[:self._bucket_count * 2 * ENTRY_BYTES].cast('Q')
+        if self._owner:
+            self.clear()
+        self._probes = 0        # counted per process
+        self._hits = 0
+
+    def get_name(self):
+        """
+        :return: shared memory name, for other processes to attach with
+        """
+        return self._memory.name
+
+    def get_capacity(self):
+        """
+        :return: number of entries the table can hold
+        """
+        return self._bucket_count * 2
+
+    def get_stats(self):
+        """
+        :return: dict with this process's probe and hit counts
+        """
+        return {'probes': self._probes, 'hits': self._hits}
+
+    def clear(self):
+        """
+        empty every slot. only safe while no other process is searching
+        """
+        self._words[:] = array('Q', bytes(len(self._words) * 8))
+        self._probes = 0
+        self._hits = 0
+
+    def probe(self, key):
+        """
+        look up a position
+        :param key: zobrist hash
+        :return: (depth, score, bound, move) or None if the position isn't stored
+        """
+        self._probes += 1
+        words = self._words
+        word = (key % self._bucket_count) * 4
+        for entry in (word, word + 2):
+            data = words[entry + 1]
+            if words[entry] ^ data == key and data >> 48 & 0xFF:
+                self._hits += 1
+                return unpack_entry(data)
+        return None
+
+    def store(self, key, depth, score, bound, move):
+        """
+        save a search result. deeper results keep the first slot, everything else goes in the second
+        :param key: zobrist hash
+        :param depth: remaining search depth the score was found with
+        :param score: score from the side to move's point of view
+        :param bound: EXACT, LOWER_BOUND or UPPER_BOUND
+        :param move: 12 bit move code of the best move, 0 if none
+        """
+        words = self._words
+        entry = (key % self._bucket_count) * 4
+        stored = words[entry + 1]
+        if words[entry] ^ stored != key and depth < (stored >> 48 & 0xFF) - 1:
+            entry += 2
+
+        data = pack_entry(depth, score, bound, move)
+        words[entry + 1] = data
+        words[entry] = key ^ data
+
+    def close(self):
+        """
+        detach from the shared memory. the process that created the table also frees it
+        """
+        self._words.release()
+        self._memory.close()
+        if self._owner:
+            self._memory.unlink()